@@ -0,0 +1,244 @@
+"""
+Local stand-in for the Airtable REST API, for benchmarks and tests.
+
+Serves list (GET and POST listRecords, with offset pagination, `fields[]`, `maxRecords` and the
+LAST_MODIFIED_TIME watermark formula the post mirror uses) and single-record reads for in-memory
+tables. Latency, jitter and a 429 rate can be injected, and every call is counted per base/table.
+
+    python -m benchmarks.fake_airtable --blogs 3 --posts 200 --latency 0.2 --port 8901
+"""
+import re
+import json
+import time
+import random
+import asyncio
+import argparse
+import threading
+from collections import Counter
+from datetime import datetime, timedelta, timezone
+from typing import Optional, Dict, Any, List, Tuple
+
+import uvicorn
+from starlette.applications import Starlette
+from starlette.requests import Request
+from starlette.responses import JSONResponse
+from starlette.routing import Route
+
+MASTER_BASE = "appBenchMaster"
+PAGE_SIZE = 100
+_WATERMARK = re.compile(r"IS_AFTER\(LAST_MODIFIED_TIME\(\),\s*'([^']+)'\)")
+
+WORDS = """
+airtable analytics api architecture async benchmark blog browser cache cdn client cloud compression config
+content cursor database deploy design developer domain edge engine feed fastapi frontend gateway index
+latency layout listing markdown metric mirror network origin pagination performance pipeline platform post
+proxy python query queue rate render request response route schema search server session sitemap sqlite
+static storage stream sync template throughput token traffic update upstream worker workflow
+""".split()
+TAGS = ["Performance", "Python", "Caching", "Search", "SEO", "Infrastructure", "Design", "Databases"]
+ENTITIES = ["FastAPI", "SQLite", "Airtable", "Redis", "Nginx", "Cloudflare", "Pygments", "NumPy"]
+
+
+class FakeAirtable:
+    """In-memory bases plus the knobs and counters the benchmark reads."""
+
+    def __init__(self, latency: float = 0.0, jitter: float = 0.0, error_rate: float = 0.0, seed: int = 7):
+        self.latency = latency
+        self.jitter = jitter
+        self.error_rate = error_rate
+        self.random = random.Random(seed)
+        # (base, table) -> [record]
+        self.tables: Dict[Tuple[str, str], List[Dict[str, Any]]] = {}
+        self.modified: Dict[str, datetime] = {}
+        self.calls = Counter()
+        self.throttled = Counter()
+        self._lock = threading.Lock()
+
+    # --- Seeding ---
+
+    def add_records(self, base_id: str, table: str, records: List[Dict[str, Any]]):
+        now = datetime.now(timezone.utc)
+        self.tables.setdefault((base_id, table), []).extend(records)
+        for record in records:
+            self.modified[record["id"]] = now
+
+    def seed(self, blogs: int, posts: int, words: int = 600) -> List[Dict[str, Any]]:
+        """
+        Creates `blogs` blogs (one base each, listed in the master base's Blogs table) with `posts`
+        published posts apiece. Returns [{id, name, domain, base_id, slugs}].
+        """
+        rng = random.Random(1234)
+        seeded = []
+        blog_records = []
+        for b in range(1, blogs + 1):
+            base_id = f"appBenchBlog{b:03d}"
+            domain = f"blog{b}.bench.test"
+            record_id = f"recBlog{b:011d}"
+            blog_records.append({"id": record_id, "createdTime": "2025-01-01T00:00:00.000Z", "fields": {
+                "Name": f"Bench Blog {b}", "Domain": domain, "Airtable_Base_ID": base_id, "Table_Name": "Posts",
+            }})
+            records, slugs = [], []
+            for p in range(posts):
+                slug = f"bench-{b}-post-{p}"
+                published = datetime(2025, 1, 1, tzinfo=timezone.utc) + timedelta(hours=p * 7 + b)
+                body = []
+                for section in range(4):
+                    body.append(f"## {rng.choice(WORDS).title()} {rng.choice(WORDS)}\n")
+                    body.append(" ".join(rng.choice(WORDS) for _ in range(words // 4)) + "\n")
+                body.append("```python\nimport asyncio\n\nasync def main():\n    return await fetch()\n```\n")
+                records.append({"id": f"recB{b:03d}P{p:09d}", "createdTime": published.isoformat(), "fields": {
+                    "Title": f"{rng.choice(WORDS).title()} {rng.choice(WORDS)} {rng.choice(WORDS)} #{p}",
+                    "Slug": slug,
+                    "Status": "Published",
+                    "PublishedDate": published.strftime("%Y-%m-%dT%H:%M:%S.000Z"),
+                    "Content": "\n".join(body),
+                    "MetaDescription": " ".join(rng.choice(WORDS) for _ in range(20)),
+                    "Author_Name": "Bench Author",
+                    "PrimaryObjective": rng.choice(["Traffic", "Leads", "Authority"]),
+                    "Tags": rng.sample(TAGS, 2),
+                    "Entities_JSON": json.dumps([{"name": e, "type": "Technology"} for e in rng.sample(ENTITIES, 3)]),
+                }})
+                slugs.append(slug)
+            self.add_records(base_id, "Posts", records)
+            seeded.append({"id": record_id, "name": f"Bench Blog {b}", "domain": domain, "base_id": base_id,
+                           "slugs": slugs})
+        self.add_records(MASTER_BASE, "Blogs", blog_records)
+        self.tables.setdefault((MASTER_BASE, "Agencies"), [])
+        return seeded
+
+    # --- Counters ---
+
+    def snapshot(self) -> Dict[str, Any]:
+        with self._lock:
+            return {"calls": sum(self.calls.values()), "throttled": sum(self.throttled.values()),
+                    "by_table": {f"{b}/{t}": n for (b, t), n in sorted(self.calls.items())}}
+
+    def _count(self, base_id: str, table: str) -> bool:
+        """Counts a call; returns True if it should be answered with a 429."""
+        with self._lock:
+            self.calls[(base_id, table)] += 1
+            if self.error_rate and self.random.random() < self.error_rate:
+                self.throttled[(base_id, table)] += 1
+                return True
+        return False
+
+    async def _delay(self):
+        delay = self.latency + (self.random.uniform(-self.jitter, self.jitter) if self.jitter else 0.0)
+        if delay > 0:
+            await asyncio.sleep(delay)
+
+    # --- API ---
+
+    def _list(self, base_id: str, table: str, params: Dict[str, Any]) -> Dict[str, Any]:
+        records = self.tables.get((base_id, table), [])
+        formula = params.get("filterByFormula")
+        if formula:
+            match = _WATERMARK.search(formula)
+            if match:
+                since = datetime.fromisoformat(match.group(1).replace("Z", "+00:00"))
+                records = [r for r in records if self.modified.get(r["id"], since) > since]
+        if params.get("maxRecords"):
+            records = records[:int(params["maxRecords"])]
+        start = int(params.get("offset") or 0)
+        size = min(int(params.get("pageSize") or PAGE_SIZE), PAGE_SIZE)
+        fields = params.get("fields")
+        page = []
+        for record in records[start:start + size]:
+            if fields:
+                record = dict(record, fields={k: v for k, v in record["fields"].items() if k in fields})
+            page.append(record)
+        body = {"records": page}
+        if start + size < len(records):
+            body["offset"] = str(start + size)
+        return body
+
+    async def list_records(self, request: Request):
+        base_id, table = request.path_params["base"], request.path_params["table"]
+        if self._count(base_id, table):
+            return JSONResponse({"errors": [{"error": "RATE_LIMIT_REACHED"}]}, status_code=429)
+        await self._delay()
+        if request.method == "POST":
+            params = await request.json()
+        else:
+            params = dict(request.query_params)
+            fields = request.query_params.getlist("fields[]") or request.query_params.getlist("fields")
+            if fields:
+                params["fields"] = fields
+        if (base_id, table) not in self.tables:
+            return JSONResponse({"error": {"type": "TABLE_NOT_FOUND"}}, status_code=404)
+        return JSONResponse(self._list(base_id, table, params))
+
+    async def get_record(self, request: Request):
+        base_id, table = request.path_params["base"], request.path_params["table"]
+        if self._count(base_id, table):
+            return JSONResponse({"errors": [{"error": "RATE_LIMIT_REACHED"}]}, status_code=429)
+        await self._delay()
+        record_id = request.path_params["record_id"]
+        for record in self.tables.get((base_id, table), []):
+            if record["id"] == record_id:
+                return JSONResponse(record)
+        return JSONResponse({"error": "NOT_FOUND"}, status_code=404)
+
+    def app(self) -> Starlette:
+        return Starlette(routes=[
+            Route("/v0/{base}/{table}/listRecords", self.list_records, methods=["POST"]),
+            Route("/v0/{base}/{table}/{record_id}", self.get_record, methods=["GET"]),
+            Route("/v0/{base}/{table}", self.list_records, methods=["GET"]),
+        ])
+
+
+class FakeAirtableServer:
+    """Runs a FakeAirtable on a local port in a background thread."""
+
+    def __init__(self, fake: FakeAirtable, port: int = 0, host: str = "127.0.0.1"):
+        self.fake = fake
+        config = uvicorn.Config(fake.app(), host=host, port=port, log_level="warning", lifespan="off")
+        self.server = uvicorn.Server(config)
+        self.thread = threading.Thread(target=self.server.run, name="fake-airtable", daemon=True)
+
+    @property
+    def url(self) -> str:
+        host, port = self.server.servers[0].sockets[0].getsockname()[:2]
+        return f"http://{host}:{port}/v0"
+
+    def start(self) -> "FakeAirtableServer":
+        self.thread.start()
+        deadline = time.time() + 10
+        while not self.server.started:
+            if time.time() > deadline:
+                raise RuntimeError("fake Airtable server did not start")
+            time.sleep(0.02)
+        return self
+
+    def stop(self):
+        self.server.should_exit = True
+        self.thread.join(timeout=5)
+
+
+def main(argv: Optional[List[str]] = None):
+    parser = argparse.ArgumentParser(description="Run a local fake Airtable API.")
+    parser.add_argument("--blogs", type=int, default=3)
+    parser.add_argument("--posts", type=int, default=200)
+    parser.add_argument("--latency", type=float, default=0.2, help="Seconds added to every call")
+    parser.add_argument("--jitter", type=float, default=0.05)
+    parser.add_argument("--error-rate", type=float, default=0.0, help="Share of calls answered with 429")
+    parser.add_argument("--port", type=int, default=8901)
+    args = parser.parse_args(argv)
+
+    fake = FakeAirtable(args.latency, args.jitter, args.error_rate)
+    blogs = fake.seed(args.blogs, args.posts)
+    server = FakeAirtableServer(fake, args.port).start()
+    print(f"Fake Airtable at {server.url} (master base {MASTER_BASE})")
+    for blog in blogs:
+        print(f"  {blog['name']}: {blog['domain']} base {blog['base_id']}, {len(blog['slugs'])} posts")
+    print(f"Point the app at it with AIRTABLE_API_URL={server.url} AIRTABLE_BASE_ID={MASTER_BASE} AIRTABLE_API_KEY=fake")
+    try:
+        while True:
+            time.sleep(5)
+            print(json.dumps(fake.snapshot()))
+    except KeyboardInterrupt:
+        server.stop()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,309 @@
+"""
+Load benchmark for the public routes, against a local fake Airtable (benchmarks/fake_airtable.py).
+
+Seeds N blogs x M posts, starts `execution.server:app` under uvicorn in a subprocess pointed at the
+fake (every cache and index in a scratch directory), waits for the post mirror to fill, then drives
+each route with concurrent clients, followed by a mixed phase over all of them. Reports throughput,
+p50/p95/p99 latency, errors and Airtable calls per request, and can save or compare a baseline.
+
+    python -m benchmarks.run
+    python -m benchmarks.run --posts 500 --latency 0.2 --error-rate 0.05
+    python -m benchmarks.run --save-baseline benchmarks/baseline.json
+    python -m benchmarks.run --compare benchmarks/baseline.json
+"""
+import os
+import sys
+import json
+import time
+import shutil
+import socket
+import asyncio
+import argparse
+import platform
+import tempfile
+import subprocess
+from typing import Optional, Dict, Any, List, Tuple
+
+import httpx
+
+from benchmarks.fake_airtable import FakeAirtable, FakeAirtableServer, MASTER_BASE
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+ROUTES = ("/", "/blogs/{id}", "/post/{slug}", "/sitemap.xml", "/rss.xml")
+# Keys compared against a baseline: (metric, higher is better)
+COMPARED = (("rps", True), ("p50_ms", False), ("p95_ms", False), ("p99_ms", False), ("upstream_per_request", False))
+STARTUP_TIMEOUT = 120.0
+
+
+def _free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def _percentile(values: List[float], pct: float) -> float:
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    rank = min(len(ordered) - 1, max(0, round(pct / 100 * len(ordered)) - 1))
+    return ordered[rank]
+
+
+def _app_env(fake_url: str, scratch: str, args) -> Dict[str, str]:
+    """Environment for the app under test: the fake Airtable, and every cache under `scratch`."""
+    cache = lambda name: os.path.join(scratch, name)
+    env = dict(os.environ)
+    env.update({
+        "AIRTABLE_API_KEY": "bench",
+        "AIRTABLE_BASE_ID": MASTER_BASE,
+        "AIRTABLE_API_URL": fake_url,
+        "AIRTABLE_RATE_LIMIT": str(args.rate_limit),
+        "AIRTABLE_RATE_BURST": str(max(1.0, args.rate_limit)),
+        "AIRTABLE_RATE_LIMIT_PATH": cache("ratelimit.sqlite3"),
+        "CONFIG_CACHE_PATH": cache("config.sqlite3"),
+        "POST_MIRROR_PATH": cache("posts.sqlite3"),
+        "RENDER_CACHE_DIR": cache("html"),
+        "STATIC_BUILD_DIR": cache("static"),
+        "RELATED_INDEX_PATH": cache("related.sqlite3"),
+        "SEARCH_INDEX_PATH": cache("search.sqlite3"),
+        "FACET_INDEX_PATH": cache("facets.sqlite3"),
+        "IMAGE_CACHE_DIR": cache("images"),
+        "METRICS_PATH": cache("metrics.sqlite3"),
+        # Background syncs would count as upstream calls of whichever phase they land in
+        "POST_SYNC_INTERVAL": "3600",
+        "POST_FULL_SYNC_INTERVAL": "3600",
+        "PYTHONUNBUFFERED": "1",
+    })
+    return env
+
+
+class AppProcess:
+    """`uvicorn execution.server:app` in a subprocess, with its output in the scratch directory."""
+
+    def __init__(self, env: Dict[str, str], port: int, workers: int, log_path: str):
+        self.url = f"http://127.0.0.1:{port}"
+        self.log_path = log_path
+        self.log = open(log_path, "w")
+        command = [sys.executable, "-m", "uvicorn", "execution.server:app", "--host", "127.0.0.1",
+                   "--port", str(port), "--log-level", "warning", "--no-access-log"]
+        if workers > 1:
+            command += ["--workers", str(workers)]
+        self.process = subprocess.Popen(command, cwd=BASE_DIR, env=env, stdout=self.log, stderr=subprocess.STDOUT)
+
+    def wait_ready(self, probes: List[Tuple[str, str]]):
+        """
+        Blocks until every (path, host) probe renders. Probing each blog's oldest post means every
+        blog's first sync has finished, so no startup call is counted against a route.
+        """
+        deadline = time.time() + STARTUP_TIMEOUT
+        pending = list(probes)
+        with httpx.Client(base_url=self.url, timeout=10) as client:
+            while time.time() < deadline:
+                if self.process.poll() is not None:
+                    raise RuntimeError(f"app exited with {self.process.returncode}; see {self.log_path}")
+                try:
+                    pending = [(path, host) for path, host in pending
+                               if client.get(path, headers={"host": host}).status_code != 200]
+                except httpx.HTTPError:
+                    pass
+                if not pending:
+                    return
+                time.sleep(0.25)
+        raise RuntimeError(f"app not ready after {STARTUP_TIMEOUT:.0f}s; see {self.log_path}")
+
+    def stop(self):
+        self.process.terminate()
+        try:
+            self.process.wait(timeout=10)
+        except subprocess.TimeoutExpired:
+            self.process.kill()
+        self.log.close()
+
+
+def _targets(route: str, blogs: List[Dict[str, Any]], count: int) -> List[Tuple[str, str]]:
+    """`count` (path, host) pairs for a route, spread over the blogs and their posts."""
+    targets = []
+    for i in range(count):
+        blog = blogs[i % len(blogs)]
+        if route == "/blogs/{id}":
+            path = f"/blogs/{blog['id']}"
+        elif route == "/post/{slug}":
+            slugs = blog["slugs"]
+            path = f"/post/{slugs[(i // len(blogs) * 7919) % len(slugs)]}"
+        else:
+            path = route
+        targets.append((path, blog["domain"]))
+    return targets
+
+
+async def _drive(url: str, targets: List[Tuple[str, str]], concurrency: int) -> Dict[str, Any]:
+    """Requests every target with `concurrency` clients; returns latencies and status counts."""
+    latencies: List[float] = []
+    statuses: Dict[str, int] = {}
+    position = 0
+
+    async def client_loop(client: httpx.AsyncClient):
+        nonlocal position
+        while position < len(targets):
+            path, host = targets[position]
+            position += 1
+            started = time.perf_counter()
+            try:
+                response = await client.get(path, headers={"host": host, "accept-encoding": "gzip"})
+                status = str(response.status_code)
+            except httpx.HTTPError as e:
+                status = type(e).__name__
+            latencies.append(time.perf_counter() - started)
+            statuses[status] = statuses.get(status, 0) + 1
+
+    limits = httpx.Limits(max_connections=concurrency, max_keepalive_connections=concurrency)
+    async with httpx.AsyncClient(base_url=url, timeout=60, limits=limits) as client:
+        started = time.perf_counter()
+        await asyncio.gather(*(client_loop(client) for _ in range(concurrency)))
+        elapsed = time.perf_counter() - started
+    return {"latencies": latencies, "statuses": statuses, "elapsed": elapsed}
+
+
+def _summarise(run: Dict[str, Any], upstream: int, throttled: int) -> Dict[str, Any]:
+    latencies, count = run["latencies"], len(run["latencies"])
+    errors = sum(n for status, n in run["statuses"].items() if not status.isdigit() or int(status) >= 400)
+    return {
+        "requests": count,
+        "rps": round(count / run["elapsed"], 1) if run["elapsed"] else 0.0,
+        "p50_ms": round(_percentile(latencies, 50) * 1000, 2),
+        "p95_ms": round(_percentile(latencies, 95) * 1000, 2),
+        "p99_ms": round(_percentile(latencies, 99) * 1000, 2),
+        "errors": errors,
+        "statuses": dict(sorted(run["statuses"].items())),
+        "upstream_calls": upstream,
+        "upstream_per_request": round(upstream / count, 3) if count else 0.0,
+        "throttled": throttled,
+    }
+
+
+def run_benchmark(args) -> Dict[str, Any]:
+    fake = FakeAirtable(args.latency, args.jitter, args.error_rate)
+    blogs = fake.seed(args.blogs, args.posts, args.words)
+    fake_server = FakeAirtableServer(fake).start()
+    scratch = tempfile.mkdtemp(prefix="auto-blog-bench-")
+    app = AppProcess(_app_env(fake_server.url, scratch, args), args.port or _free_port(), args.workers,
+                     os.path.join(scratch, "app.log"))
+    try:
+        started = time.perf_counter()
+        app.wait_ready([(f"/post/{blog['slugs'][0]}", blog["domain"]) for blog in blogs])
+        startup = {"seconds": round(time.perf_counter() - started, 2), **fake.snapshot()}
+        print(f"App ready in {startup['seconds']}s after {startup['calls']} Airtable calls "
+              f"({startup['throttled']} throttled)")
+
+        phases = {}
+        routes = [r for r in ROUTES if r in args.routes]
+        plan = [(route, _targets(route, blogs, args.requests)) for route in routes]
+        mixed = [t for i in range(args.requests) for _, targets in plan for t in targets[i:i + 1]]
+        plan.append(("mixed", mixed))
+        for name, targets in plan:
+            # Warm-up requests fill the render and listing caches and are not counted
+            asyncio.run(_drive(app.url, targets[:args.warmup], args.concurrency))
+            before = fake.snapshot()
+            run = asyncio.run(_drive(app.url, targets, args.concurrency))
+            after = fake.snapshot()
+            phases[name] = _summarise(run, after["calls"] - before["calls"], after["throttled"] - before["throttled"])
+            _print_phase(name, phases[name])
+        return {
+            "config": {name: getattr(args, name) for name in
+                       ("blogs", "posts", "words", "latency", "jitter", "error_rate", "rate_limit",
+                        "concurrency", "requests", "warmup", "workers")},
+            "environment": {"python": platform.python_version(), "platform": platform.platform(),
+                            "cpus": os.cpu_count()},
+            "startup": startup,
+            "routes": phases,
+        }
+    finally:
+        app.stop()
+        fake_server.stop()
+        if args.keep:
+            print(f"Caches and app log kept in {scratch}")
+        else:
+            shutil.rmtree(scratch, ignore_errors=True)
+
+
+def _print_phase(name: str, result: Dict[str, Any]):
+    print(f"{name:<14} {result['rps']:>9.1f} {result['p50_ms']:>9.2f} {result['p95_ms']:>9.2f} "
+          f"{result['p99_ms']:>9.2f} {result['errors']:>7d} {result['upstream_per_request']:>9.3f}")
+
+
+def compare(current: Dict[str, Any], baseline: Dict[str, Any], threshold: float) -> List[str]:
+    """Metrics more than `threshold` (a fraction) worse than the baseline, as printable lines."""
+    regressions = []
+    if current["config"] != baseline.get("config"):
+        print("Warning: benchmark settings differ from the baseline's; comparisons may not be meaningful")
+    print(f"\n{'route':<14} {'metric':<22} {'baseline':>10} {'current':>10} {'change':>8}")
+    for name, result in current["routes"].items():
+        before = baseline.get("routes", {}).get(name)
+        if not before:
+            continue
+        for metric, higher_is_better in COMPARED:
+            old, new = before.get(metric), result.get(metric)
+            if old is None or new is None:
+                continue
+            change = (new - old) / old if old else (0.0 if new == old else float("inf"))
+            worse = -change if higher_is_better else change
+            # Upstream calls per request are near zero when cached; only absolute increases matter there
+            if metric == "upstream_per_request":
+                worse = new - old
+            flag = " <-- regression" if worse > threshold else ""
+            print(f"{name:<14} {metric:<22} {old:>10} {new:>10} {change:>+8.0%}{flag}")
+            if flag:
+                regressions.append(f"{name} {metric}: {old} -> {new}")
+        if result["errors"] > before.get("errors", 0):
+            regressions.append(f"{name} errors: {before.get('errors', 0)} -> {result['errors']}")
+    return regressions
+
+
+def main(argv: Optional[List[str]] = None):
+    parser = argparse.ArgumentParser(description="Benchmark the public routes against a local fake Airtable.")
+    parser.add_argument("--blogs", type=int, default=3, help="Blogs to seed")
+    parser.add_argument("--posts", type=int, default=200, help="Published posts per blog")
+    parser.add_argument("--words", type=int, default=600, help="Approximate words per post body")
+    parser.add_argument("--latency", type=float, default=0.05, help="Seconds the fake adds to every Airtable call")
+    parser.add_argument("--jitter", type=float, default=0.02, help="+/- seconds of random latency")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="Share of Airtable calls answered with 429")
+    parser.add_argument("--rate-limit", type=float, default=5.0, help="AIRTABLE_RATE_LIMIT for the app")
+    parser.add_argument("--concurrency", type=int, default=16, help="Concurrent clients")
+    parser.add_argument("--requests", type=int, default=400, help="Requests per route")
+    parser.add_argument("--warmup", type=int, default=20, help="Uncounted requests before each phase")
+    parser.add_argument("--workers", type=int, default=1, help="uvicorn worker processes")
+    parser.add_argument("--routes", nargs="+", default=list(ROUTES), choices=ROUTES)
+    parser.add_argument("--port", type=int, default=0, help="App port (default: any free port)")
+    parser.add_argument("--keep", action="store_true", help="Keep the scratch caches and app log")
+    parser.add_argument("--json", help="Write the full results to this file")
+    parser.add_argument("--save-baseline", metavar="PATH", help="Store the results as a baseline")
+    parser.add_argument("--compare", metavar="PATH", help="Compare against a stored baseline")
+    parser.add_argument("--threshold", type=float, default=0.2,
+                        help="Allowed slowdown before --compare fails, as a fraction (default: 0.2)")
+    args = parser.parse_args(argv)
+
+    print(f"Seeding {args.blogs} blogs x {args.posts} posts; Airtable latency {args.latency * 1000:.0f}ms, "
+          f"429 rate {args.error_rate:.0%}, {args.concurrency} clients, {args.requests} requests per route")
+    print(f"{'route':<14} {'req/s':>9} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9} {'errors':>7} {'upstream':>9}")
+    results = run_benchmark(args)
+
+    for path in (args.json, args.save_baseline):
+        if path:
+            with open(path, "w") as f:
+                json.dump(results, f, indent=2)
+                f.write("\n")
+            print(f"Results written to {path}")
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)
+        regressions = compare(results, baseline, args.threshold)
+        if regressions:
+            print(f"\n{len(regressions)} regression(s) beyond {args.threshold:.0%}:")
+            for line in regressions:
+                print(f"  {line}")
+            sys.exit(1)
+        print(f"\nNo regressions beyond {args.threshold:.0%}")
+
+
+if __name__ == "__main__":
+    main()
@@ -3,17 +3,35 @@ from fastapi.responses import HTMLResponse, RedirectResponse
 from fastapi.templating import Jinja2Templates
 from typing import Optional
 import os
+import asyncio
 from datetime import datetime, timedelta
-from execution.utils import load_blogs_config, get_airtable_client, get_base_id, get_blog_config
+from execution.utils import load_blogs_config_async, get_base_id, get_blog_config_async
+from execution.airtable_client import get_async_airtable
+from execution.assets import asset_url
 
 router = APIRouter(prefix="/admin", tags=["admin"])
 
 ADMIN_PASSWORD = os.environ.get("ADMIN_PASSWORD", "admin") 
 templates = Jinja2Templates(directory="templates")
+templates.env.globals["asset_url"] = asset_url
 
 def is_authenticated(request: Request) -> bool:
     return request.cookies.get("admin_session") == "authenticated"
 
+def mirror_post_change(blog_id: str, record: Optional[dict] = None, deleted_id: Optional[str] = None):
+    """
+    Writes admin edits through to the public post mirror so they show without waiting for a sync.
+    Runs the mirror listeners (pre-render, search/facet/related indexes), so async callers use asyncio.to_thread.
+    """
+    from execution import post_store
+    try:
+        if record:
+            post_store.upsert_records(blog_id, [record])
+        if deleted_id:
+            post_store.delete_records(blog_id, [deleted_id])
+    except Exception as e:
+        print(f"Error updating post mirror: {e}")
+
 @router.get("/debug/connection", response_class=HTMLResponse)
 async def debug_connection(request: Request):
     if not is_authenticated(request):
@@ -32,13 +50,12 @@ async def debug_connection(request: Request):
         if not api_key or not base_id:
             raise Exception("Missing Credentials")
             
-        from pyairtable import Api
-        api = Api(api_key)
+        api = get_async_airtable()
         
         # Test 1: Fetch Blogs Table
         log.append("Attempting to fetch 'Blogs' table...")
         table = api.table(base_id, "Blogs")
-        records = table.all()
+        records = await table.all()
         log.append(f"Success! Found {len(records)} records.")
         
         # Test 2: Inspect First Record
@@ -73,7 +90,7 @@ async def debug_refresh_config(request: Request):
         return RedirectResponse(url="/admin/login")
         
     start = datetime.now()
-    blogs = load_blogs_config(force=True)
+    blogs = await load_blogs_config_async(force=True)
     duration = (datetime.now() - start).total_seconds()
     
     print(f"Config force refreshed in {duration}s. Loaded {len(blogs)} blogs.")
@@ -107,15 +124,15 @@ def get_current_user(request: Request):
         "avatar": "https://ui-avatars.com/api/?name=Agency+Owner&background=0D8ABC&color=fff"
     }
 
-def render_admin(request: Request, template_name: str, context: dict = {}):
-    from execution.utils import load_blogs_config, get_all_agencies
+async def render_admin(request: Request, template_name: str, context: dict = {}):
+    from execution.utils import load_blogs_config_async, get_all_agencies_async
     
     # Inject Global Context
     ctx = context.copy()
     ctx["request"] = request
     ctx["current_user"] = get_current_user(request)
-    ctx["global_agencies"] = get_all_agencies()
-    ctx["global_blogs"] = load_blogs_config()
+    ctx["global_agencies"] = await get_all_agencies_async()
+    ctx["global_blogs"] = await load_blogs_config_async()
     
     return templates.TemplateResponse(template_name, ctx)
 
@@ -124,14 +141,14 @@ async def dashboard(request: Request):
     if not is_authenticated(request):
         return RedirectResponse(url="/admin/login")
     
-    blogs = load_blogs_config()
+    blogs = await load_blogs_config_async()
     
     # Scope filtering (UX-1)
     scope_agency = request.query_params.get("scope_agency", "all")
     # scope_blog = request.query_params.get("scope_blog", "all") # Not fully implemented in filter yet
 
     try:
-        api = get_airtable_client()
+        api = get_async_airtable()
         base_id = os.environ.get("AIRTABLE_BASE_ID")
         
         # Kanban Columns
@@ -147,7 +164,7 @@ async def dashboard(request: Request):
             # Fetch fields needed for Tile View
             # Note: "Blog" and "Author_Profile" are linked records (lists of IDs)
             # Remove strict fields list to prevent 422 if schema is missing columns
-            records = table.all()
+            records = await table.all()
             
             for r in records:
                 f = r["fields"]
@@ -198,7 +215,7 @@ async def dashboard(request: Request):
         print(f"Error fetching board data: {e}")
         board = {}
 
-    return render_admin(request, "admin/dashboard.html", {
+    return await render_admin(request, "admin/dashboard.html", {
         "board": board,
         "blogs": blogs
     })
@@ -208,21 +225,21 @@ async def agencies_list(request: Request):
     if not is_authenticated(request):
         return RedirectResponse(url="/admin/login")
         
-    from execution.utils import get_all_agencies
+    from execution.utils import get_all_agencies_async
     
     # 1. Get Base Agencies
-    base_agencies = get_all_agencies()
+    base_agencies = await get_all_agencies_async()
     
     # 2. Enrich with Metrics (if possible/efficient)
     agencies = []
     try:
-        api = get_airtable_client()
+        api = get_async_airtable()
         base_id = os.environ.get("AIRTABLE_BASE_ID")
         
         if base_id:
             # Fetch All Posts for Metrics (Lightweight)
             posts_table = api.table(base_id, "Posts")
-            all_posts = posts_table.all(fields=["Blog", "PublishedDate", "QA_Score_GEO_AEO"])
+            all_posts = await posts_table.all(fields=["Blog", "PublishedDate", "QA_Score_GEO_AEO"])
             
             from datetime import datetime, timedelta, timezone
             now = datetime.now(timezone.utc)
@@ -270,13 +287,13 @@ async def agencies_list(request: Request):
         # Fallback to base data if metrics fail
         agencies = base_agencies
         
-    return render_admin(request, "admin/agencies.html", {"agencies": agencies})
+    return await render_admin(request, "admin/agencies.html", {"agencies": agencies})
 
 @router.get("/agencies/new", response_class=HTMLResponse)
 async def new_agency_page(request: Request):
     if not is_authenticated(request):
         return RedirectResponse(url="/admin/login")
-    return render_admin(request, "admin/agency_form.html", {"agency": None})
+    return await render_admin(request, "admin/agency_form.html", {"agency": None})
 
 @router.get("/agencies/{agency_id}/edit", response_class=HTMLResponse)
 async def edit_agency_page(request: Request, agency_id: str):
@@ -285,11 +302,11 @@ async def edit_agency_page(request: Request, agency_id: str):
     
     agency = None
     try:
-        api = get_airtable_client()
+        api = get_async_airtable()
         base_id = os.environ.get("AIRTABLE_BASE_ID")
         if base_id:
             table = api.table(base_id, "Agencies")
-            r = table.get(agency_id)
+            r = await table.get(agency_id)
             agency = {
                 "id": r["id"],
                 "name": r["fields"].get("Name", ""),
@@ -303,7 +320,7 @@ async def edit_agency_page(request: Request, agency_id: str):
     if not agency:
         raise HTTPException(status_code=404, detail="Agency not found")
 
-    return render_admin(request, "admin/agency_form.html", {"agency": agency})
+    return await render_admin(request, "admin/agency_form.html", {"agency": agency})
 
 @router.post("/agencies/save", response_class=RedirectResponse)
 async def save_agency(request: Request, 
@@ -319,7 +336,7 @@ async def save_agency(request: Request,
         with open("debug_error.log", "a") as f:
             f.write(f"DEBUG: Entering save_agency. Name={name}\n")
             
-        api = get_airtable_client()
+        api = get_async_airtable()
         base_id = os.environ.get("AIRTABLE_BASE_ID")
         
         with open("debug_error.log", "a") as f:
@@ -337,12 +354,12 @@ async def save_agency(request: Request,
                 # Update
                 with open("debug_error.log", "a") as f:
                     f.write(f"DEBUG: Updating agency {agency_id}\n")
-                table.update(agency_id, fields, typecast=True)
+                await table.update(agency_id, fields, typecast=True)
             else:
                 # Create
                 with open("debug_error.log", "a") as f:
                     f.write(f"DEBUG: Creating new agency\n")
-                table.create(fields, typecast=True)
+                await table.create(fields, typecast=True)
                 with open("debug_error.log", "a") as f:
                     f.write(f"DEBUG: Create complete\n")
         else:
@@ -352,7 +369,7 @@ async def save_agency(request: Request,
 
         # Invalidate Cache
         from execution.utils import invalidate_agencies_cache
-        invalidate_agencies_cache()
+        await asyncio.to_thread(invalidate_agencies_cache)
                 
     except Exception as e:
         print(f"Error saving agency: {e}")
@@ -367,15 +384,15 @@ async def delete_agency(request: Request, agency_id: str):
         return RedirectResponse(url="/admin/login", status_code=status.HTTP_303_SEE_OTHER)
     
     try:
-        api = get_airtable_client()
+        api = get_async_airtable()
         base_id = os.environ.get("AIRTABLE_BASE_ID")
         if base_id:
             table = api.table(base_id, "Agencies")
-            table.delete(agency_id)
+            await table.delete(agency_id)
             
             # Invalidate Cache
             from execution.utils import invalidate_agencies_cache
-            invalidate_agencies_cache()
+            await asyncio.to_thread(invalidate_agencies_cache)
 
     except Exception as e:
         print(f"Error deleting agency: {e}")
@@ -391,11 +408,11 @@ async def agency_detail(request: Request, agency_id: str):
     blogs = []
     
     try:
-        api = get_airtable_client()
+        api = get_async_airtable()
         base_id = os.environ.get("AIRTABLE_BASE_ID")
         if base_id:
             table = api.table(base_id, "Agencies")
-            record = table.get(agency_id)
+            record = await table.get(agency_id)
             agency = {
                 "id": record["id"],
                 "name": record["fields"].get("Name", "Unnamed"),
@@ -409,7 +426,7 @@ async def agency_detail(request: Request, agency_id: str):
         print(f"Error fetching agency detail: {e}")
         raise HTTPException(status_code=404, detail="Agency not found")
         
-    return render_admin(request, "admin/agency_detail.html", {
+    return await render_admin(request, "admin/agency_detail.html", {
         "agency": agency,
         "blogs": blogs
     })
@@ -426,15 +443,13 @@ async def update_post_status(request: Request,
     if not is_authenticated(request):
         return RedirectResponse(url="/admin/login", status_code=status.HTTP_303_SEE_OTHER)
 
-    from execution.utils import load_blogs_config
-    blogs = load_blogs_config()
-    blog = next((b for b in blogs if b["id"] == blog_id), None)
+    blog = await get_blog_config_async(blog_id)
     if not blog:
         return RedirectResponse(url=f"/admin/dashboard?error=Blog+Not+Found", status_code=status.HTTP_303_SEE_OTHER)
 
     try:
         from execution.utils import get_base_id
-        api = get_airtable_client()
+        api = get_async_airtable()
         base_id = get_base_id(blog)
         if base_id:
             table = api.table(base_id, blog["airtable"]["table_name"])
@@ -454,7 +469,8 @@ async def update_post_status(request: Request,
                 from datetime import datetime
                 fields["PublishedDate"] = datetime.now().strftime("%Y-%m-%d")
 
-            table.update(post_id, fields, typecast=True)
+            record = await table.update(post_id, fields, typecast=True)
+            await asyncio.to_thread(mirror_post_change, blog_id, record)
             
     except Exception as e:
         print(f"Error updating status: {e}")
@@ -468,21 +484,21 @@ async def authors_list(request: Request):
         
     authors = []
     try:
-        api = get_airtable_client()
+        api = get_async_airtable()
         base_id = os.environ.get("AIRTABLE_BASE_ID")
         if base_id:
             # Fetch Voices first for Lookup
             voices_table = api.table(base_id, "Voice_Profiles")
-            voices_all = voices_table.all()
+            voices_all = await voices_table.all()
             voice_map = {v["id"]: v["fields"].get("Name", "Unknown") for v in voices_all}
 
             # Fetch Agencies for Lookup (Optional, if we want to show Agency per author)
             agencies_table = api.table(base_id, "Agencies")
-            agencies_all = agencies_table.all()
+            agencies_all = await agencies_table.all()
             agency_map = {a["id"]: a["fields"].get("Name", "Unknown") for a in agencies_all}
 
             table = api.table(base_id, "Author_Profile")
-            records = table.all()
+            records = await table.all()
             for r in records:
                 f = r["fields"]
                 
@@ -509,7 +525,7 @@ async def authors_list(request: Request):
     except Exception as e:
         print(f"Error fetching authors: {e}")
 
-    return render_admin(request, "admin/authors.html", {"authors": authors, "voices": voices_all})
+    return await render_admin(request, "admin/authors.html", {"authors": authors, "voices": voices_all})
 
 @router.get("/voices", response_class=HTMLResponse)
 async def voices_list(request: Request):
@@ -518,11 +534,11 @@ async def voices_list(request: Request):
         
     voices = []
     try:
-        api = get_airtable_client()
+        api = get_async_airtable()
         base_id = os.environ.get("AIRTABLE_BASE_ID")
         if base_id:
             table = api.table(base_id, "Voice_Profiles")
-            records = table.all()
+            records = await table.all()
             for r in records:
                 f = r["fields"]
                 voices.append({
@@ -534,13 +550,13 @@ async def voices_list(request: Request):
     except Exception as e:
         print(f"Error fetching voices: {e}")
 
-    return render_admin(request, "admin/voices.html", {"voices": voices})
+    return await render_admin(request, "admin/voices.html", {"voices": voices})
 
 @router.get("/voices/new", response_class=HTMLResponse)
 async def new_voice(request: Request):
     if not is_authenticated(request):
         return RedirectResponse(url="/admin/login")
-    return render_admin(request, "admin/voice_form.html", {"voice": None})
+    return await render_admin(request, "admin/voice_form.html", {"voice": None})
 
 @router.get("/voices/{voice_id}", response_class=HTMLResponse)
 async def voice_detail(request: Request, voice_id: str):
@@ -549,11 +565,11 @@ async def voice_detail(request: Request, voice_id: str):
         
     voice = None
     try:
-        api = get_airtable_client()
+        api = get_async_airtable()
         base_id = os.environ.get("AIRTABLE_BASE_ID")
         if base_id:
             table = api.table(base_id, "Voice_Profiles")
-            record = table.get(voice_id)
+            record = await table.get(voice_id)
             f = record["fields"]
             voice = {
                 "id": record["id"],
@@ -565,7 +581,7 @@ async def voice_detail(request: Request, voice_id: str):
         print(f"Error fetching voice: {e}")
         raise HTTPException(status_code=404, detail="Voice not found")
         
-    return render_admin(request, "admin/voice_form.html", {"voice": voice})
+    return await render_admin(request, "admin/voice_form.html", {"voice": voice})
 
 @router.post("/voices/save", response_class=RedirectResponse)
 async def save_voice(request: Request, 
@@ -577,7 +593,7 @@ async def save_voice(request: Request,
         return RedirectResponse(url="/admin/login", status_code=status.HTTP_303_SEE_OTHER)
         
     try:
-        api = get_airtable_client()
+        api = get_async_airtable()
         base_id = os.environ.get("AIRTABLE_BASE_ID")
         if base_id:
             table = api.table(base_id, "Voice_Profiles")
@@ -589,10 +605,10 @@ async def save_voice(request: Request,
             
             if voice_id:
                 # Update existing
-                table.update(voice_id, fields, typecast=True)
+                await table.update(voice_id, fields, typecast=True)
             else:
                 # Create new
-                table.create(fields, typecast=True)
+                await table.create(fields, typecast=True)
                 
     except Exception as e:
         print(f"Error saving voice: {e}")
@@ -606,8 +622,7 @@ async def create_draft_post(request: Request, blog_id: Optional[str] = None):
 
     # If no blog_id, pick first from user config
     # In future, show a modal to select blog if multiple.
-    from execution.utils import load_blogs_config
-    all_blogs = load_blogs_config()
+    all_blogs = await load_blogs_config_async()
     
     if not blog_id and all_blogs:
         blog_id = all_blogs[0]["id"]
@@ -616,9 +631,8 @@ async def create_draft_post(request: Request, blog_id: Optional[str] = None):
         return RedirectResponse("/admin/dashboard?error=No+Blog+Configured", status_code=status.HTTP_303_SEE_OTHER)
 
     try:
-        from execution.utils import get_blog_config, get_base_id
-        api = get_airtable_client()
-        blog = get_blog_config(blog_id)
+        api = get_async_airtable()
+        blog = await get_blog_config_async(blog_id)
         if not blog:
              return RedirectResponse("/admin/dashboard?error=Blog+Not+Found", status_code=status.HTTP_303_SEE_OTHER)
 
@@ -627,7 +641,7 @@ async def create_draft_post(request: Request, blog_id: Optional[str] = None):
         
         # Create Empty Draft
         from datetime import datetime
-        record = table.create({
+        record = await table.create({
             "Title": "Untitled Draft",
             "Status": "Draft",
             "Content": "Start writing here..."
@@ -646,13 +660,13 @@ async def delete_post_action(request: Request, blog_id: str = Form(...), post_id
         return RedirectResponse(url="/admin/login", status_code=status.HTTP_303_SEE_OTHER)
 
     try:
-        from execution.utils import get_blog_config, get_base_id
-        api = get_airtable_client()
-        blog = get_blog_config(blog_id)
+        api = get_async_airtable()
+        blog = await get_blog_config_async(blog_id)
         if blog:
             base_id = get_base_id(blog)
             table = api.table(base_id, blog["airtable"]["table_name"])
-            table.delete(post_id)
+            await table.delete(post_id)
+            await asyncio.to_thread(mirror_post_change, blog_id, deleted_id=post_id)
             
     except Exception as e:
         print(f"Error deleting post: {e}")
@@ -666,11 +680,11 @@ async def delete_voice(request: Request, voice_id: str):
         return RedirectResponse(url="/admin/login", status_code=status.HTTP_303_SEE_OTHER)
         
     try:
-        api = get_airtable_client()
+        api = get_async_airtable()
         base_id = os.environ.get("AIRTABLE_BASE_ID")
         if base_id:
             table = api.table(base_id, "Voice_Profiles")
-            table.delete(voice_id)
+            await table.delete(voice_id)
     except Exception as e:
         print(f"Error deleting voice: {e}")
         
@@ -689,7 +703,7 @@ async def settings_blogs(request: Request):
     if not is_authenticated(request):
         return RedirectResponse(url="/admin/login")
     
-    blogs = load_blogs_config()
+    blogs = await load_blogs_config_async()
     return templates.TemplateResponse("admin/settings_blogs.html", {"request": request, "blogs": blogs})
 
 @router.post("/settings/blogs", response_class=RedirectResponse)
@@ -701,11 +715,11 @@ async def create_blog_config(request: Request,
         return RedirectResponse(url="/admin/login", status_code=status.HTTP_303_SEE_OTHER)
         
     try:
-        api = get_airtable_client()
+        api = get_async_airtable()
         master_base = os.environ.get("AIRTABLE_BASE_ID")
         if master_base:
             table = api.table(master_base, "Blogs")
-            table.create({
+            await table.create({
                 "Name": name,
                 "Domain": domain,
                 "Airtable_Base_ID": base_id,
@@ -713,10 +727,9 @@ async def create_blog_config(request: Request,
                 "Generation_Contract": "v2.0" # Default
             }, typecast=True)
             
-            # Invalidate Cache
-            from execution.utils import _BLOGS_CACHE
-            # We can't clear imported global easily unless we expose a clear function, 
-            # but for now waiting 60s or restarting server is acceptable for MVP.
+            # Invalidate Cache (every worker picks up the new blog on its next request)
+            from execution.utils import invalidate_blogs_cache
+            await asyncio.to_thread(invalidate_blogs_cache)
             
     except Exception as e:
         print(f"Error creating blog config: {e}")
@@ -729,7 +742,7 @@ async def create_author(request: Request, name: str = Form(...), bio: Optional[s
         return RedirectResponse(url="/admin/login", status_code=status.HTTP_303_SEE_OTHER)
         
     try:
-        api = get_airtable_client()
+        api = get_async_airtable()
         base_id = os.environ.get("AIRTABLE_BASE_ID")
         if base_id:
             table = api.table(base_id, "Author_Profile")
@@ -739,7 +752,7 @@ async def create_author(request: Request, name: str = Form(...), bio: Optional[s
             if voice_id:
                 fields["Voice_Profile"] = [voice_id]
                 
-            table.create(fields, typecast=True)
+            await table.create(fields, typecast=True)
     except Exception as e:
         print(f"Error creating author: {e}")
         
@@ -753,15 +766,15 @@ async def author_detail(request: Request, author_id: str):
     author = None
     
     try:
-        api = get_airtable_client()
+        api = get_async_airtable()
         base_id = os.environ.get("AIRTABLE_BASE_ID")
         table = api.table(base_id, "Author_Profile")
-        record = table.get(author_id)
+        record = await table.get(author_id)
         f = record["fields"]
         
         # Fetch Voices for Dropdown
         voices_table = api.table(base_id, "Voice_Profiles")
-        voices_records = voices_table.all()
+        voices_records = await voices_table.all()
         voices = [{"id": v["id"], "name": v["fields"].get("Name", "Unnamed")} for v in voices_records]
 
         author = {
@@ -790,7 +803,7 @@ async def save_author_update(request: Request,
         return RedirectResponse(url="/admin/login", status_code=status.HTTP_303_SEE_OTHER)
         
     try:
-        api = get_airtable_client()
+        api = get_async_airtable()
         base_id = get_base_id({"airtable": {"base_id_direct": os.environ.get("AIRTABLE_BASE_ID"), "base_id_env": "AIRTABLE_BASE_ID"}}) # Hacky context
         # Better: just use os.environ since authors are global/shared base usually
         base_id = os.environ.get("AIRTABLE_BASE_ID")
@@ -806,7 +819,7 @@ async def save_author_update(request: Request,
             else:
                  fields["Voice_Profile"] = [] # Clear if None selected
                  
-            table.update(author_id, fields, typecast=True)
+            await table.update(author_id, fields, typecast=True)
     except Exception as e:
         print(f"Error updating author: {e}")
         
@@ -817,20 +830,19 @@ async def blog_detail(request: Request, blog_id: str):
     if not is_authenticated(request):
         return RedirectResponse(url="/admin/login")
         
-    blogs = load_blogs_config()
-    blog = next((b for b in blogs if b["id"] == blog_id), None)
+    blog = await get_blog_config_async(blog_id)
     if not blog:
         raise HTTPException(status_code=404, detail="Blog not found")
 
     posts = []
     posts = []
     try:
-        api = get_airtable_client()
+        api = get_async_airtable()
         base_id = get_base_id(blog)
         if base_id:
              table = api.table(base_id, blog["airtable"]["table_name"])
              # Fetch generic view
-             posts = table.all(sort=["-PublishedDate"], max_records=20)
+             posts = await table.all(sort=["-PublishedDate"], max_records=20)
     except Exception as e:
         print(f"Error fetching posts: {e}")
 
@@ -843,14 +855,14 @@ async def blog_detail(request: Request, blog_id: str):
     # Fetch voices for the modal dropdown
     voices = []
     try:
-        api = get_airtable_client()
+        api = get_async_airtable()
         # Voices are in the BASE defined by the blog? Or a central base?
         # Assuming all blogs share the SAME base for now as per env config, or at least we check the one configured.
         # But wait, voices might be global. Let's assume they are in the same base as the blog for this architecture.
         base_id = os.environ.get("AIRTABLE_BASE_ID") # Using the main base ID for voices
         if base_id:
             table = api.table(base_id, "Voice_Profiles")
-            records = table.all()
+            records = await table.all()
             for r in records:
                 voices.append({"id": r["id"], "name": r["fields"].get("Name", "Unnamed")})
     except:
@@ -868,13 +880,12 @@ async def create_post(request: Request, blog_id: str, title: str = Form(...), vo
     if not is_authenticated(request):
         return RedirectResponse(url="/admin/login", status_code=status.HTTP_303_SEE_OTHER)
     
-    blogs = load_blogs_config()
-    blog = next((b for b in blogs if b["id"] == blog_id), None)
+    blog = await get_blog_config_async(blog_id)
     if not blog:
         raise HTTPException(status_code=404, detail="Blog not found")
         
     try:
-        api = get_airtable_client()
+        api = get_async_airtable()
         base_id = get_base_id(blog)
         
         if base_id:
@@ -889,7 +900,7 @@ async def create_post(request: Request, blog_id: str, title: str = Form(...), vo
                 fields["Voice_Profile_Override"] = [voice_id]
             
             # Create Record
-            table.create(fields, typecast=True)
+            await table.create(fields, typecast=True)
             
     except Exception as e:
         print(f"Error creating post: {e}")
@@ -901,19 +912,18 @@ async def post_detail_editor(request: Request, blog_id: str, post_id: str):
     if not is_authenticated(request):
         return RedirectResponse(url="/admin/login")
         
-    blogs = load_blogs_config()
-    blog = next((b for b in blogs if b["id"] == blog_id), None)
+    blog = await get_blog_config_async(blog_id)
     if not blog:
         raise HTTPException(status_code=404, detail="Blog not found")
 
     post = None
     try:
-        api = get_airtable_client()
+        api = get_async_airtable()
         base_id = get_base_id(blog)
         
         if base_id:
             table = api.table(base_id, blog["airtable"]["table_name"])
-            r = table.get(post_id)
+            r = await table.get(post_id)
             f = r["fields"]
             post = {
                 "id": r["id"],
@@ -939,12 +949,12 @@ async def post_detail_editor(request: Request, blog_id: str, post_id: str):
     try:
         if base_id:
             authors_table = api.table(base_id, "Author_Profile")
-            authors_records = authors_table.all()
+            authors_records = await authors_table.all()
             authors = [{"id": a["id"], "name": a["fields"].get("Author_Name", "Unnamed")} for a in authors_records]
     except Exception as e:
         print(f"Error fetching authors: {e}")
 
-    return render_admin(request, "admin/post_review.html", {
+    return await render_admin(request, "admin/post_review.html", {
         "request": request,
         "blog": blog,
         "post": post,
@@ -964,13 +974,12 @@ async def save_post_content(request: Request,
     if not is_authenticated(request):
         return RedirectResponse(url="/admin/login", status_code=status.HTTP_303_SEE_OTHER)
 
-    blogs = load_blogs_config()
-    blog = next((b for b in blogs if b["id"] == blog_id), None)
+    blog = await get_blog_config_async(blog_id)
     if not blog:
         return RedirectResponse(url=f"/admin/blogs/{blog_id}/posts/{post_id}?error=Blog+Not+Found", status_code=status.HTTP_303_SEE_OTHER)
 
     try:
-        api = get_airtable_client()
+        api = get_async_airtable()
         base_id = get_base_id(blog)
         
         if base_id:
@@ -986,7 +995,8 @@ async def save_post_content(request: Request,
             # Preserve slug/image if passed (currently from readonly fields or hidden)
             # For now, we only update Title, Content, Author as per requirements.
             
-            table.update(post_id, fields, typecast=True)
+            record = await table.update(post_id, fields, typecast=True)
+            await asyncio.to_thread(mirror_post_change, blog_id, record)
             
     except Exception as e:
         print(f"Error saving post: {e}")
@@ -1002,13 +1012,12 @@ async def request_revision(request: Request,
     if not is_authenticated(request):
         return RedirectResponse(url="/admin/login", status_code=status.HTTP_303_SEE_OTHER)
 
-    blogs = load_blogs_config()
-    blog = next((b for b in blogs if b["id"] == blog_id), None)
+    blog = await get_blog_config_async(blog_id)
     if not blog:
         raise HTTPException(status_code=404, detail="Blog not found")
 
     try:
-        api = get_airtable_client()
+        api = get_async_airtable()
         base_id = get_base_id(blog)
         
         if base_id:
@@ -1017,7 +1026,8 @@ async def request_revision(request: Request,
                 "Status": "RevisionRequested",
                 "User_Feedback": feedback
             }
-            table.update(post_id, fields, typecast=True)
+            record = await table.update(post_id, fields, typecast=True)
+            await asyncio.to_thread(mirror_post_change, blog_id, record)
             
     except Exception as e:
         print(f"Error requesting revision: {e}")
@@ -0,0 +1,152 @@
+import os
+import time
+import asyncio
+from typing import Optional, Dict, Any, List
+from urllib.parse import quote
+
+import httpx
+
+from execution import rate_limit, metrics
+
+API_URL = os.environ.get("AIRTABLE_API_URL", "https://api.airtable.com/v0")
+# Keep-alive pool shared by every request handler in this worker
+MAX_CONNECTIONS = int(os.environ.get("AIRTABLE_MAX_CONNECTIONS", "20"))
+TIMEOUT = float(os.environ.get("AIRTABLE_TIMEOUT", "30"))
+
+# Airtable rejects batches/pages larger than these
+MAX_PAGE_SIZE = 100
+
+_CLIENT: Optional[httpx.AsyncClient] = None
+_CLIENT_LOOP = None
+
+
+def _get_client() -> httpx.AsyncClient:
+    """
+    The worker's shared httpx client. An AsyncClient's pool belongs to the loop that opened it,
+    so a new one is made if we are called from a different loop (e.g. a test client's portal).
+    """
+    global _CLIENT, _CLIENT_LOOP
+    loop = asyncio.get_running_loop()
+    if _CLIENT is None or _CLIENT.is_closed or _CLIENT_LOOP is not loop:
+        api_key = os.environ.get("AIRTABLE_API_KEY")
+        if not api_key:
+            raise ValueError("AIRTABLE_API_KEY not found in environment variables")
+        _CLIENT = httpx.AsyncClient(
+            base_url=API_URL,
+            headers={"Authorization": f"Bearer {api_key}"},
+            timeout=TIMEOUT,
+            limits=httpx.Limits(max_connections=MAX_CONNECTIONS, max_keepalive_connections=MAX_CONNECTIONS),
+        )
+        _CLIENT_LOOP = loop
+    return _CLIENT
+
+
+async def aclose():
+    """Closes the shared client (server shutdown)."""
+    global _CLIENT, _CLIENT_LOOP
+    client, _CLIENT, _CLIENT_LOOP = _CLIENT, None, None
+    if client is not None and not client.is_closed:
+        await client.aclose()
+
+
+async def _request(base_id: str, table_name: str, method: str, path: str, **kwargs) -> Dict[str, Any]:
+    """One Airtable call under the base's shared rate limit, retrying 429s; `table_name` labels metrics."""
+    attempt = 0
+    while True:
+        # Shares the per-base budget with every other worker and the sync client
+        await rate_limit.acquire_async(base_id)
+        started = time.perf_counter()
+        try:
+            response = await _get_client().request(method, path, **kwargs)
+        except httpx.HTTPError:
+            metrics.record_airtable_call(base_id, table_name, "error", time.perf_counter() - started)
+            raise
+        metrics.record_airtable_call(base_id, table_name, str(response.status_code), time.perf_counter() - started)
+        if response.status_code == 429:
+            delay = await asyncio.to_thread(rate_limit.throttled, base_id, attempt, response.headers.get("Retry-After"))
+            if delay is not None:
+                print(f"Airtable 429 on {base_id}; retrying in {delay:.1f}s")
+                attempt += 1
+                continue
+        response.raise_for_status()
+        return response.json()
+
+
+async def list_tables(base_id: str) -> List[Dict[str, Any]]:
+    """Table schema of a base ([{id, name, ...}]); needs the schema.bases:read scope."""
+    return (await _request(base_id, "", "GET", f"/meta/bases/{base_id}/tables")).get("tables", [])
+
+
+def _sort_params(sort: List[str]) -> List[tuple]:
+    """pyairtable-style sort (["-PublishedDate", "Title"]) to Airtable query params."""
+    params = []
+    for i, field in enumerate(sort):
+        direction = "desc" if field.startswith("-") else "asc"
+        params.append((f"sort[{i}][field]", field.lstrip("-")))
+        params.append((f"sort[{i}][direction]", direction))
+    return params
+
+
+class AsyncTable:
+    """
+    Async counterpart of pyairtable's Table for the calls this app makes
+    (all / get / create / update / delete). Records come back in the same shape
+    ({"id", "createdTime", "fields"}), so callers only need to add `await`.
+    """
+
+    def __init__(self, base_id: str, table_name: str):
+        self.base_id = base_id
+        self.table_name = table_name
+
+    @property
+    def _path(self) -> str:
+        return f"/{self.base_id}/{quote(self.table_name, safe='')}"
+
+    async def _request(self, method: str, path: str, **kwargs) -> Dict[str, Any]:
+        return await _request(self.base_id, self.table_name, method, path, **kwargs)
+
+    async def all(self, fields: Optional[List[str]] = None, sort: Optional[List[str]] = None,
+                  formula: Optional[str] = None, max_records: Optional[int] = None,
+                  view: Optional[str] = None, page_size: int = MAX_PAGE_SIZE) -> List[Dict[str, Any]]:
+        params = [("pageSize", min(page_size, MAX_PAGE_SIZE))]
+        params += [("fields[]", f) for f in fields or []]
+        params += _sort_params(sort or [])
+        if formula:
+            params.append(("filterByFormula", formula))
+        if max_records:
+            params.append(("maxRecords", max_records))
+        if view:
+            params.append(("view", view))
+
+        records: List[Dict[str, Any]] = []
+        offset = None
+        while True:
+            data = await self._request("GET", self._path, params=params + ([("offset", offset)] if offset else []))
+            records.extend(data.get("records", []))
+            offset = data.get("offset")
+            if not offset or (max_records and len(records) >= max_records):
+                return records[:max_records] if max_records else records
+
+    async def get(self, record_id: str) -> Dict[str, Any]:
+        return await self._request("GET", f"{self._path}/{record_id}")
+
+    async def create(self, fields: Dict[str, Any], typecast: bool = False) -> Dict[str, Any]:
+        return await self._request("POST", self._path, json={"fields": fields, "typecast": typecast})
+
+    async def update(self, record_id: str, fields: Dict[str, Any], typecast: bool = False) -> Dict[str, Any]:
+        return await self._request("PATCH", f"{self._path}/{record_id}", json={"fields": fields, "typecast": typecast})
+
+    async def delete(self, record_id: str) -> Dict[str, Any]:
+        return await self._request("DELETE", f"{self._path}/{record_id}")
+
+
+class AsyncApi:
+    """Drop-in for pyairtable.Api inside request handlers: `api.table(base_id, name)`."""
+
+    def table(self, base_id: str, table_name: str) -> AsyncTable:
+        return AsyncTable(base_id, table_name)
+
+
+def get_async_airtable() -> AsyncApi:
+    """Async Airtable access for request handlers; all tables share the worker's pooled client."""
+    return AsyncApi()
@@ -0,0 +1,120 @@
+import os
+import json
+import gzip
+import hashlib
+import mimetypes
+import threading
+from typing import Dict
+
+from starlette.datastructures import Headers
+from starlette.responses import FileResponse
+from starlette.staticfiles import StaticFiles
+
+from execution.compression import brotli, accepted_encodings
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+STATIC_DIR = os.path.join(BASE_DIR, "static")
+# Fingerprinted copies (and their .gz / .br siblings) are written here at startup
+BUILD_DIR = os.environ.get("STATIC_BUILD_DIR", os.path.join(BASE_DIR, ".cache", "static"))
+MANIFEST_NAME = "manifest.json"
+
+IMMUTABLE = "public, max-age=31536000, immutable"
+COMPRESS_EXTENSIONS = {".css", ".js", ".svg", ".json", ".txt", ".xml", ".html", ".map"}
+MIN_COMPRESS_SIZE = 256
+
+# "css/style.css" -> "css/style.1a2b3c4d5e.css", and the reverse
+_MANIFEST: Dict[str, str] = {}
+_ORIGINALS: Dict[str, str] = {}
+_BUILT = False
+_BUILD_LOCK = threading.Lock()
+
+
+def _fingerprinted(rel: str, digest: str) -> str:
+    base, ext = os.path.splitext(rel)
+    return f"{base}.{digest[:10]}{ext}"
+
+
+def _write_atomic(path: str, data: bytes):
+    """Concurrent workers may build at the same time; each writes its own temp file and renames."""
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp = f"{path}.{os.getpid()}.tmp"
+    with open(tmp, "wb") as f:
+        f.write(data)
+    os.replace(tmp, path)
+
+
+def build(static_dir: str = STATIC_DIR, build_dir: str = BUILD_DIR) -> Dict[str, str]:
+    """
+    Fingerprints every file under static/ with its content hash and precompresses text assets
+    (gzip, plus brotli when installed). Existing outputs are reused, and older fingerprints are
+    left in place for pages still cached with them. Returns the manifest.
+    """
+    global _MANIFEST, _ORIGINALS, _BUILT
+    manifest = {}
+    for root, _, files in os.walk(static_dir):
+        for name in sorted(files):
+            src = os.path.join(root, name)
+            rel = os.path.relpath(src, static_dir).replace(os.sep, "/")
+            with open(src, "rb") as f:
+                data = f.read()
+            target = _fingerprinted(rel, hashlib.sha256(data).hexdigest())
+            manifest[rel] = target
+
+            out = os.path.join(build_dir, target)
+            if not os.path.exists(out):
+                _write_atomic(out, data)
+            if os.path.splitext(rel)[1].lower() not in COMPRESS_EXTENSIONS or len(data) < MIN_COMPRESS_SIZE:
+                continue
+            if not os.path.exists(out + ".gz"):
+                _write_atomic(out + ".gz", gzip.compress(data, compresslevel=9, mtime=0))
+            if brotli is not None and not os.path.exists(out + ".br"):
+                _write_atomic(out + ".br", brotli.compress(data, quality=11))
+
+    _write_atomic(os.path.join(build_dir, MANIFEST_NAME), json.dumps(manifest, indent=0, sort_keys=True).encode("utf-8"))
+    _MANIFEST = manifest
+    _ORIGINALS = {v: k for k, v in manifest.items()}
+    _BUILT = True
+    return manifest
+
+
+def ensure_built():
+    if not _BUILT:
+        with _BUILD_LOCK:
+            if not _BUILT:
+                build()
+
+
+def asset_url(path: str) -> str:
+    """Template helper: asset_url('css/style.css') -> '/static/css/style.<hash>.css'."""
+    ensure_built()
+    rel = path.lstrip("/")
+    if rel.startswith("static/"):
+        rel = rel[len("static/"):]
+    return f"/static/{_MANIFEST.get(rel, rel)}"
+
+
+class StaticAssets(StaticFiles):
+    """
+    /static mount. Fingerprinted names are served from the build directory with
+    `Cache-Control: immutable`, preferring a precompressed .br/.gz the client accepts.
+    Plain names fall back to ordinary StaticFiles behaviour.
+    """
+
+    async def get_response(self, path: str, scope):
+        rel = path.replace(os.sep, "/")
+        original = _ORIGINALS.get(rel)
+        if original is None:
+            return await super().get_response(path, scope)
+
+        full = os.path.join(BUILD_DIR, rel)
+        media_type = mimetypes.guess_type(original)[0] or "application/octet-stream"
+        headers = {"Cache-Control": IMMUTABLE}
+        if os.path.splitext(rel)[1].lower() in COMPRESS_EXTENSIONS:
+            headers["Vary"] = "Accept-Encoding"
+            accepted = accepted_encodings(Headers(scope=scope).get("accept-encoding"))
+            for encoding, suffix in (("br", ".br"), ("gzip", ".gz")):
+                if encoding in accepted and os.path.exists(full + suffix):
+                    headers["Content-Encoding"] = encoding
+                    full += suffix
+                    break
+        return FileResponse(full, media_type=media_type, headers=headers)
@@ -0,0 +1,194 @@
+import os
+import json
+import time
+import sqlite3
+import threading
+from typing import Optional, Dict, Any
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+# One file per host: every worker process reads and refreshes the same entries
+CACHE_PATH = os.environ.get("CONFIG_CACHE_PATH", os.path.join(BASE_DIR, ".cache", "config.sqlite3"))
+# How often a worker re-reads the shared version counters (bounds how long an invalidation takes to reach it)
+VERSION_CHECK_INTERVAL = float(os.environ.get("CONFIG_VERSION_CHECK_INTERVAL", "1"))
+# How long one worker may hold the refresh lease before another is allowed to try
+REFRESH_LEASE = 30.0
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS config_cache (
+    key TEXT PRIMARY KEY,
+    value TEXT,
+    fetched_at REAL NOT NULL DEFAULT 0,
+    version INTEGER NOT NULL DEFAULT 0,
+    refreshing_until REAL NOT NULL DEFAULT 0
+);
+"""
+
+_local = threading.local()
+_VERSIONS_LOCK = threading.Lock()
+# key -> (version, checked_at)
+_VERSIONS: Dict[str, tuple] = {}
+
+
+def _connect() -> sqlite3.Connection:
+    conn = getattr(_local, "conn", None)
+    if conn is not None and getattr(_local, "path", None) == CACHE_PATH:
+        return conn
+
+    os.makedirs(os.path.dirname(CACHE_PATH), exist_ok=True)
+    conn = sqlite3.connect(CACHE_PATH, timeout=10, isolation_level=None)
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.executescript(_SCHEMA)
+    _local.conn = conn
+    _local.path = CACHE_PATH
+    return conn
+
+
+def _read_version(conn: sqlite3.Connection, key: str) -> int:
+    row = conn.execute("SELECT version FROM config_cache WHERE key=?", (key,)).fetchone()
+    return row[0] if row else 0
+
+
+def _remember_version(key: str, version: int):
+    with _VERSIONS_LOCK:
+        _VERSIONS[key] = (version, time.monotonic())
+
+
+def current_version(key: str, refresh: bool = False) -> int:
+    """
+    Shared version of `key`, bumped by every invalidate(). Re-read from disk at most once per
+    VERSION_CHECK_INTERVAL (or when `refresh`), so it is cheap enough to call on every request.
+    """
+    now = time.monotonic()
+    with _VERSIONS_LOCK:
+        cached = _VERSIONS.get(key)
+    if cached and not refresh and now - cached[1] < VERSION_CHECK_INTERVAL:
+        return cached[0]
+    try:
+        version = _read_version(_connect(), key)
+    except sqlite3.Error as e:
+        print(f"Config cache: version check for {key} failed: {e}")
+        return cached[0] if cached else 0
+    _remember_version(key, version)
+    return version
+
+
+def lookup(key: str, ttl: float) -> Optional[Dict[str, Any]]:
+    """
+    Returns the shared entry as {value, fetched_at, version, fresh}, or None if no worker has stored one.
+    `fresh` means it is younger than `ttl` and nobody has invalidated it since it was fetched.
+    """
+    try:
+        row = _connect().execute(
+            "SELECT value, fetched_at, version FROM config_cache WHERE key=? AND value IS NOT NULL", (key,)
+        ).fetchone()
+    except sqlite3.Error as e:
+        print(f"Config cache: read of {key} failed: {e}")
+        return None
+    if row is None:
+        return None
+    value, fetched_at, version = row
+    _remember_version(key, version)
+    return {
+        "value": json.loads(value),
+        "fetched_at": fetched_at,
+        "version": version,
+        # invalidate() zeroes fetched_at, so an invalidated entry is never fresh
+        "fresh": time.time() - fetched_at < ttl,
+    }
+
+
+def wait_for(key: str, ttl: float, timeout: float = REFRESH_LEASE) -> Optional[Dict[str, Any]]:
+    """Polls until the worker holding the refresh lease stores a fresh entry (None on timeout)."""
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        entry = lookup(key, ttl)
+        if entry and entry["fresh"]:
+            return entry
+        time.sleep(0.05)
+    return None
+
+
+def claim_refresh(key: str) -> bool:
+    """Takes the refresh lease for `key`; False if another worker is already refetching it."""
+    now = time.time()
+    try:
+        conn = _connect()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            row = conn.execute("SELECT refreshing_until FROM config_cache WHERE key=?", (key,)).fetchone()
+            if row and row[0] > now:
+                conn.execute("ROLLBACK")
+                return False
+            conn.execute(
+                "INSERT INTO config_cache (key, refreshing_until) VALUES (?, ?) "
+                "ON CONFLICT(key) DO UPDATE SET refreshing_until=excluded.refreshing_until",
+                (key, now + REFRESH_LEASE),
+            )
+            conn.execute("COMMIT")
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+        return True
+    except sqlite3.Error as e:
+        print(f"Config cache: could not claim refresh of {key}: {e}")
+        return True
+
+
+def release_refresh(key: str):
+    """Gives up the refresh lease without storing anything (the fetch failed)."""
+    try:
+        _connect().execute("UPDATE config_cache SET refreshing_until=0 WHERE key=?", (key,))
+    except sqlite3.Error as e:
+        print(f"Config cache: could not release refresh of {key}: {e}")
+
+
+def store(key: str, value: Any, version: int) -> int:
+    """
+    Publishes a freshly fetched value for every worker and releases the refresh lease.
+    `version` is the one read before fetching: if an invalidation landed mid-fetch the
+    entry keeps the older version and readers will refetch rather than trust it.
+    Returns the version the entry is stored under.
+    """
+    try:
+        conn = _connect()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            current = _read_version(conn, key)
+            fetched_at = time.time() if current == version else 0
+            conn.execute(
+                "INSERT INTO config_cache (key, value, fetched_at, version, refreshing_until) VALUES (?, ?, ?, ?, 0) "
+                "ON CONFLICT(key) DO UPDATE SET value=excluded.value, fetched_at=excluded.fetched_at, refreshing_until=0",
+                (key, json.dumps(value), fetched_at, current),
+            )
+            conn.execute("COMMIT")
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+        _remember_version(key, current)
+        return current
+    except sqlite3.Error as e:
+        print(f"Config cache: write of {key} failed: {e}")
+        return version
+
+
+def invalidate(key: str) -> int:
+    """Bumps the shared version of `key` so every worker drops its copy on its next check."""
+    try:
+        conn = _connect()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            conn.execute(
+                "INSERT INTO config_cache (key, version) VALUES (?, 1) "
+                "ON CONFLICT(key) DO UPDATE SET version=version+1, fetched_at=0",
+                (key,),
+            )
+            version = _read_version(conn, key)
+            conn.execute("COMMIT")
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+    except sqlite3.Error as e:
+        print(f"Config cache: invalidation of {key} failed: {e}")
+        return current_version(key)
+    _remember_version(key, version)
+    return version
@@ -0,0 +1,232 @@
+import argparse
+import os
+import sys
+import json
+import shutil
+import hashlib
+from datetime import datetime
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+from jinja2 import Environment, FileSystemLoader, select_autoescape
+
+from execution.utils import load_blogs_config
+from execution import post_store, render, related, sitemaps, feeds, assets
+from execution.pagination import DEFAULT_PAGE_SIZE, build_page
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+TEMPLATES_DIR = os.path.join(BASE_DIR, "templates")
+STATIC_DIR = os.path.join(BASE_DIR, "static")
+MANIFEST_NAME = ".build-manifest.json"
+
+# Bump to force every post to be re-rendered on the next export
+EXPORT_VERSION = "1"
+
+
+def _templates_fingerprint() -> str:
+    """
+    Hash of every template and the static asset fingerprints, so editing a template or a
+    stylesheet (whose URL the pages embed) invalidates all rendered pages.
+    """
+    digest = hashlib.sha256(EXPORT_VERSION.encode("utf-8"))
+    digest.update(json.dumps(assets.build(), sort_keys=True).encode("utf-8"))
+    for root, _, files in sorted(os.walk(TEMPLATES_DIR)):
+        for name in sorted(files):
+            path = os.path.join(root, name)
+            digest.update(os.path.relpath(path, TEMPLATES_DIR).encode("utf-8"))
+            with open(path, "rb") as f:
+                digest.update(f.read())
+    return digest.hexdigest()
+
+
+def _env() -> Environment:
+    # Same loader/escaping as fastapi's Jinja2Templates, without needing a request
+    env = Environment(loader=FileSystemLoader(TEMPLATES_DIR), autoescape=select_autoescape(["html", "xml"]))
+    env.globals["asset_url"] = assets.asset_url
+    # No image proxy behind a static export: images link to Image_URL as-is
+    env.globals.update(image_url=lambda url, *args, **kwargs: url or "", image_srcset=lambda *args, **kwargs: "",
+                       image_placeholder=lambda *args, **kwargs: None)
+    return env
+
+
+class _Writer:
+    """Writes build outputs, skipping files whose bytes are unchanged, and records them in the manifest."""
+
+    def __init__(self, out_dir: str):
+        self.out_dir = out_dir
+        self.manifest_path = os.path.join(out_dir, MANIFEST_NAME)
+        try:
+            with open(self.manifest_path, "r") as f:
+                self.previous = json.load(f)
+        except (FileNotFoundError, ValueError):
+            self.previous = {}
+        self.files = {}
+        self.written = 0
+        self.skipped = 0
+
+    def unchanged(self, rel_path: str, input_key: str) -> bool:
+        """True if rel_path was built from the same inputs last time and is still on disk."""
+        entry = self.previous.get(rel_path)
+        if entry and entry.get("input") == input_key and os.path.exists(os.path.join(self.out_dir, rel_path)):
+            self.files[rel_path] = entry
+            self.skipped += 1
+            return True
+        return False
+
+    def write(self, rel_path: str, content, input_key: str = None):
+        data = content.encode("utf-8") if isinstance(content, str) else content
+        digest = hashlib.sha256(data).hexdigest()
+        path = os.path.join(self.out_dir, rel_path)
+        entry = self.previous.get(rel_path)
+        if entry and entry.get("sha256") == digest and os.path.exists(path):
+            self.skipped += 1
+        else:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            tmp = path + ".tmp"
+            with open(tmp, "wb") as f:
+                f.write(data)
+            os.replace(tmp, path)
+            self.written += 1
+        self.files[rel_path] = {"sha256": digest, "input": input_key}
+
+    def finish(self) -> int:
+        """Deletes outputs from the previous build that this build did not produce; saves the manifest."""
+        removed = 0
+        for rel_path in set(self.previous) - set(self.files):
+            try:
+                os.remove(os.path.join(self.out_dir, rel_path))
+                removed += 1
+            except FileNotFoundError:
+                pass
+        with open(self.manifest_path + ".tmp", "w") as f:
+            json.dump(self.files, f, indent=0, sort_keys=True)
+        os.replace(self.manifest_path + ".tmp", self.manifest_path)
+        return removed
+
+
+def _copy_static(writer: _Writer):
+    """Copies static/ as-is plus the current fingerprinted assets (and .gz/.br) the pages link to."""
+    manifest = assets.build()
+    sources = [os.path.join(STATIC_DIR, rel) for rel in manifest]
+    for rel in manifest.values():
+        path = os.path.join(assets.BUILD_DIR, rel)
+        sources += [p for p in (path, path + ".gz", path + ".br") if os.path.exists(p)]
+    for src in sources:
+        base = STATIC_DIR if src.startswith(STATIC_DIR + os.sep) else assets.BUILD_DIR
+        rel = os.path.join("static", os.path.relpath(src, base))
+        stat = os.stat(src)
+        key = f"{stat.st_size}:{stat.st_mtime_ns}"
+        if not writer.unchanged(rel, key):
+            with open(src, "rb") as f:
+                writer.write(rel, f.read(), key)
+
+
+def _page_path(n: int) -> str:
+    return "index.html" if n == 1 else os.path.join("page", str(n), "index.html")
+
+
+def _page_url(n: int) -> str:
+    return "/" if n == 1 else f"/page/{n}/"
+
+
+def export_blog(blog: dict, out_root: str, page_size: int = DEFAULT_PAGE_SIZE) -> dict:
+    """Renders one blog (index pages, posts, sitemap, RSS, static assets) into out_root/<blog id>/."""
+    blog_id = blog["id"]
+    out_dir = os.path.join(out_root, blog_id)
+    os.makedirs(out_dir, exist_ok=True)
+    writer = _Writer(out_dir)
+    env = _env()
+    now = datetime.now()
+    fingerprint = _templates_fingerprint()
+    blog_key = json.dumps([blog["name"], blog["domain"], fingerprint, render.RENDERER_VERSION])
+
+    # Posts: only re-rendered when the record, blog or templates changed
+    post_template = env.get_template("post.html")
+    cards = post_store.list_published([blog_id])
+    for card in cards:
+        slug = card["fields"].get("Slug")
+        if not slug:
+            continue
+        rel = os.path.join("post", slug, "index.html")
+        related_posts = related.related_for(blog_id, card["id"])
+        input_key = hashlib.sha256(
+            f"{blog_key}\0{card['_hash']}\0{related.fingerprint(related_posts)}".encode("utf-8")
+        ).hexdigest()
+        if writer.unchanged(rel, input_key):
+            continue
+        record = post_store.get_record(blog_id, card["id"])
+        html = post_template.render(request=None, blog=blog, post=render.post_view(record),
+                                    related=related_posts, now=now)
+        writer.write(rel, html, input_key)
+
+    # Index pages: cheap to render, only written when their bytes change
+    index_template = env.get_template("index.html")
+    n = 1
+    for start in range(0, max(len(cards), 1), page_size):
+        chunk = cards[start:start + page_size + 1]
+        page = build_page(chunk, page_size, None, "next")
+        html = index_template.render(
+            request=None, blog=blog, posts=page["posts"], now=now,
+            prev_url=_page_url(n - 1) if n > 1 else None,
+            next_url=_page_url(n + 1) if page["next_cursor"] else None,
+        )
+        writer.write(_page_path(n), html)
+        n += 1
+
+    for name, xml in sitemaps.render_sitemap_files(blog).items():
+        writer.write(name, xml)
+    newest = cards[:feeds.FEED_ITEM_LIMIT]
+    writer.write("rss.xml", feeds.build_feed(blog, "rss", newest))
+    writer.write("atom.xml", feeds.build_feed(blog, "atom", newest))
+    writer.write("feed.json", feeds.build_feed(blog, "json", newest))
+    _copy_static(writer)
+    removed = writer.finish()
+    return {"blog": blog["name"], "posts": len(cards), "written": writer.written,
+            "skipped": writer.skipped, "removed": removed}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Render every blog to static files.")
+    parser.add_argument("--out", default=os.path.join(BASE_DIR, "dist"), help="Output directory")
+    parser.add_argument("--blog-id", action="append", help="Only export these blogs (repeatable)")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 2, help="Blogs rendered in parallel")
+    parser.add_argument("--page-size", type=int, default=DEFAULT_PAGE_SIZE, help="Posts per index page")
+    parser.add_argument("--no-sync", action="store_true", help="Use the post mirror as-is (no Airtable sync)")
+    parser.add_argument("--clean", action="store_true", help="Delete the output directory first (full rebuild)")
+    args = parser.parse_args()
+
+    blogs = load_blogs_config()
+    if args.blog_id:
+        blogs = [b for b in blogs if b["id"] in args.blog_id]
+    if not blogs:
+        print("No blogs to export.")
+        sys.exit(1)
+
+    if args.clean and os.path.isdir(args.out):
+        shutil.rmtree(args.out)
+
+    if not args.no_sync:
+        for blog in blogs:
+            try:
+                n = post_store.sync_blog(blog)
+                print(f"Synced {blog['name']}: {n} changed records")
+            except Exception as e:
+                print(f"Sync failed for {blog['name']} (exporting mirror as-is): {e}")
+
+    failed = False
+    with ProcessPoolExecutor(max_workers=max(1, min(args.workers, len(blogs)))) as pool:
+        futures = {pool.submit(export_blog, b, args.out, args.page_size): b for b in blogs}
+        for future in as_completed(futures):
+            blog = futures[future]
+            try:
+                stats = future.result()
+                print(f"Exported {stats['blog']}: {stats['posts']} posts, {stats['written']} written, "
+                      f"{stats['skipped']} unchanged, {stats['removed']} removed -> {os.path.join(args.out, blog['id'])}")
+            except Exception as e:
+                failed = True
+                print(f"Export failed for {blog['name']}: {e}")
+    if failed:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,206 @@
+import os
+import re
+import json
+import time
+import sqlite3
+import argparse
+from urllib.parse import quote
+from typing import Optional, Dict, Any, List, Iterable, Tuple
+
+from execution import post_store
+from execution.mirror_index import MirrorIndex
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+INDEX_PATH = os.environ.get("FACET_INDEX_PATH", os.path.join(BASE_DIR, ".cache", "facets.sqlite3"))
+
+KINDS = ("tag", "entity")
+
+# facets is the term -> posts index, kept in listing order by idx_facets_listing; docs holds each
+# post's card once (rather than per term) and the mirror hash it was indexed from.
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS docs (
+    blog_id TEXT NOT NULL,
+    record_id TEXT NOT NULL,
+    content_hash TEXT,
+    card TEXT,
+    PRIMARY KEY (blog_id, record_id)
+);
+CREATE TABLE IF NOT EXISTS facets (
+    kind TEXT NOT NULL,
+    key TEXT NOT NULL,
+    label TEXT,
+    blog_id TEXT NOT NULL,
+    record_id TEXT NOT NULL,
+    published_date TEXT,
+    PRIMARY KEY (kind, key, blog_id, record_id)
+);
+CREATE INDEX IF NOT EXISTS idx_facets_listing ON facets (kind, key, published_date, record_id);
+CREATE INDEX IF NOT EXISTS idx_facets_post ON facets (blog_id, record_id);
+"""
+
+_NON_SLUG = re.compile(r"[^\w]+", re.UNICODE)
+
+
+# --- Terms ---
+
+def _json_list(value) -> list:
+    if isinstance(value, list):
+        return value
+    if not value:
+        return []
+    try:
+        parsed = json.loads(value)
+    except (TypeError, ValueError):
+        return []
+    return parsed if isinstance(parsed, list) else []
+
+
+def _unique(names: Iterable[Any]) -> List[str]:
+    seen = {}
+    for name in names:
+        name = str(name or "").strip()
+        if name and name.lower() not in seen:
+            seen[name.lower()] = name
+    return list(seen.values())
+
+
+def post_tags(fields: Dict[str, Any]) -> List[str]:
+    """Tags as written by generate_post (a comma-separated string) or a multi-select list."""
+    value = fields.get("Tags") or []
+    if isinstance(value, str):
+        value = value.split(",")
+    return _unique(value)
+
+
+def post_entities(fields: Dict[str, Any]) -> List[str]:
+    """Entity names from Entities_JSON ([{name, type}], or plain strings in older posts)."""
+    return _unique(e.get("name") if isinstance(e, dict) else e for e in _json_list(fields.get("Entities_JSON")))
+
+
+def facet_key(name: str) -> str:
+    """URL key for a term: 'Machine Learning' -> 'machine-learning'."""
+    return _NON_SLUG.sub("-", name.lower()).strip("-_")
+
+
+def facet_url(kind: str, name: str) -> str:
+    return f"/{kind}/{quote(facet_key(name))}"
+
+
+def post_facets(fields: Dict[str, Any]) -> List[Tuple[str, str, str]]:
+    """(kind, key, label) for every tag and entity on a post."""
+    terms = {}
+    for kind, names in (("tag", post_tags(fields)), ("entity", post_entities(fields))):
+        for name in names:
+            key = facet_key(name)
+            if key:
+                terms.setdefault((kind, key), name)
+    return [(kind, key, label) for (kind, key), label in terms.items()]
+
+
+# --- Index maintenance ---
+
+def _remove(conn: sqlite3.Connection, blog_id: str, record_ids: Iterable[str]):
+    params = [(blog_id, rid) for rid in record_ids]
+    conn.executemany("DELETE FROM facets WHERE blog_id=? AND record_id=?", params)
+    conn.executemany("DELETE FROM docs WHERE blog_id=? AND record_id=?", params)
+
+
+def _add(conn: sqlite3.Connection, blog_id: str, records: Iterable[Dict[str, Any]]):
+    for record in records:
+        fields = record["fields"]
+        published = fields.get("PublishedDate") or ""
+        card = {name: fields[name] for name in post_store.CARD_FIELDS if name in fields}
+        conn.execute(
+            "INSERT INTO docs (blog_id, record_id, content_hash, card) VALUES (?, ?, ?, ?)",
+            (blog_id, record["id"], record["_hash"], json.dumps(card)),
+        )
+        conn.executemany(
+            "INSERT INTO facets (kind, key, label, blog_id, record_id, published_date) VALUES (?, ?, ?, ?, ?, ?)",
+            [(kind, key, label, blog_id, record["id"], published) for kind, key, label in post_facets(fields)],
+        )
+
+
+_INDEX = MirrorIndex("Facet index", INDEX_PATH, _SCHEMA, _add, _remove)
+_INDEX.listen()
+_connect = _INDEX.connect
+# Reconciles each blog once per process before its first archive page
+ensure_indexed = _INDEX.ensure_indexed
+
+
+# --- Reads ---
+
+def label(kind: str, key: str, blog_ids: Optional[List[str]] = None) -> Optional[str]:
+    """Display name of a term (from its newest post), or None if no post in scope carries it."""
+    sql = "SELECT label FROM facets WHERE kind=? AND key=?"
+    params: List[Any] = [kind, key]
+    if blog_ids is not None:
+        if not blog_ids:
+            return None
+        sql += f" AND blog_id IN ({','.join('?' * len(blog_ids))})"
+        params.extend(blog_ids)
+    row = _connect().execute(sql + " ORDER BY published_date DESC LIMIT 1", params).fetchone()
+    return row[0] if row else None
+
+
+def list_page(kind: str, key: str, blog_ids: Optional[List[str]], limit: int, cursor_key: Optional[tuple] = None,
+              direction: str = "next") -> List[Dict[str, Any]]:
+    """
+    Keyset page of the posts carrying a term, in listing order (newest first); same contract as
+    post_store.list_published_page, and records carry the same card projection.
+    """
+    sql = ("SELECT f.blog_id, f.record_id, d.card FROM facets f "
+           "JOIN docs d ON d.blog_id = f.blog_id AND d.record_id = f.record_id WHERE f.kind=? AND f.key=?")
+    params: List[Any] = [kind, key]
+    if blog_ids is not None:
+        if not blog_ids:
+            return []
+        sql += f" AND f.blog_id IN ({','.join('?' * len(blog_ids))})"
+        params.extend(blog_ids)
+    if cursor_key is not None:
+        sql += " AND (f.published_date, f.record_id) " + ("<" if direction == "next" else ">") + " (?, ?)"
+        params.extend(cursor_key)
+    order = "DESC" if direction == "next" else "ASC"
+    sql += f" ORDER BY f.published_date {order}, f.record_id {order} LIMIT ?"
+    params.append(limit)
+    records = [{"id": record_id, "fields": json.loads(card), "_blog_id": blog_id}
+               for blog_id, record_id, card in _connect().execute(sql, params)]
+    if direction == "prev":
+        records.reverse()
+    return records
+
+
+def top_terms(kind: str, blog_ids: Optional[List[str]] = None, limit: int = 50) -> List[Dict[str, Any]]:
+    """Most used terms of a kind: [{key, label, count}]."""
+    sql = "SELECT key, MAX(label), COUNT(*) AS n FROM facets WHERE kind=?"
+    params: List[Any] = [kind]
+    if blog_ids is not None:
+        if not blog_ids:
+            return []
+        sql += f" AND blog_id IN ({','.join('?' * len(blog_ids))})"
+        params.extend(blog_ids)
+    sql += " GROUP BY key ORDER BY n DESC, key LIMIT ?"
+    params.append(limit)
+    return [{"key": key, "label": name, "count": n} for key, name, n in _connect().execute(sql, params)]
+
+
+def main(argv: Optional[Iterable[str]] = None):
+    from execution.utils import load_blogs_config
+
+    parser = argparse.ArgumentParser(description="Build the tag/entity index from the post mirror.")
+    parser.add_argument("--blog-id", help="Only this blog (default: all)")
+    parser.add_argument("--top", choices=KINDS, help="Print the most used terms of a kind instead")
+    args = parser.parse_args(argv)
+
+    blog_ids = [b["id"] for b in load_blogs_config() if not args.blog_id or b["id"] == args.blog_id]
+    if args.top:
+        for term in top_terms(args.top, blog_ids):
+            print(f"{term['count']:6d}  {term['label']}  {facet_url(args.top, term['label'])}")
+        return
+    for blog_id in blog_ids:
+        started = time.perf_counter()
+        changed, removed = _INDEX.reconcile(blog_id)
+        print(f"{blog_id}: {len(changed) + len(removed)} posts reindexed in {time.perf_counter() - started:.2f}s")
+
+
+if __name__ == "__main__":
+    main()
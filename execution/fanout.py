@@ -0,0 +1,37 @@
+import os
+import asyncio
+from typing import Callable, Dict, Any, List, Tuple
+
+# Per-blog budget (seconds) for aggregated pages; slower blogs are left out of the response
+BLOG_DEADLINE = float(os.environ.get("FANOUT_BLOG_DEADLINE", "2.0"))
+
+
+async def fan_out(blogs: List[Dict[str, Any]], loader: Callable[[Dict[str, Any]], Any],
+                  deadline: float = None) -> Tuple[Dict[str, Any], List[Dict[str, str]]]:
+    """
+    Runs a blocking `loader(blog)` for every blog concurrently in worker threads.
+    Every blog gets the same deadline, so the call returns after the slowest blog or the
+    deadline, whichever is first, and never blocks the event loop.
+    Returns ({blog_id: result}, omitted) where omitted lists {"id", "name", "reason"} for
+    blogs that timed out or failed.
+    """
+    deadline = BLOG_DEADLINE if deadline is None else deadline
+    if not blogs:
+        return {}, []
+
+    tasks = {asyncio.ensure_future(asyncio.to_thread(loader, blog)): blog for blog in blogs}
+    done, pending = await asyncio.wait(tasks.keys(), timeout=deadline)
+
+    results: Dict[str, Any] = {}
+    omitted: List[Dict[str, str]] = []
+    for task, blog in tasks.items():
+        if task in pending:
+            # The thread keeps running to completion (e.g. finishing a mirror sync); we just stop waiting
+            task.cancel()
+            omitted.append({"id": blog["id"], "name": blog.get("name", blog["id"]), "reason": "timeout"})
+        elif task.exception() is not None:
+            print(f"Fan-out: loading {blog.get('name')} failed: {task.exception()}")
+            omitted.append({"id": blog["id"], "name": blog.get("name", blog["id"]), "reason": "error"})
+        else:
+            results[blog["id"]] = task.result()
+    return results, omitted
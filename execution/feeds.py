@@ -0,0 +1,151 @@
+import os
+import json
+import hashlib
+import threading
+from datetime import datetime, timezone
+from email.utils import format_datetime
+from typing import Dict, Any, List, Iterator, Optional, Tuple
+from urllib.parse import quote
+from xml.sax.saxutils import escape
+
+from execution import post_store
+
+# Most recent posts included in every feed
+FEED_ITEM_LIMIT = int(os.environ.get("FEED_ITEM_LIMIT", "50"))
+
+FORMATS = {
+    "rss": "application/rss+xml",
+    "atom": "application/atom+xml",
+    "json": "application/feed+json",
+}
+
+# (blog_id, format) -> (token, body bytes)
+_CACHE: Dict[Tuple[str, str], Tuple[str, bytes]] = {}
+_LOCK = threading.Lock()
+
+
+def _parse_date(value: Optional[str]) -> datetime:
+    """PublishedDate is either a date or an ISO timestamp; feeds need a full aware datetime."""
+    if value:
+        try:
+            dt = datetime.fromisoformat(value.replace("Z", "+00:00"))
+            return dt if dt.tzinfo else dt.replace(tzinfo=timezone.utc)
+        except ValueError:
+            pass
+    return datetime(1970, 1, 1, tzinfo=timezone.utc)
+
+
+def _post_url(domain: str, fields: Dict[str, Any]) -> str:
+    return f"{domain}/post/{quote(fields.get('Slug', ''))}"
+
+
+def feed_token(blog: Dict[str, Any]) -> str:
+    """
+    Identifies the feed's content: the ids and field hashes of the newest published posts,
+    plus the blog settings shown in the feed. Draft edits elsewhere in the base leave it unchanged.
+    """
+    items = post_store.published_fingerprint(blog["id"], FEED_ITEM_LIMIT)
+    raw = json.dumps([blog["name"], blog["domain"], FEED_ITEM_LIMIT, items])
+    return hashlib.sha1(raw.encode("utf-8")).hexdigest()
+
+
+def iter_rss(blog: Dict[str, Any], posts: List[Dict[str, Any]]) -> Iterator[str]:
+    domain = f"https://{blog['domain']}"
+    yield '<?xml version="1.0" encoding="UTF-8" ?>\n'
+    yield '<rss version="2.0" xmlns:atom="http://www.w3.org/2005/Atom">\n'
+    yield '  <channel>\n'
+    yield f"    <title>{escape(blog['name'])}</title>\n"
+    yield f"    <link>{escape(domain)}</link>\n"
+    yield f'    <atom:link href="{escape(domain)}/rss.xml" rel="self" type="application/rss+xml" />\n'
+    yield f"    <description>Latest posts from {escape(blog['name'])}</description>\n"
+    for post in posts:
+        fields = post.get("fields", {})
+        url = escape(_post_url(domain, fields))
+        yield "    <item>\n"
+        yield f"      <title>{escape(fields.get('Title', 'Untitled'))}</title>\n"
+        yield f"      <link>{url}</link>\n"
+        yield f'      <guid isPermaLink="true">{url}</guid>\n'
+        yield f"      <description>{escape(fields.get('MetaDescription', ''))}</description>\n"
+        yield f"      <pubDate>{format_datetime(_parse_date(fields.get('PublishedDate')))}</pubDate>\n"
+        yield "    </item>\n"
+    yield "  </channel>\n"
+    yield "</rss>"
+
+
+def iter_atom(blog: Dict[str, Any], posts: List[Dict[str, Any]]) -> Iterator[str]:
+    domain = f"https://{blog['domain']}"
+    dates = [_parse_date(p.get("fields", {}).get("PublishedDate")) for p in posts]
+    updated = max(dates, default=_parse_date(None)).isoformat()
+    yield '<?xml version="1.0" encoding="UTF-8"?>\n'
+    yield '<feed xmlns="http://www.w3.org/2005/Atom">\n'
+    yield f"  <title>{escape(blog['name'])}</title>\n"
+    yield f"  <subtitle>Latest posts from {escape(blog['name'])}</subtitle>\n"
+    yield f'  <link href="{escape(domain)}/" />\n'
+    yield f'  <link href="{escape(domain)}/atom.xml" rel="self" />\n'
+    yield f"  <id>{escape(domain)}/</id>\n"
+    yield f"  <updated>{updated}</updated>\n"
+    for post, date in zip(posts, dates):
+        fields = post.get("fields", {})
+        url = escape(_post_url(domain, fields))
+        yield "  <entry>\n"
+        yield f"    <title>{escape(fields.get('Title', 'Untitled'))}</title>\n"
+        yield f'    <link href="{url}" />\n'
+        yield f"    <id>{url}</id>\n"
+        yield f"    <updated>{date.isoformat()}</updated>\n"
+        yield f"    <summary>{escape(fields.get('MetaDescription', ''))}</summary>\n"
+        if fields.get("Author_Name"):
+            yield f"    <author><name>{escape(fields['Author_Name'])}</name></author>\n"
+        yield "  </entry>\n"
+    yield "</feed>"
+
+
+def iter_json_feed(blog: Dict[str, Any], posts: List[Dict[str, Any]]) -> Iterator[str]:
+    domain = f"https://{blog['domain']}"
+    items = []
+    for post in posts:
+        fields = post.get("fields", {})
+        item = {
+            "id": _post_url(domain, fields),
+            "url": _post_url(domain, fields),
+            "title": fields.get("Title", "Untitled"),
+            "summary": fields.get("MetaDescription", ""),
+            "date_published": _parse_date(fields.get("PublishedDate")).isoformat(),
+        }
+        if fields.get("Image_URL"):
+            item["image"] = fields["Image_URL"]
+        if fields.get("Author_Name"):
+            item["authors"] = [{"name": fields["Author_Name"]}]
+        items.append(item)
+    yield json.dumps({
+        "version": "https://jsonfeed.org/version/1.1",
+        "title": blog["name"],
+        "home_page_url": f"{domain}/",
+        "feed_url": f"{domain}/feed.json",
+        "description": f"Latest posts from {blog['name']}",
+        "items": items,
+    }, ensure_ascii=False)
+
+
+_BUILDERS = {"rss": iter_rss, "atom": iter_atom, "json": iter_json_feed}
+
+
+def build_feed(blog: Dict[str, Any], fmt: str, posts: Optional[List[Dict[str, Any]]] = None) -> bytes:
+    """Renders a feed from the newest FEED_ITEM_LIMIT published posts (card projection only)."""
+    if posts is None:
+        posts = post_store.list_published_page([blog["id"]], FEED_ITEM_LIMIT)
+    return "".join(_BUILDERS[fmt](blog, posts[:FEED_ITEM_LIMIT])).encode("utf-8")
+
+
+def get_feed(blog: Dict[str, Any], fmt: str, token: Optional[str] = None) -> bytes:
+    """Cached feed body; rebuilt only when feed_token changes (a post in the feed was published, edited or pulled)."""
+    token = token or feed_token(blog)
+    key = (blog["id"], fmt)
+    with _LOCK:
+        entry = _CACHE.get(key)
+    if entry and entry[0] == token:
+        return entry[1]
+    body = build_feed(blog, fmt)
+    with _LOCK:
+        _CACHE[key] = (token, body)
+    return body
+
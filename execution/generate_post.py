@@ -227,6 +227,7 @@ def save_v2_to_airtable(blog_config, post_data: PostOutputV2, audit_in, audit_ou
         "MetaDescription": post_data.metadata.meta_description,
         "CanonicalUrl": post_data.metadata.canonical_url,
         "Entities_JSON": json.dumps(post_data.metadata.entities),
+        "Tags": ", ".join(post_data.metadata.tags),
         
         # v2 schema/dist/citations
         "Schema_JSONLD": json.dumps(post_data.schema_data.json_ld),
@@ -0,0 +1,331 @@
+import io
+import os
+import hmac
+import base64
+import socket
+import hashlib
+import secrets
+import ipaddress
+import threading
+from urllib.parse import urlencode, urljoin, urlparse
+from typing import Optional, List, Set, Tuple
+
+import httpx
+
+from execution.utils import SingleFlight
+
+try:
+    from PIL import Image, ImageOps
+except ImportError:  # optional: without Pillow templates link Image_URL directly
+    Image = None
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+CACHE_DIR = os.environ.get("IMAGE_CACHE_DIR", os.path.join(BASE_DIR, ".cache", "images"))
+# Originals and derivatives together; least recently served files are evicted above this
+CACHE_MAX_BYTES = int(os.environ.get("IMAGE_CACHE_MAX_MB", "512")) * 1024 * 1024
+# Signs proxy URLs so /img only ever fetches images our own pages link to
+PROXY_SECRET = os.environ.get("IMAGE_PROXY_SECRET")
+
+WIDTHS = (320, 640, 960, 1280, 1920)
+FORMATS = {"webp": "image/webp", "jpeg": "image/jpeg", "png": "image/png"}
+WEBP_QUALITY = 80
+JPEG_QUALITY = 82
+# Blurred placeholder inlined as a data: URI while the real image loads
+LQIP_WIDTH = 24
+MAX_SOURCE_BYTES = 20 * 1024 * 1024
+FETCH_TIMEOUT = 15.0
+MAX_REDIRECTS = 5
+CACHE_CONTROL = "public, max-age=604800, stale-while-revalidate=86400"
+
+_flight = SingleFlight()
+_client: Optional[httpx.Client] = None
+_client_lock = threading.Lock()
+_secret: Optional[bytes] = None
+# Bytes written by this process since the last full scan; a scan runs once it could exceed the cap
+_usage_lock = threading.Lock()
+_usage: Optional[int] = None
+
+
+class ImageError(Exception):
+    """The origin could not supply a usable image."""
+
+
+def _key(url: str) -> str:
+    return hashlib.sha256(url.encode("utf-8")).hexdigest()[:32]
+
+
+def _paths(url: str) -> Tuple[str, str]:
+    key = _key(url)
+    return os.path.join(CACHE_DIR, "originals", key[:2], key), os.path.join(CACHE_DIR, "derived", key[:2], key)
+
+
+def _write_atomic(path: str, data: bytes):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+    with open(tmp, "wb") as f:
+        f.write(data)
+    os.replace(tmp, path)
+    _account(len(data))
+
+
+def _touch(path: str):
+    """Marks a cache file as recently used (eviction goes by mtime)."""
+    try:
+        os.utime(path)
+    except OSError:
+        pass
+
+
+# --- Signing ---
+
+def _get_secret() -> bytes:
+    """IMAGE_PROXY_SECRET, or a random key kept in the cache dir so every worker on the host agrees."""
+    global _secret
+    if _secret is None:
+        if PROXY_SECRET:
+            _secret = PROXY_SECRET.encode("utf-8")
+        else:
+            path = os.path.join(CACHE_DIR, ".secret")
+            if not os.path.exists(path):
+                os.makedirs(CACHE_DIR, exist_ok=True)
+                try:
+                    with open(path, "x") as f:
+                        f.write(secrets.token_hex(32))
+                except FileExistsError:
+                    pass
+            with open(path) as f:
+                _secret = f.read().strip().encode("utf-8")
+    return _secret
+
+
+def sign(url: str) -> str:
+    return hmac.new(_get_secret(), url.encode("utf-8"), hashlib.sha256).hexdigest()[:32]
+
+
+def verify(url: str, signature: str) -> bool:
+    return bool(signature) and hmac.compare_digest(sign(url), signature)
+
+
+def _proxyable(url: Optional[str]) -> bool:
+    return bool(url) and Image is not None and urlparse(url).scheme in ("http", "https")
+
+
+# --- Template helpers ---
+
+def image_url(url: Optional[str], width: int, fmt: str = "webp") -> str:
+    """Proxy URL for one derivative; the original URL when it cannot be proxied."""
+    if not _proxyable(url):
+        return url or ""
+    return f"/img/{width}.{fmt}?" + urlencode({"url": url, "sig": sign(url)})
+
+
+def image_srcset(url: Optional[str], fmt: str = "webp", widths: Tuple[int, ...] = WIDTHS) -> str:
+    """`srcset` value over the standard widths (empty when the image cannot be proxied)."""
+    if not _proxyable(url):
+        return ""
+    return ", ".join(f"{image_url(url, w, fmt)} {w}w" for w in widths)
+
+
+def image_placeholder(url: Optional[str]) -> Optional[str]:
+    """
+    Tiny blurred preview as a data: URI, once the image has been fetched through the proxy.
+    Never fetches: a page rendered before the first fetch simply has no placeholder.
+    """
+    if not _proxyable(url):
+        return None
+    path = os.path.join(_paths(url)[1], "lqip.webp")
+    try:
+        with open(path, "rb") as f:
+            return "data:image/webp;base64," + base64.b64encode(f.read()).decode("ascii")
+    except OSError:
+        return None
+
+
+def has_placeholder(url: Optional[str]) -> bool:
+    """Whether image_placeholder(url) has anything to inline yet (pages include it in their ETag)."""
+    return _proxyable(url) and os.path.exists(os.path.join(_paths(url)[1], "lqip.webp"))
+
+
+# --- Fetching and resizing ---
+
+def _get_client() -> httpx.Client:
+    global _client
+    with _client_lock:
+        if _client is None:
+            # Redirects are followed by hand so every hop goes through _check_target
+            _client = httpx.Client(timeout=FETCH_TIMEOUT, follow_redirects=False,
+                                   headers={"User-Agent": "auto-blog-image-proxy"})
+        return _client
+
+
+def _check_target(url: str) -> str:
+    """
+    Refuses anything but http(s) URLs whose host resolves only to public addresses.
+    Returns the address to connect to, so the fetch cannot be re-resolved elsewhere (DNS rebinding).
+    """
+    parts = urlparse(url)
+    if parts.scheme not in ("http", "https") or not parts.hostname:
+        raise ImageError(f"{url} is not an http(s) URL")
+    try:
+        port = parts.port or (443 if parts.scheme == "https" else 80)
+        infos = socket.getaddrinfo(parts.hostname, port, type=socket.SOCK_STREAM)
+    except (OSError, ValueError, UnicodeError) as e:
+        raise ImageError(f"cannot resolve {url}: {e}") from e
+    addresses = [ipaddress.ip_address(info[4][0].split("%")[0]) for info in infos]
+    for address in addresses:
+        if not address.is_global:
+            raise ImageError(f"{url} resolves to non-public address {address}")
+    if not addresses:
+        raise ImageError(f"cannot resolve {url}")
+    return str(addresses[0])
+
+
+def _pinned_get(url: str, address: str):
+    """Streams GET `url` from the vetted `address`, keeping the original Host header and TLS name."""
+    original = httpx.URL(url)
+    extensions = {"sni_hostname": original.host} if original.scheme == "https" else {}
+    return _get_client().stream("GET", original.copy_with(host=address),
+                                headers={"Host": original.netloc.decode("ascii")}, extensions=extensions)
+
+
+def _fetch_original(url: str) -> str:
+    """Downloads the source image once; later calls reuse the copy on disk."""
+    path = _paths(url)[0]
+    if os.path.exists(path):
+        _touch(path)
+        return path
+    target = url
+    try:
+        for _ in range(MAX_REDIRECTS + 1):
+            address = _check_target(target)
+            with _pinned_get(target, address) as response:
+                if response.is_redirect:
+                    target = urljoin(target, response.headers["location"])
+                    continue
+                response.raise_for_status()
+                content_type = response.headers.get("content-type", "")
+                if not content_type.startswith("image/"):
+                    raise ImageError(f"{url} is {content_type or 'untyped'}, not an image")
+                chunks, size = [], 0
+                for chunk in response.iter_bytes():
+                    size += len(chunk)
+                    if size > MAX_SOURCE_BYTES:
+                        raise ImageError(f"{url} exceeds {MAX_SOURCE_BYTES} bytes")
+                    chunks.append(chunk)
+                break
+        else:
+            raise ImageError(f"{url} redirected more than {MAX_REDIRECTS} times")
+    except httpx.HTTPError as e:
+        raise ImageError(f"fetching {url} failed: {e}") from e
+    _write_atomic(path, b"".join(chunks))
+    return path
+
+
+def _encode(image, fmt: str) -> bytes:
+    out = io.BytesIO()
+    if fmt == "webp":
+        image.save(out, "WEBP", quality=WEBP_QUALITY, method=4)
+    elif fmt == "png":
+        image.save(out, "PNG", optimize=True)
+    else:
+        if image.mode != "RGB":
+            background = Image.new("RGB", image.size, (255, 255, 255))
+            background.paste(image, mask=image.getchannel("A") if "A" in image.getbands() else None)
+            image = background
+        image.save(out, "JPEG", quality=JPEG_QUALITY, optimize=True, progressive=True)
+    return out.getvalue()
+
+
+def _derive(url: str, width: int, fmt: str) -> str:
+    original = _fetch_original(url)
+    derived_dir = _paths(url)[1]
+    try:
+        with Image.open(original) as source:
+            source.load()
+            image = ImageOps.exif_transpose(source)
+    except Exception as e:
+        raise ImageError(f"{url} is not a readable image: {e}") from e
+    if image.mode not in ("RGB", "RGBA"):
+        image = image.convert("RGBA" if "transparency" in image.info or image.mode in ("LA", "PA") else "RGB")
+
+    # Never upscale: a request wider than the source gets the source width
+    if image.width > width:
+        image = image.resize((width, max(1, round(image.height * width / image.width))), Image.LANCZOS)
+    path = os.path.join(derived_dir, f"{width}.{fmt}")
+    data = _encode(image, fmt)
+    _write_atomic(path, data)
+
+    lqip = os.path.join(derived_dir, "lqip.webp")
+    if not os.path.exists(lqip):
+        tiny = image.resize((LQIP_WIDTH, max(1, round(image.height * LQIP_WIDTH / image.width))), Image.BILINEAR)
+        out = io.BytesIO()
+        tiny.save(out, "WEBP", quality=40)
+        _write_atomic(lqip, out.getvalue())
+    _evict_if_needed(keep={path, lqip})
+    return data
+
+
+def get_derivative(url: str, width: int, fmt: str) -> bytes:
+    """
+    The `width`/`fmt` derivative of `url`, created (and the original fetched) on first use.
+    Concurrent requests for the same derivative share one fetch and resize. Returned as bytes
+    (derivatives are small) so a concurrent eviction can never pull the file from under a response.
+    """
+    if width not in WIDTHS or fmt not in FORMATS:
+        raise ValueError("unsupported size or format")
+    path = os.path.join(_paths(url)[1], f"{width}.{fmt}")
+    try:
+        with open(path, "rb") as f:
+            data = f.read()
+        _touch(path)
+        return data
+    except FileNotFoundError:
+        return _flight.do(f"{url}\0{width}\0{fmt}", lambda: _derive(url, width, fmt))
+
+
+# --- Size cap ---
+
+def _scan() -> List[Tuple[float, int, str]]:
+    files = []
+    for root, _, names in os.walk(CACHE_DIR):
+        for name in names:
+            if name == ".secret" or name.endswith(".tmp"):
+                continue
+            path = os.path.join(root, name)
+            try:
+                st = os.stat(path)
+            except OSError:
+                continue
+            files.append((st.st_mtime, st.st_size, path))
+    return files
+
+
+def _account(size: int):
+    global _usage
+    with _usage_lock:
+        if _usage is not None:
+            _usage += size
+
+
+def _evict_if_needed(keep: Set[str] = frozenset()):
+    """Drops least recently used files (never those in `keep`) until the cache is back under 90% of the cap."""
+    global _usage
+    with _usage_lock:
+        if _usage is not None and _usage <= CACHE_MAX_BYTES:
+            return
+        files = _scan()
+        total = sum(size for _, size, _ in files)
+        if total > CACHE_MAX_BYTES:
+            files.sort()
+            target = CACHE_MAX_BYTES * 0.9
+            for _, size, path in files:
+                if total <= target:
+                    break
+                if path in keep:
+                    continue
+                try:
+                    os.remove(path)
+                    total -= size
+                except OSError:
+                    pass
+        _usage = total
@@ -0,0 +1,313 @@
+import os
+import json
+import time
+import bisect
+import sqlite3
+import threading
+from urllib.parse import urlparse, unquote
+from typing import Optional, Dict, Any, List, Tuple
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+# Each worker writes its counters here and /metrics sums every worker's, so a scrape sees the whole host
+METRICS_PATH = os.environ.get("METRICS_PATH", os.path.join(BASE_DIR, ".cache", "metrics.sqlite3"))
+FLUSH_INTERVAL = float(os.environ.get("METRICS_FLUSH_INTERVAL", "10"))
+# Workers that have not flushed for this long (exited) are folded into the retired totals
+RETENTION = 3600.0
+# Row holding the final totals of every exited worker, so host-wide counters never go down
+RETIRED = "retired"
+
+BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+# name -> (type, help); anything recorded must be declared here
+METRICS = {
+    "http_request_duration_seconds": (
+        "histogram", "Time to serve a request, by route template, method and status."),
+    "airtable_requests_total": (
+        "counter", "Airtable HTTP calls (every attempt, retries included), by base, table and status."),
+    "airtable_request_duration_seconds": (
+        "histogram", "Airtable call latency by base and table, excluding rate-limit waits."),
+    "airtable_throttled_total": (
+        "counter", "Airtable calls answered with 429, by base and table."),
+    "airtable_rate_limit_wait_seconds": (
+        "histogram", "Time calls spent queued for the shared per-base rate limit."),
+    "config_cache_requests_total": (
+        "counter", "Blog/agency config lookups: result=hit (this worker's copy) or miss."),
+    "config_cache_loads_total": (
+        "counter", "Config cache misses by where the value came from: shared (another worker's copy) or airtable."),
+}
+
+_LOCK = threading.Lock()
+# (name, labels) -> value, where labels is a sorted tuple of (key, value) pairs
+_COUNTERS: Dict[Tuple[str, tuple], float] = {}
+# (name, labels) -> [per-bucket counts (last is +Inf), sum, count]
+_HISTOGRAMS: Dict[Tuple[str, tuple], list] = {}
+
+_local = threading.local()
+_flusher: Optional[threading.Thread] = None
+_stop = threading.Event()
+# (pid, row id) of this process; pids get reused, so a new worker must never overwrite a dead one's row
+_worker: Optional[Tuple[int, str]] = None
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS snapshots (
+    worker TEXT PRIMARY KEY,
+    updated_at REAL NOT NULL,
+    snapshot TEXT NOT NULL
+);
+"""
+
+
+# --- Recording ---
+
+def inc(name: str, value: float = 1, **labels):
+    key = (name, tuple(sorted(labels.items())))
+    with _LOCK:
+        _COUNTERS[key] = _COUNTERS.get(key, 0) + value
+
+
+def observe(name: str, seconds: float, **labels):
+    key = (name, tuple(sorted(labels.items())))
+    index = bisect.bisect_left(BUCKETS, seconds)
+    with _LOCK:
+        entry = _HISTOGRAMS.get(key)
+        if entry is None:
+            entry = _HISTOGRAMS[key] = [[0] * (len(BUCKETS) + 1), 0.0, 0]
+        entry[0][index] += 1
+        entry[1] += seconds
+        entry[2] += 1
+
+
+def airtable_labels(url: str) -> Dict[str, str]:
+    """/v0/{baseId}/{table}/... -> {base, table}; other endpoints (meta, whoami) get table=''."""
+    parts = urlparse(url).path.strip("/").split("/")
+    base = parts[1] if len(parts) >= 2 else ""
+    table = unquote(parts[2]) if len(parts) >= 3 and base.startswith("app") else ""
+    return {"base": base or "airtable", "table": table}
+
+
+def record_airtable_call(base: str, table: str, status: str, seconds: float):
+    inc("airtable_requests_total", base=base, table=table, status=status)
+    observe("airtable_request_duration_seconds", seconds, base=base, table=table)
+    if status == "429":
+        inc("airtable_throttled_total", base=base, table=table)
+
+
+class MetricsMiddleware:
+    """
+    Times every request to the end of its body (streamed responses included) under its route
+    template (/post/{slug}, not the URL), so label cardinality stays bounded.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            return await self.app(scope, receive, send)
+
+        started = time.perf_counter()
+        status = "500"
+
+        async def send_wrapper(message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = str(message["status"])
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            # The router fills in scope["route"] once it has matched one
+            route = scope.get("route")
+            path = getattr(route, "path", None)
+            if path is None:
+                path = "/static" if scope.get("path", "").startswith("/static/") else "unmatched"
+            observe("http_request_duration_seconds", time.perf_counter() - started,
+                    route=path, method=scope.get("method", ""), status=status)
+
+
+# --- Sharing between workers ---
+
+def _snapshot() -> Dict[str, Any]:
+    with _LOCK:
+        return {
+            "counters": [[name, list(labels), value] for (name, labels), value in _COUNTERS.items()],
+            "histograms": [[name, list(labels), list(buckets), total, count]
+                           for (name, labels), (buckets, total, count) in _HISTOGRAMS.items()],
+        }
+
+
+def _merge(snapshots: List[Dict[str, Any]]) -> Tuple[Dict[tuple, float], Dict[tuple, list]]:
+    counters: Dict[tuple, float] = {}
+    histograms: Dict[tuple, list] = {}
+    for snapshot in snapshots:
+        for name, labels, value in snapshot["counters"]:
+            key = (name, tuple(tuple(pair) for pair in labels))
+            counters[key] = counters.get(key, 0) + value
+        for name, labels, buckets, total, count in snapshot["histograms"]:
+            key = (name, tuple(tuple(pair) for pair in labels))
+            entry = histograms.setdefault(key, [[0] * len(buckets), 0.0, 0])
+            entry[0] = [a + b for a, b in zip(entry[0], buckets)]
+            entry[1] += total
+            entry[2] += count
+    return counters, histograms
+
+
+def _worker_id() -> str:
+    global _worker
+    if _worker is None or _worker[0] != os.getpid():
+        _worker = (os.getpid(), f"{os.getpid()}-{time.time():.6f}")
+    return _worker[1]
+
+
+def _connect() -> sqlite3.Connection:
+    conn = getattr(_local, "conn", None)
+    if conn is not None and getattr(_local, "path", None) == METRICS_PATH:
+        return conn
+
+    os.makedirs(os.path.dirname(METRICS_PATH), exist_ok=True)
+    conn = sqlite3.connect(METRICS_PATH, timeout=10, isolation_level=None)
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute("PRAGMA synchronous=OFF")
+    conn.executescript(_SCHEMA)
+    _local.conn = conn
+    _local.path = METRICS_PATH
+    return conn
+
+
+def flush():
+    """Publishes this worker's totals for the other workers' /metrics."""
+    try:
+        _connect().execute(
+            "INSERT OR REPLACE INTO snapshots (worker, updated_at, snapshot) VALUES (?, ?, ?)",
+            (_worker_id(), time.time(), json.dumps(_snapshot())),
+        )
+    except sqlite3.Error as e:
+        print(f"Metrics: flush failed: {e}")
+
+
+def _retire(conn: sqlite3.Connection, where: str, params: tuple):
+    """Folds the matching workers' rows into the retired row and deletes them, in one transaction."""
+    conn.execute("BEGIN IMMEDIATE")
+    try:
+        rows = conn.execute(f"SELECT worker, snapshot FROM snapshots WHERE worker != ? AND {where}",
+                            (RETIRED, *params)).fetchall()
+        if rows:
+            retired = conn.execute("SELECT snapshot FROM snapshots WHERE worker=?", (RETIRED,)).fetchone()
+            snapshots = [json.loads(s) for _, s in rows] + ([json.loads(retired[0])] if retired else [])
+            counters, histograms = _merge(snapshots)
+            snapshot = {
+                "counters": [[name, list(labels), value] for (name, labels), value in counters.items()],
+                "histograms": [[name, list(labels), buckets, total, count]
+                               for (name, labels), (buckets, total, count) in histograms.items()],
+            }
+            conn.execute("INSERT OR REPLACE INTO snapshots (worker, updated_at, snapshot) VALUES (?, ?, ?)",
+                         (RETIRED, time.time(), json.dumps(snapshot)))
+            conn.executemany("DELETE FROM snapshots WHERE worker=?", [(worker,) for worker, _ in rows])
+        conn.execute("COMMIT")
+    except BaseException:
+        conn.execute("ROLLBACK")
+        raise
+
+
+def _run_flusher():
+    while not _stop.wait(FLUSH_INTERVAL):
+        flush()
+
+
+def start():
+    """Starts this worker's periodic flush (server startup)."""
+    global _flusher
+    if _flusher is None or not _flusher.is_alive():
+        _stop.clear()
+        _flusher = threading.Thread(target=_run_flusher, name="metrics-flush", daemon=True)
+        _flusher.start()
+
+
+def stop():
+    """Stops flushing and folds this worker's totals into the retired row (server shutdown)."""
+    _stop.set()
+    if _flusher is not None and _flusher is not threading.current_thread():
+        _flusher.join(timeout=5)
+    flush()
+    try:
+        _retire(_connect(), "worker = ?", (_worker_id(),))
+    except sqlite3.Error as e:
+        print(f"Metrics: retiring this worker failed: {e}")
+        return
+    # Anything recorded from here on starts a fresh row rather than counting these totals twice
+    with _LOCK:
+        _COUNTERS.clear()
+        _HISTOGRAMS.clear()
+
+
+def collect() -> Tuple[Dict[tuple, float], Dict[tuple, list], int]:
+    """
+    Host-wide totals: this worker's live numbers plus every other worker's last flush, plus the
+    retired totals of workers that have exited. Returns (counters, histograms, live workers).
+    Falls back to this worker alone if the file is unavailable.
+    """
+    flush()
+    rows = []
+    try:
+        conn = _connect()
+        cutoff = time.time() - RETENTION
+        # Never this worker's own row: its next flush would count those totals a second time
+        own = _worker_id()
+        if conn.execute("SELECT 1 FROM snapshots WHERE worker NOT IN (?, ?) AND updated_at < ? LIMIT 1",
+                        (RETIRED, own, cutoff)).fetchone():
+            _retire(conn, "worker != ? AND updated_at < ?", (own, cutoff))
+        rows = conn.execute("SELECT worker, snapshot FROM snapshots").fetchall()
+    except sqlite3.Error as e:
+        print(f"Metrics: reading other workers failed: {e}")
+    if not rows:
+        rows = [(_worker_id(), json.dumps(_snapshot()))]
+
+    counters, histograms = _merge([json.loads(s) for _, s in rows])
+    return counters, histograms, sum(1 for worker, _ in rows if worker != RETIRED)
+
+
+# --- Exposition ---
+
+def _escape(value: Any) -> str:
+    return str(value).replace("\\", "\\\\").replace("\"", "\\\"").replace("\n", "\\n")
+
+
+def _labels(labels: tuple, extra: Optional[Tuple[str, str]] = None) -> str:
+    pairs = list(labels) + ([extra] if extra else [])
+    if not pairs:
+        return ""
+    return "{" + ",".join(f'{k}="{_escape(v)}"' for k, v in pairs) + "}"
+
+
+def _number(value: float) -> str:
+    return str(int(value)) if float(value).is_integer() else repr(float(value))
+
+
+def render() -> str:
+    """Every metric in the Prometheus text exposition format (version 0.0.4)."""
+    counters, histograms, workers = collect()
+    lines: List[str] = [
+        "# HELP metrics_workers Live worker processes included in these totals (exited workers are kept as retired totals).",
+        "# TYPE metrics_workers gauge",
+        f"metrics_workers {workers}",
+    ]
+    for name, (kind, help_text) in METRICS.items():
+        lines.append(f"# HELP {name} {help_text}")
+        lines.append(f"# TYPE {name} {kind}")
+        if kind == "counter":
+            for (metric, labels), value in sorted(counters.items()):
+                if metric == name:
+                    lines.append(f"{name}{_labels(labels)} {_number(value)}")
+            continue
+        for (metric, labels), (buckets, total, count) in sorted(histograms.items()):
+            if metric != name:
+                continue
+            cumulative = 0
+            for bound, n in zip(BUCKETS + (float("inf"),), buckets):
+                cumulative += n
+                le = "+Inf" if bound == float("inf") else repr(bound)
+                lines.append(f"{name}_bucket{_labels(labels, ('le', le))} {cumulative}")
+            lines.append(f"{name}_sum{_labels(labels)} {_number(round(total, 6))}")
+            lines.append(f"{name}_count{_labels(labels)} {count}")
+    return "\n".join(lines) + "\n"
@@ -0,0 +1,100 @@
+import os
+import sqlite3
+import threading
+from typing import Dict, Any, List, Iterable, Callable, Tuple
+
+from execution import post_store
+
+# add(conn, blog_id, records) / remove(conn, blog_id, record_ids), called inside a write transaction
+AddFn = Callable[[sqlite3.Connection, str, List[Dict[str, Any]]], None]
+RemoveFn = Callable[[sqlite3.Connection, str, List[str]], None]
+
+
+def indexable(record: Dict[str, Any]) -> bool:
+    """Published posts with a slug: the set post_store.published_hashes covers."""
+    fields = record.get("fields", {})
+    return fields.get("Status") == "Published" and bool(fields.get("Slug"))
+
+
+class MirrorIndex:
+    """
+    A per-host SQLite index derived from the post mirror. It owns the connection, reconciling by
+    content hash and the mirror listener. The module using it supplies the schema and the add/remove
+    callbacks. The schema must have a `docs (blog_id, record_id, content_hash)` table; `add` fills
+    it from each record's `_hash`, and `remove` clears it.
+    """
+
+    def __init__(self, name: str, path: str, schema: str, add: AddFn, remove: RemoveFn):
+        self.name = name
+        self.path = path
+        self._schema = schema
+        self._add = add
+        self._remove = remove
+        self._local = threading.local()
+        # Blogs reconciled against the mirror by this process
+        self._reconciled = set()
+        self._reconcile_lock = threading.Lock()
+
+    def connect(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is not None:
+            return conn
+
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        conn = sqlite3.connect(self.path, timeout=30)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        conn.executescript(self._schema)
+        self._local.conn = conn
+        return conn
+
+    def apply(self, blog_id: str, changed: List[Dict[str, Any]], removed: List[str]):
+        """
+        Reindexes changed records (dropping any that are no longer published) and removes deleted ones.
+        Writers take the lock up front (BEGIN IMMEDIATE) so two workers never interleave a remove and re-add.
+        """
+        conn = self.connect()
+        with conn:
+            conn.execute("BEGIN IMMEDIATE")
+            self._remove(conn, blog_id, [r["id"] for r in changed] + list(removed))
+            self._add(conn, blog_id, [r for r in changed if indexable(r)])
+
+    def reconcile(self, blog_id: str) -> Tuple[List[str], List[str]]:
+        """
+        Brings one blog's entries in line with the mirror by content hash (covers an index created or
+        deleted after the mirror was filled). Returns the (reindexed, dropped) record ids.
+        """
+        conn = self.connect()
+        current = post_store.published_hashes(blog_id)
+        stored = dict(conn.execute("SELECT record_id, content_hash FROM docs WHERE blog_id=?", (blog_id,)))
+        removed = [rid for rid in stored if rid not in current]
+        changed = [rid for rid, h in current.items() if stored.get(rid) != h]
+        for start in range(0, len(changed), 500):
+            records = post_store.get_records(blog_id, changed[start:start + 500])
+            with conn:
+                conn.execute("BEGIN IMMEDIATE")
+                self._remove(conn, blog_id, [r["id"] for r in records])
+                self._add(conn, blog_id, records)
+        with conn:
+            conn.execute("BEGIN IMMEDIATE")
+            self._remove(conn, blog_id, removed)
+        return changed, removed
+
+    def ensure_indexed(self, blog_ids: Iterable[str]):
+        """Reconciles each blog once per process before its first read."""
+        for blog_id in blog_ids:
+            if blog_id in self._reconciled:
+                continue
+            with self._reconcile_lock:
+                if blog_id in self._reconciled:
+                    continue
+                try:
+                    self.reconcile(blog_id)
+                except sqlite3.Error as e:
+                    print(f"{self.name}: reconcile of {blog_id} failed: {e}")
+                    continue
+                self._reconciled.add(blog_id)
+
+    def listen(self):
+        """Keeps the index in step with the mirror: publishes, edits, unpublishes and deletes apply straight away."""
+        post_store.add_listener(self.apply)
@@ -0,0 +1,74 @@
+import os
+import json
+import base64
+from urllib.parse import urlencode
+from typing import Optional, Dict, Any, List, Tuple
+
+DEFAULT_PAGE_SIZE = int(os.environ.get("LISTING_PAGE_SIZE", "24"))
+MAX_PAGE_SIZE = 100
+
+
+def clamp_page_size(page_size: Optional[int]) -> int:
+    if not page_size:
+        return DEFAULT_PAGE_SIZE
+    return max(1, min(int(page_size), MAX_PAGE_SIZE))
+
+
+def sort_key(record: Dict[str, Any]) -> Tuple[str, str]:
+    """Listing order key: newest PublishedDate first, record id as tie-breaker."""
+    return (record["fields"].get("PublishedDate") or "", record["id"])
+
+
+def encode_cursor(key: Tuple[str, str], direction: str) -> str:
+    """Opaque cursor: the sort key of the boundary post plus the direction to page in."""
+    raw = json.dumps({"k": list(key), "d": direction}, separators=(",", ":")).encode("utf-8")
+    return base64.urlsafe_b64encode(raw).decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor: Optional[str]) -> Tuple[Optional[Tuple[str, str]], str]:
+    """Returns (key, direction); a missing or malformed cursor means the first page."""
+    if not cursor:
+        return None, "next"
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        data = json.loads(raw)
+        key = data["k"]
+        direction = data.get("d", "next")
+        if len(key) != 2 or direction not in ("next", "prev"):
+            raise ValueError("bad cursor")
+        return (str(key[0]), str(key[1])), direction
+    except Exception:
+        return None, "next"
+
+
+def build_page(rows: List[Dict[str, Any]], page_size: int, key: Optional[Tuple[str, str]], direction: str) -> Dict[str, Any]:
+    """
+    Turns a keyset fetch of up to page_size + 1 rows (already in display order, i.e. newest first)
+    into {"posts", "next_cursor", "prev_cursor"}. The extra row only signals that more pages exist.
+    """
+    has_more = len(rows) > page_size
+    if direction == "prev":
+        # Rows were fetched walking backwards; the surplus row sits at the front
+        posts = rows[-page_size:] if has_more else rows
+        has_prev, has_next = has_more, key is not None
+    else:
+        posts = rows[:page_size]
+        has_prev, has_next = key is not None, has_more
+
+    return {
+        "posts": posts,
+        "next_cursor": encode_cursor(sort_key(posts[-1]), "next") if posts and has_next else None,
+        "prev_cursor": encode_cursor(sort_key(posts[0]), "prev") if posts and has_prev else None,
+    }
+
+
+def cursor_url(cursor: Optional[str], page_size: Optional[int] = None,
+               extra: Optional[Dict[str, Any]] = None) -> Optional[str]:
+    """Relative link for a page cursor, carrying an explicit ?page_size= (and any `extra` params) through."""
+    if not cursor:
+        return None
+    params = {k: v for k, v in (extra or {}).items() if v}
+    params["cursor"] = cursor
+    if page_size:
+        params["page_size"] = page_size
+    return "?" + urlencode(params)
@@ -0,0 +1,703 @@
+import os
+import json
+import time
+import sqlite3
+import hashlib
+import threading
+from datetime import datetime, timedelta, timezone
+from typing import Optional, Dict, Any, List, Callable
+
+import requests
+
+from execution.utils import load_blogs_config, get_airtable_client, get_base_id
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+MIRROR_PATH = os.environ.get("POST_MIRROR_PATH", os.path.join(BASE_DIR, ".cache", "posts.sqlite3"))
+
+# Seconds between incremental syncs for one base
+SYNC_INTERVAL = float(os.environ.get("POST_SYNC_INTERVAL", "30"))
+# Seconds between full re-syncs (the only way to notice records deleted in Airtable)
+FULL_SYNC_INTERVAL = float(os.environ.get("POST_FULL_SYNC_INTERVAL", "900"))
+# Overlap applied to the incremental watermark to absorb clock skew with Airtable
+WATERMARK_OVERLAP = timedelta(seconds=60)
+# One worker per host syncs each base; its lease lapses this long after its last sync
+SYNC_LEASE = SYNC_INTERVAL * 2 + 60
+# How often each worker checks the change log for writes made by other workers
+CHANGE_POLL_INTERVAL = float(os.environ.get("POST_CHANGE_POLL_INTERVAL", "1"))
+CHANGE_LOG_RETENTION = 3600.0
+
+# Fields a listing card, sitemap or feed entry needs (PrimaryObjective drives the card colour/icon)
+CARD_FIELDS = ["Title", "Slug", "Image_URL", "MetaDescription", "PublishedDate", "Author_Name", "PrimaryObjective"]
+
+# Fields the public post page needs. Audit/QA blobs (GeneratorInput_JSON, GeneratorOutput_JSON,
+# QA_Report_JSON, ...) are deliberately left out so they are never pulled into the mirror.
+POST_FIELDS = CARD_FIELDS + [
+    "Status", "Content", "MetaTitle", "CanonicalUrl", "TLDR", "FAQ_JSON", "HowTo_JSON", "Tables_JSON",
+    "Glossary_JSON", "Entities_JSON", "Schema_JSONLD", "Citations_JSON", "CitationsEnabled", "Tags",
+]
+
+# Columns selected for list views: the card projection stands in for the full fields blob
+_CARD_COLUMNS = "blog_id, record_id, created_time, fields_hash, synced_at, card AS fields"
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS posts (
+    blog_id TEXT NOT NULL,
+    record_id TEXT NOT NULL,
+    slug TEXT,
+    status TEXT,
+    published_date TEXT,
+    created_time TEXT,
+    fields_hash TEXT,
+    synced_at TEXT,
+    fields TEXT,
+    card TEXT,
+    PRIMARY KEY (blog_id, record_id)
+);
+CREATE INDEX IF NOT EXISTS idx_posts_listing ON posts (blog_id, status, published_date, record_id);
+CREATE INDEX IF NOT EXISTS idx_posts_network ON posts (status, published_date, record_id);
+CREATE INDEX IF NOT EXISTS idx_posts_slug ON posts (slug);
+CREATE TABLE IF NOT EXISTS blog_versions (
+    blog_id TEXT PRIMARY KEY,
+    version INTEGER NOT NULL DEFAULT 0,
+    changed_at TEXT
+);
+CREATE TABLE IF NOT EXISTS sync_state (
+    blog_id TEXT PRIMARY KEY,
+    watermark TEXT,
+    last_full_sync REAL
+);
+CREATE TABLE IF NOT EXISTS sync_leases (
+    base_id TEXT PRIMARY KEY,
+    owner INTEGER NOT NULL,
+    expires_at REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS change_log (
+    seq INTEGER PRIMARY KEY AUTOINCREMENT,
+    blog_id TEXT NOT NULL,
+    origin INTEGER NOT NULL,
+    changed TEXT NOT NULL,
+    removed TEXT NOT NULL,
+    logged_at REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS published_sets (
+    blog_id TEXT PRIMARY KEY,
+    fingerprint TEXT NOT NULL,
+    version INTEGER NOT NULL,
+    changed_at TEXT
+);
+"""
+
+_local = threading.local()
+_schema_lock = threading.Lock()
+_schema_ready = set()
+
+# Change listeners: fn(blog_id, changed_records, removed_record_ids)
+_LISTENERS: List[Callable[[str, List[Dict[str, Any]], List[str]], None]] = []
+# Listeners over per-process state, also replayed for changes written by other workers
+_LOCAL_LISTENERS: List[Callable[[str, List[Dict[str, Any]], List[str]], None]] = []
+# blog_id -> (version, fingerprint, changed_at) of the published slug set last seen by this worker
+_PUBLISHED_SETS: Dict[str, tuple] = {}
+
+
+def _migrate(conn: sqlite3.Connection):
+    """Upgrades mirrors created before the card projection column existed."""
+    columns = {row[1] for row in conn.execute("PRAGMA table_info(posts)")}
+    if "card" not in columns:
+        with conn:
+            conn.execute("ALTER TABLE posts ADD COLUMN card TEXT")
+            # Forces every row to be rewritten (with its card) on the next sync
+            conn.execute("UPDATE posts SET fields_hash=NULL")
+            conn.execute("UPDATE sync_state SET last_full_sync=0")
+
+
+def _connect() -> sqlite3.Connection:
+    """Returns this thread's connection to the mirror, creating the schema on first use."""
+    conn = getattr(_local, "conn", None)
+    if conn is not None and getattr(_local, "path", None) == MIRROR_PATH:
+        return conn
+
+    os.makedirs(os.path.dirname(MIRROR_PATH), exist_ok=True)
+    conn = sqlite3.connect(MIRROR_PATH, timeout=30)
+    conn.row_factory = sqlite3.Row
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute("PRAGMA synchronous=NORMAL")
+    with _schema_lock:
+        if MIRROR_PATH not in _schema_ready:
+            conn.executescript(_SCHEMA)
+            _migrate(conn)
+            _schema_ready.add(MIRROR_PATH)
+    _local.conn = conn
+    _local.path = MIRROR_PATH
+    return conn
+
+
+def add_listener(fn: Callable[[str, List[Dict[str, Any]], List[str]], None], local: bool = False):
+    """
+    Registers a callback fired after records are added, changed or removed in the mirror.
+    Listeners that update shared files (indexes) run once, in the worker that wrote the change.
+    `local` listeners keep per-process state (in-memory caches) and also run in every other
+    worker, from the change log (see follow_changes).
+    """
+    if fn not in _LISTENERS:
+        _LISTENERS.append(fn)
+    if local and fn not in _LOCAL_LISTENERS:
+        _LOCAL_LISTENERS.append(fn)
+
+
+def _notify(blog_id: str, changed: List[Dict[str, Any]], removed: List[str], listeners=None):
+    if not changed and not removed:
+        return
+    for fn in list(_LISTENERS if listeners is None else listeners):
+        try:
+            fn(blog_id, changed, removed)
+        except Exception as e:
+            print(f"Post mirror listener {getattr(fn, '__name__', fn)} failed: {e}")
+
+
+def _fields_hash(fields: Dict[str, Any]) -> str:
+    return hashlib.sha1(json.dumps(fields, sort_keys=True, default=str).encode("utf-8")).hexdigest()
+
+
+def _project(fields: Dict[str, Any], names: List[str]) -> Dict[str, Any]:
+    return {name: fields[name] for name in names if name in fields}
+
+
+def _row_to_record(row: sqlite3.Row) -> Dict[str, Any]:
+    """Rebuilds the pyairtable record shape ({id, createdTime, fields}) used by the templates."""
+    return {
+        "id": row["record_id"],
+        "createdTime": row["created_time"],
+        "fields": json.loads(row["fields"] or "{}"),
+        "_blog_id": row["blog_id"],
+        "_hash": row["fields_hash"],
+        "_synced_at": row["synced_at"],
+    }
+
+
+# --- Writes ---
+
+def _bump_version(conn: sqlite3.Connection, blog_id: str, changed_at: str, changed: List[str] = (),
+                  removed: List[str] = ()):
+    """
+    Advances the blog's change counter (used for HTTP validators) and logs the change for the
+    other workers' local listeners; runs inside the write transaction.
+    """
+    conn.execute(
+        "INSERT INTO blog_versions (blog_id, version, changed_at) VALUES (?, 1, ?) "
+        "ON CONFLICT(blog_id) DO UPDATE SET version=version+1, changed_at=excluded.changed_at",
+        (blog_id, changed_at),
+    )
+    conn.execute(
+        "INSERT INTO change_log (blog_id, origin, changed, removed, logged_at) VALUES (?, ?, ?, ?, ?)",
+        (blog_id, os.getpid(), json.dumps(list(changed)), json.dumps(list(removed)), time.time()),
+    )
+
+
+def upsert_records(blog_id: str, records: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """
+    Stores Airtable records for a blog, keeping only POST_FIELDS. Returns only the records whose
+    fields actually changed, so listeners are not woken by no-op syncs.
+    """
+    if not records:
+        return []
+
+    conn = _connect()
+    now = datetime.now(timezone.utc).isoformat()
+    ids = [r["id"] for r in records]
+    existing = {}
+    for i in range(0, len(ids), 500):
+        chunk = ids[i:i + 500]
+        rows = conn.execute(
+            f"SELECT record_id, fields_hash FROM posts WHERE blog_id=? AND record_id IN ({','.join('?' * len(chunk))})",
+            [blog_id, *chunk],
+        ).fetchall()
+        existing.update({row["record_id"]: row["fields_hash"] for row in rows})
+
+    changed = []
+    rows = []
+    for r in records:
+        fields = _project(r.get("fields", {}), POST_FIELDS)
+        digest = _fields_hash(fields)
+        if existing.get(r["id"]) == digest:
+            continue
+        rows.append((
+            blog_id, r["id"], fields.get("Slug"), fields.get("Status"), fields.get("PublishedDate") or "",
+            r.get("createdTime"), digest, now, json.dumps(fields), json.dumps(_project(fields, CARD_FIELDS)),
+        ))
+        changed.append({"id": r["id"], "createdTime": r.get("createdTime"), "fields": fields,
+                        "_blog_id": blog_id, "_hash": digest, "_synced_at": now})
+
+    if rows:
+        with conn:
+            conn.executemany(
+                "INSERT OR REPLACE INTO posts (blog_id, record_id, slug, status, published_date, created_time, "
+                "fields_hash, synced_at, fields, card) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                rows,
+            )
+            _bump_version(conn, blog_id, now, changed=[r["id"] for r in changed])
+    _notify(blog_id, changed, [])
+    return changed
+
+
+def delete_records(blog_id: str, record_ids: List[str]):
+    """Removes records from the mirror (e.g. deleted in Airtable or from the admin)."""
+    if not record_ids:
+        return
+    conn = _connect()
+    with conn:
+        conn.executemany("DELETE FROM posts WHERE blog_id=? AND record_id=?", [(blog_id, rid) for rid in record_ids])
+        _bump_version(conn, blog_id, datetime.now(timezone.utc).isoformat(), removed=record_ids)
+    _notify(blog_id, [], list(record_ids))
+
+
+# --- Reads (never touch Airtable) ---
+
+def list_published(blog_ids: Optional[List[str]] = None) -> List[Dict[str, Any]]:
+    """
+    Published records (card projection only), newest first. `blog_ids=None` spans every mirrored blog.
+    """
+    conn = _connect()
+    sql = f"SELECT {_CARD_COLUMNS} FROM posts WHERE status='Published'"
+    params: List[Any] = []
+    if blog_ids is not None:
+        if not blog_ids:
+            return []
+        sql += f" AND blog_id IN ({','.join('?' * len(blog_ids))})"
+        params.extend(blog_ids)
+    sql += " ORDER BY published_date DESC, record_id DESC"
+    return [_row_to_record(row) for row in conn.execute(sql, params)]
+
+
+def list_published_page(blog_ids: Optional[List[str]], limit: int, key: Optional[tuple] = None,
+                        direction: str = "next") -> List[Dict[str, Any]]:
+    """
+    Keyset page of published records in listing order (newest first).
+    `key` is the (published_date, record_id) of the boundary post: "next" returns the `limit`
+    posts after it, "prev" the `limit` posts before it. Cost is independent of archive size.
+    Records carry the card projection only; use get_record for the full post.
+    """
+    sql = f"SELECT {_CARD_COLUMNS} FROM posts WHERE status='Published'"
+    params: List[Any] = []
+    if blog_ids is not None:
+        if not blog_ids:
+            return []
+        sql += f" AND blog_id IN ({','.join('?' * len(blog_ids))})"
+        params.extend(blog_ids)
+    if key is not None:
+        sql += " AND (published_date, record_id) " + ("<" if direction == "next" else ">") + " (?, ?)"
+        params.extend(key)
+    order = "DESC" if direction == "next" else "ASC"
+    sql += f" ORDER BY published_date {order}, record_id {order} LIMIT ?"
+    params.append(limit)
+    records = [_row_to_record(row) for row in _connect().execute(sql, params)]
+    if direction == "prev":
+        records.reverse()
+    return records
+
+
+def published_fingerprint(blog_id: str, limit: int) -> List[tuple]:
+    """(record_id, fields_hash) of the newest `limit` published posts; reads no field data."""
+    rows = _connect().execute(
+        "SELECT record_id, fields_hash FROM posts WHERE blog_id=? AND status='Published' "
+        "ORDER BY published_date DESC, record_id DESC LIMIT ?",
+        (blog_id, limit),
+    )
+    return [(row["record_id"], row["fields_hash"]) for row in rows]
+
+
+def published_hashes(blog_id: str) -> Dict[str, str]:
+    """{record_id: fields_hash} for every published post with a slug; reads no field data."""
+    rows = _connect().execute(
+        "SELECT record_id, fields_hash FROM posts WHERE blog_id=? AND status='Published' "
+        "AND slug IS NOT NULL AND slug != ''",
+        (blog_id,),
+    )
+    return {row["record_id"]: row["fields_hash"] for row in rows}
+
+
+def get_records(blog_id: str, record_ids: List[str], batch_size: int = 500) -> List[Dict[str, Any]]:
+    """Full records for the given ids (missing ids are skipped), fetched in batches."""
+    conn = _connect()
+    records = []
+    for start in range(0, len(record_ids), batch_size):
+        batch = list(record_ids[start:start + batch_size])
+        rows = conn.execute(
+            f"SELECT * FROM posts WHERE blog_id=? AND record_id IN ({','.join('?' * len(batch))})",
+            [blog_id, *batch],
+        )
+        records.extend(_row_to_record(row) for row in rows)
+    return records
+
+
+def count_published_slugs(blog_id: str) -> int:
+    row = _connect().execute(
+        "SELECT COUNT(*) AS n FROM posts WHERE blog_id=? AND status='Published' AND slug IS NOT NULL AND slug != ''",
+        (blog_id,),
+    ).fetchone()
+    return row["n"]
+
+
+def iter_published_slugs(blog_id: str, offset: int = 0, limit: Optional[int] = None, batch_size: int = 1000):
+    """
+    Yields (slug, published_date) in listing order, fetched in keyset batches.
+    Each batch is read in full before yielding, so the generator can be resumed from any
+    thread (e.g. by a streaming response) without holding a cursor open.
+    """
+    conn = _connect()
+    base = ("SELECT slug, published_date, record_id FROM posts WHERE blog_id=? AND status='Published' "
+            "AND slug IS NOT NULL AND slug != ''")
+    order = " ORDER BY published_date DESC, record_id DESC LIMIT ?"
+    remaining = limit
+    key = None
+    if offset:
+        row = conn.execute(base + order + " OFFSET ?", (blog_id, 1, offset - 1)).fetchone()
+        if row is None:
+            return
+        key = (row["published_date"], row["record_id"])
+    while remaining is None or remaining > 0:
+        n = batch_size if remaining is None else min(batch_size, remaining)
+        if key is None:
+            rows = _connect().execute(base + order, (blog_id, n)).fetchall()
+        else:
+            rows = _connect().execute(base + " AND (published_date, record_id) < (?, ?)" + order,
+                                      (blog_id, *key, n)).fetchall()
+        if not rows:
+            return
+        for row in rows:
+            yield row["slug"], row["published_date"]
+        key = (rows[-1]["published_date"], rows[-1]["record_id"])
+        if remaining is not None:
+            remaining -= len(rows)
+        if len(rows) < n:
+            return
+
+
+def published_set_version(blog_id: str) -> tuple:
+    """
+    (fingerprint, changed_at) of the blog's published (slug, published_date) set: the validators for
+    documents built from that set alone (sitemaps). Unlike get_versions, edits to drafts or to
+    other fields leave it alone. Recomputed only when the blog's change counter moves; changed_at
+    is shared by all workers and only advances when the fingerprint itself changes.
+    """
+    version, changed_at = get_versions([blog_id]).get(blog_id, (0, None))
+    cached = _PUBLISHED_SETS.get(blog_id)
+    if cached and cached[0] == version:
+        return cached[1], cached[2]
+
+    digest = hashlib.sha256()
+    for slug, date in iter_published_slugs(blog_id):
+        digest.update(f"{slug}\t{date}\n".encode("utf-8"))
+    fingerprint = digest.hexdigest()[:32]
+    conn = _connect()
+    with conn:
+        # A worker that read an older version never overwrites a newer fingerprint
+        conn.execute(
+            "INSERT INTO published_sets (blog_id, fingerprint, version, changed_at) VALUES (?, ?, ?, ?) "
+            "ON CONFLICT(blog_id) DO UPDATE SET fingerprint=excluded.fingerprint, version=excluded.version, "
+            "changed_at=CASE WHEN fingerprint=excluded.fingerprint THEN changed_at ELSE excluded.changed_at END "
+            "WHERE excluded.version > version",
+            (blog_id, fingerprint, version, changed_at),
+        )
+        row = conn.execute("SELECT fingerprint, changed_at FROM published_sets WHERE blog_id=?", (blog_id,)).fetchone()
+    _PUBLISHED_SETS[blog_id] = (version, row["fingerprint"], row["changed_at"])
+    return row["fingerprint"], row["changed_at"]
+
+
+def get_record(blog_id: str, record_id: str) -> Optional[Dict[str, Any]]:
+    row = _connect().execute("SELECT * FROM posts WHERE blog_id=? AND record_id=?", (blog_id, record_id)).fetchone()
+    return _row_to_record(row) if row else None
+
+
+def list_published_slugs() -> List[tuple]:
+    """(blog_id, record_id, slug) for every published post, without loading any fields."""
+    rows = _connect().execute(
+        "SELECT blog_id, record_id, slug FROM posts WHERE status='Published' AND slug IS NOT NULL AND slug != '' "
+        "ORDER BY rowid"
+    )
+    return [(row["blog_id"], row["record_id"], row["slug"]) for row in rows]
+
+
+def find_by_slug(slug: str, blog_ids: Optional[List[str]] = None, status: Optional[str] = None) -> Optional[Dict[str, Any]]:
+    """First record with this slug, optionally restricted to a status."""
+    sql = "SELECT * FROM posts WHERE slug=?"
+    params: List[Any] = [slug]
+    if status:
+        sql += " AND status=?"
+        params.append(status)
+    if blog_ids is not None:
+        if not blog_ids:
+            return None
+        sql += f" AND blog_id IN ({','.join('?' * len(blog_ids))})"
+        params.extend(blog_ids)
+    row = _connect().execute(sql + " LIMIT 1", params).fetchone()
+    return _row_to_record(row) if row else None
+
+
+def get_versions(blog_ids: List[str]) -> Dict[str, tuple]:
+    """{blog_id: (version, changed_at)} for the given blogs; shared by all workers via the mirror file."""
+    if not blog_ids:
+        return {}
+    rows = _connect().execute(
+        f"SELECT blog_id, version, changed_at FROM blog_versions WHERE blog_id IN ({','.join('?' * len(blog_ids))})",
+        list(blog_ids),
+    )
+    return {row["blog_id"]: (row["version"], row["changed_at"]) for row in rows}
+
+
+def is_synced(blog_id: str) -> bool:
+    """True once the blog has completed at least one sync into the mirror."""
+    row = _connect().execute("SELECT watermark FROM sync_state WHERE blog_id=?", (blog_id,)).fetchone()
+    return bool(row and row["watermark"])
+
+
+# --- Sync ---
+
+def _get_state(blog_id: str):
+    row = _connect().execute("SELECT watermark, last_full_sync FROM sync_state WHERE blog_id=?", (blog_id,)).fetchone()
+    if not row:
+        return None, 0.0
+    return row["watermark"], row["last_full_sync"] or 0.0
+
+
+def _set_state(blog_id: str, watermark: str, last_full_sync: float):
+    conn = _connect()
+    with conn:
+        conn.execute(
+            "INSERT OR REPLACE INTO sync_state (blog_id, watermark, last_full_sync) VALUES (?, ?, ?)",
+            (blog_id, watermark, last_full_sync),
+        )
+
+
+def _fetch_posts(table, **options) -> List[Dict[str, Any]]:
+    """
+    Fetches posts with the POST_FIELDS projection. Bases that lack one of the projected columns
+    reject the request (422), so fall back to a full fetch and project locally instead.
+    """
+    try:
+        return table.all(fields=POST_FIELDS, **options)
+    except requests.HTTPError as e:
+        if e.response is None or e.response.status_code != 422:
+            raise
+        print(f"Post mirror: projected fetch rejected ({e}); fetching full records")
+        # upsert_records applies the projection before anything is stored
+        return table.all(**options)
+
+
+def sync_blog(blog: Dict[str, Any], full: bool = False, api=None) -> int:
+    """
+    Pulls a blog's Posts table into the mirror.
+    Incremental runs only fetch records modified since the last watermark; a full run
+    (forced, first run, or every FULL_SYNC_INTERVAL) also drops records deleted upstream.
+    Returns the number of changed records.
+    """
+    blog_id = blog["id"]
+    api = api or get_airtable_client()
+    table = api.table(get_base_id(blog), blog["airtable"]["table_name"])
+
+    watermark, last_full = _get_state(blog_id)
+    started = datetime.now(timezone.utc)
+    do_full = full or not watermark or (time.time() - last_full >= FULL_SYNC_INTERVAL)
+
+    if do_full:
+        records = _fetch_posts(table)
+        seen = {r["id"] for r in records}
+        known = {row["record_id"] for row in _connect().execute("SELECT record_id FROM posts WHERE blog_id=?", (blog_id,))}
+        delete_records(blog_id, sorted(known - seen))
+        last_full = time.time()
+    else:
+        since = (datetime.fromisoformat(watermark) - WATERMARK_OVERLAP).strftime("%Y-%m-%dT%H:%M:%S.000Z")
+        records = _fetch_posts(table, formula=f"IS_AFTER(LAST_MODIFIED_TIME(), '{since}')")
+
+    changed = upsert_records(blog_id, records)
+    _set_state(blog_id, started.isoformat(), last_full)
+    return len(changed)
+
+
+_WARM_LOCKS: Dict[str, threading.Lock] = {}
+_WARM_LOCKS_GUARD = threading.Lock()
+
+
+def ensure_synced(blog: Dict[str, Any]):
+    """
+    Blocks until the blog has been synced at least once. Used for blogs the background
+    syncer has not reached yet (cold start); concurrent callers share one sync.
+    """
+    if is_synced(blog["id"]):
+        return
+    with _WARM_LOCKS_GUARD:
+        lock = _WARM_LOCKS.setdefault(blog["id"], threading.Lock())
+    with lock:
+        if not is_synced(blog["id"]):
+            sync_blog(blog, full=True)
+
+
+def _blogs_by_base() -> Dict[str, List[Dict[str, Any]]]:
+    groups: Dict[str, List[Dict[str, Any]]] = {}
+    for blog in load_blogs_config():
+        try:
+            groups.setdefault(get_base_id(blog), []).append(blog)
+        except Exception as e:
+            print(f"Post mirror: cannot resolve base for blog {blog.get('name')}: {e}")
+    return groups
+
+
+def _claim_lease(base_id: str) -> bool:
+    """
+    Takes or renews this worker's lease on syncing a base. Every worker runs a syncer per base,
+    but only the lease holder polls Airtable, so polling does not grow with the worker count.
+    """
+    now = time.time()
+    conn = _connect()
+    try:
+        with conn:
+            conn.execute("BEGIN IMMEDIATE")
+            row = conn.execute("SELECT owner, expires_at FROM sync_leases WHERE base_id=?", (base_id,)).fetchone()
+            if row and row["owner"] != os.getpid() and row["expires_at"] > now:
+                return False
+            conn.execute("INSERT OR REPLACE INTO sync_leases (base_id, owner, expires_at) VALUES (?, ?, ?)",
+                         (base_id, os.getpid(), now + SYNC_LEASE))
+        return True
+    except sqlite3.Error as e:
+        print(f"Post mirror: lease check for {base_id} failed ({e}); syncing anyway")
+        return True
+
+
+def _release_leases():
+    try:
+        conn = _connect()
+        with conn:
+            conn.execute("DELETE FROM sync_leases WHERE owner=?", (os.getpid(),))
+    except sqlite3.Error as e:
+        print(f"Post mirror: releasing sync leases failed: {e}")
+
+
+class _BaseSyncer(threading.Thread):
+    """Background loop keeping every blog that lives in one Airtable base in sync (while it holds the lease)."""
+
+    def __init__(self, base_id: str):
+        super().__init__(name=f"post-sync-{base_id}", daemon=True)
+        self.base_id = base_id
+        self.stop_event = threading.Event()
+
+    def run(self):
+        while not self.stop_event.is_set():
+            blogs = _blogs_by_base().get(self.base_id, [])
+            if not blogs:
+                # Base no longer referenced by any blog
+                break
+            if not _claim_lease(self.base_id):
+                self.stop_event.wait(SYNC_INTERVAL)
+                continue
+            for blog in blogs:
+                try:
+                    n = sync_blog(blog)
+                    if n:
+                        print(f"Post mirror: synced {n} changed records for {blog['name']}")
+                except Exception as e:
+                    print(f"Post mirror: sync failed for {blog.get('name')}: {e}")
+            self.stop_event.wait(SYNC_INTERVAL)
+
+
+_SYNCERS: Dict[str, _BaseSyncer] = {}
+_SYNCERS_LOCK = threading.Lock()
+_SUPERVISOR: Optional[threading.Thread] = None
+_SUPERVISOR_STOP = threading.Event()
+
+
+def ensure_syncers():
+    """Starts one syncer thread per base referenced by the blog config (idempotent)."""
+    with _SYNCERS_LOCK:
+        for base_id in _blogs_by_base():
+            syncer = _SYNCERS.get(base_id)
+            if syncer is None or not syncer.is_alive():
+                syncer = _BaseSyncer(base_id)
+                _SYNCERS[base_id] = syncer
+                syncer.start()
+
+
+def start_syncers():
+    """Starts the syncers plus a supervisor that picks up bases added to the config later."""
+    global _SUPERVISOR
+    if _SUPERVISOR is not None and _SUPERVISOR.is_alive():
+        return
+    _SUPERVISOR_STOP.clear()
+
+    def supervise():
+        while not _SUPERVISOR_STOP.is_set():
+            try:
+                ensure_syncers()
+            except Exception as e:
+                print(f"Post mirror: supervisor error: {e}")
+            _SUPERVISOR_STOP.wait(SYNC_INTERVAL)
+
+    _SUPERVISOR = threading.Thread(target=supervise, name="post-sync-supervisor", daemon=True)
+    _SUPERVISOR.start()
+
+
+def stop_syncers():
+    _SUPERVISOR_STOP.set()
+    with _SYNCERS_LOCK:
+        for syncer in _SYNCERS.values():
+            syncer.stop_event.set()
+        _SYNCERS.clear()
+    # Lets another worker take over straight away rather than when the lease lapses
+    _release_leases()
+
+
+# --- Changes made by other workers ---
+
+_FOLLOWER: Optional[threading.Thread] = None
+_FOLLOWER_STOP = threading.Event()
+
+
+def _replay_changes(after: int) -> int:
+    """
+    Runs the local listeners for every change another worker logged after `after`; returns the
+    last sequence number seen. Changed records are read back from the mirror in their current state.
+    """
+    conn = _connect()
+    rows = conn.execute("SELECT seq, blog_id, origin, changed, removed FROM change_log WHERE seq > ? ORDER BY seq",
+                        (after,)).fetchall()
+    for row in rows:
+        after = row["seq"]
+        if row["origin"] == os.getpid():
+            continue
+        changed_ids, removed = json.loads(row["changed"]), json.loads(row["removed"])
+        changed = get_records(row["blog_id"], changed_ids)
+        # A record changed and then deleted since is a removal by now
+        removed += sorted(set(changed_ids) - {r["id"] for r in changed})
+        _notify(row["blog_id"], changed, removed, _LOCAL_LISTENERS)
+    return after
+
+
+def follow_changes():
+    """
+    Starts polling the change log so this worker's local listeners (slug index, listing cache)
+    see changes written by other workers: their syncs, webhooks and admin edits.
+    """
+    global _FOLLOWER
+    if _FOLLOWER is not None and _FOLLOWER.is_alive():
+        return
+    _FOLLOWER_STOP.clear()
+    last = _connect().execute("SELECT COALESCE(MAX(seq), 0) FROM change_log").fetchone()[0]
+
+    def follow():
+        nonlocal last
+        pruned_at = 0.0
+        while not _FOLLOWER_STOP.wait(CHANGE_POLL_INTERVAL):
+            try:
+                last = _replay_changes(last)
+                if time.time() - pruned_at > 60:
+                    conn = _connect()
+                    with conn:
+                        conn.execute("DELETE FROM change_log WHERE logged_at < ?", (time.time() - CHANGE_LOG_RETENTION,))
+                    pruned_at = time.time()
+            except sqlite3.Error as e:
+                print(f"Post mirror: reading the change log failed: {e}")
+
+    _FOLLOWER = threading.Thread(target=follow, name="post-change-follower", daemon=True)
+    _FOLLOWER.start()
+
+
+def stop_following():
+    _FOLLOWER_STOP.set()
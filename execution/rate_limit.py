@@ -0,0 +1,176 @@
+import os
+import time
+import random
+import sqlite3
+import asyncio
+import threading
+from typing import Optional, Dict
+from urllib.parse import urlparse
+
+import requests
+
+from execution import metrics
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+# Shared by every worker process on the host, so the budget is per base rather than per worker
+STATE_PATH = os.environ.get("AIRTABLE_RATE_LIMIT_PATH", os.path.join(BASE_DIR, ".cache", "ratelimit.sqlite3"))
+
+# Airtable allows 5 requests/second per base. A burst above 1 lets a second's worth of
+# requests land on top of the steady rate, which Airtable answers with a 30s lockout.
+RATE = float(os.environ.get("AIRTABLE_RATE_LIMIT", "5"))
+BURST = float(os.environ.get("AIRTABLE_RATE_BURST", "1"))
+# Retries after a 429 before the error is handed to the caller
+MAX_RETRIES = int(os.environ.get("AIRTABLE_MAX_RETRIES", "4"))
+BACKOFF_BASE = 1.0
+BACKOFF_MAX = 30.0
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS buckets (
+    bucket TEXT PRIMARY KEY,
+    tokens REAL NOT NULL,
+    updated_at REAL NOT NULL
+);
+"""
+
+_local = threading.local()
+# In-process buckets, used only if the shared state file cannot be opened
+_FALLBACK: Dict[str, tuple] = {}
+_FALLBACK_LOCK = threading.Lock()
+
+
+def _connect() -> sqlite3.Connection:
+    conn = getattr(_local, "conn", None)
+    if conn is not None and getattr(_local, "path", None) == STATE_PATH:
+        return conn
+
+    os.makedirs(os.path.dirname(STATE_PATH), exist_ok=True)
+    # Autocommit mode so we can take the write lock up front with BEGIN IMMEDIATE
+    conn = sqlite3.connect(STATE_PATH, timeout=10, isolation_level=None)
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute("PRAGMA synchronous=OFF")
+    conn.executescript(_SCHEMA)
+    _local.conn = conn
+    _local.path = STATE_PATH
+    return conn
+
+
+def _refill(tokens: float, updated_at: float, now: float) -> float:
+    return min(BURST, tokens + (now - updated_at) * RATE)
+
+
+def _update(bucket: str, spend) -> float:
+    """
+    Refills the bucket, applies `spend(tokens) -> tokens` atomically across processes and returns
+    the wait implied by the new balance (a negative balance is the queue of reservations ahead).
+    """
+    now = time.time()
+    try:
+        conn = _connect()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            row = conn.execute("SELECT tokens, updated_at FROM buckets WHERE bucket=?", (bucket,)).fetchone()
+            tokens = spend(_refill(*(row or (BURST, now)), now))
+            conn.execute(
+                "INSERT OR REPLACE INTO buckets (bucket, tokens, updated_at) VALUES (?, ?, ?)",
+                (bucket, tokens, now),
+            )
+            conn.execute("COMMIT")
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+    except sqlite3.Error as e:
+        print(f"Rate limiter: shared state unavailable ({e}), limiting this process only")
+        with _FALLBACK_LOCK:
+            tokens = spend(_refill(*_FALLBACK.get(bucket, (BURST, now)), now))
+            _FALLBACK[bucket] = (tokens, now)
+    return max(0.0, -tokens / RATE)
+
+
+def _reserve(bucket: str) -> float:
+    """
+    Reserves the next slot in the bucket and returns how long to wait before using it.
+    Reservations are FIFO: each caller's wait already accounts for everyone queued before it.
+    """
+    return _update(bucket, lambda tokens: tokens - 1)
+
+
+def penalize(bucket: str, seconds: float):
+    """
+    After a 429, holds the bucket empty for at least `seconds` so every worker backs off,
+    not just the one that was refused. Concurrent 429s do not stack.
+    """
+    _update(bucket, lambda tokens: min(tokens, -seconds * RATE))
+
+
+def bucket_for_url(url: str) -> str:
+    """Airtable limits per base: /v0/{baseId}/... -> baseId. Other endpoints share one bucket."""
+    parts = urlparse(url).path.strip("/").split("/")
+    if len(parts) >= 2 and parts[1].startswith("app"):
+        return parts[1]
+    return "airtable"
+
+
+def backoff_delay(attempt: int, retry_after: Optional[str] = None) -> float:
+    """Jittered exponential backoff, never shorter than the server's Retry-After."""
+    delay = min(BACKOFF_MAX, BACKOFF_BASE * (2 ** attempt)) * random.uniform(0.5, 1.0)
+    try:
+        delay = max(delay, float(retry_after))
+    except (TypeError, ValueError):
+        pass
+    return delay
+
+
+def acquire(bucket: str) -> float:
+    """Blocks until the bucket allows one request; returns the seconds spent waiting."""
+    wait = _reserve(bucket)
+    if wait > 0:
+        time.sleep(wait)
+    metrics.observe("airtable_rate_limit_wait_seconds", wait, base=bucket)
+    return wait
+
+
+async def acquire_async(bucket: str) -> float:
+    """acquire() for async callers: the reservation runs off the loop, the wait is an asyncio.sleep."""
+    wait = await asyncio.to_thread(_reserve, bucket)
+    if wait > 0:
+        await asyncio.sleep(wait)
+    metrics.observe("airtable_rate_limit_wait_seconds", wait, base=bucket)
+    return wait
+
+
+def throttled(bucket: str, attempt: int, retry_after: Optional[str] = None) -> Optional[float]:
+    """
+    Handles a 429: pushes the shared bucket back by a jittered backoff (the caller's next
+    acquire waits it out) and returns that delay, or None once MAX_RETRIES is used up.
+    """
+    if attempt >= MAX_RETRIES:
+        return None
+    delay = backoff_delay(attempt, retry_after)
+    penalize(bucket, delay)
+    return delay
+
+
+class RateLimitedSession(requests.Session):
+    """requests Session for pyairtable: every request waits for its base's bucket and 429s are retried."""
+
+    def request(self, method, url, *args, **kwargs):
+        bucket = bucket_for_url(url)
+        labels = metrics.airtable_labels(url)
+        attempt = 0
+        while True:
+            acquire(bucket)
+            started = time.perf_counter()
+            try:
+                response = super().request(method, url, *args, **kwargs)
+            except requests.RequestException:
+                metrics.record_airtable_call(labels["base"], labels["table"], "error", time.perf_counter() - started)
+                raise
+            metrics.record_airtable_call(labels["base"], labels["table"], str(response.status_code),
+                                         time.perf_counter() - started)
+            if response.status_code != 429:
+                return response
+            delay = throttled(bucket, attempt, response.headers.get("Retry-After"))
+            if delay is None:
+                return response
+            print(f"Airtable 429 on {bucket}; retrying in {delay:.1f}s")
+            attempt += 1
@@ -0,0 +1,333 @@
+import os
+import re
+import json
+import math
+import time
+import sqlite3
+import argparse
+import threading
+from collections import Counter
+from typing import Optional, Dict, Any, List, Iterable
+
+import numpy as np
+
+from execution import post_store
+from execution.facets import post_facets
+from execution.mirror_index import MirrorIndex
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+INDEX_PATH = os.environ.get("RELATED_INDEX_PATH", os.path.join(BASE_DIR, ".cache", "related.sqlite3"))
+
+# Related posts stored per post
+RELATED_LIMIT = int(os.environ.get("RELATED_LIMIT", "4"))
+# Vocabulary cap (most widespread terms first); bounds the matrix at posts x MAX_FEATURES float32
+MAX_FEATURES = int(os.environ.get("RELATED_MAX_FEATURES", "2048"))
+# Seconds the background worker waits after a mirror change, so a sync burst is indexed once
+DEBOUNCE = float(os.environ.get("RELATED_DEBOUNCE", "5"))
+# Above this share of changed posts every row is recomputed instead of patched
+FULL_REBUILD_FRACTION = 0.2
+# Blend of text similarity (TF-IDF cosine) and tag/entity overlap (Jaccard)
+TEXT_WEIGHT = 0.7
+FACET_WEIGHT = 0.3
+MIN_SCORE = 0.05
+TITLE_WEIGHT = 3
+BLOCK_SIZE = 256
+
+_TOKEN = re.compile(r"[a-z0-9][a-z0-9+#'-]*[a-z0-9+#]|[a-z0-9]")
+_STOPWORDS = frozenset("""
+a about above after again against all also am an and any are as at be because been before being below
+between both but by can could did do does doing down during each few for from further had has have having
+he her here hers herself him himself his how i if in into is it its itself just let me more most my myself
+no nor not now of off on once only or other our ours ourselves out over own same she should so some such
+than that the their theirs them themselves then there these they this those through to too under until up
+very was we were what when where which while who whom why will with would you your yours yourself
+yourselves get got one two also use used using may might must new like make makes made way ways
+""".split())
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS docs (
+    blog_id TEXT NOT NULL,
+    record_id TEXT NOT NULL,
+    content_hash TEXT,
+    terms TEXT,
+    facets TEXT,
+    card TEXT,
+    PRIMARY KEY (blog_id, record_id)
+);
+CREATE TABLE IF NOT EXISTS related (
+    blog_id TEXT NOT NULL,
+    record_id TEXT NOT NULL,
+    posts TEXT,
+    PRIMARY KEY (blog_id, record_id)
+);
+"""
+
+# One index update per blog at a time within a process
+_UPDATE_LOCK = threading.Lock()
+# Blogs this process has queued for a catch-up with the mirror on their first read
+_CHECKED = set()
+
+
+# --- Features ---
+
+def tokenize(text: str) -> List[str]:
+    """Lowercased word tokens without stopwords or bare numbers."""
+    return [t for t in _TOKEN.findall((text or "").lower()) if t not in _STOPWORDS and not t.isdigit()]
+
+
+def _doc_terms(fields: Dict[str, Any]) -> Dict[str, int]:
+    """Term counts over title (weighted up), description and body."""
+    counts = Counter(tokenize(fields.get("Content", "")))
+    counts.update(tokenize(fields.get("MetaDescription", "")))
+    for term in tokenize(fields.get("Title", "")):
+        counts[term] += TITLE_WEIGHT
+    return dict(counts)
+
+
+def _doc_facets(fields: Dict[str, Any]) -> List[str]:
+    return sorted(f"{kind}:{key}" for kind, key, _ in post_facets(fields))
+
+
+def _card(record: Dict[str, Any]) -> Dict[str, Any]:
+    fields = record["fields"]
+    return {
+        "id": record["id"],
+        "title": fields.get("Title", "Untitled"),
+        "slug": fields.get("Slug", ""),
+        "image": fields.get("Image_URL", ""),
+        "description": fields.get("MetaDescription", ""),
+        "published_date": fields.get("PublishedDate", ""),
+    }
+
+
+def _tfidf(docs: List[Dict[str, int]]) -> np.ndarray:
+    """Dense, L2-normalised TF-IDF matrix (sublinear tf, smoothed idf) over the capped vocabulary."""
+    n = len(docs)
+    df = Counter()
+    for terms in docs:
+        df.update(terms.keys())
+    # Terms in a single post cannot link two posts; terms in every post carry no signal
+    min_df = 2 if n > 2 else 1
+    candidates = [(count, term) for term, count in df.items() if count >= min_df and (count < n or n <= 2)]
+    candidates.sort(key=lambda c: (-c[0], c[1]))
+    vocab = {term: j for j, (_, term) in enumerate(candidates[:MAX_FEATURES])}
+
+    rows, cols, counts = [], [], []
+    for i, terms in enumerate(docs):
+        hits = [(vocab[term], count) for term, count in terms.items() if term in vocab]
+        rows.extend([i] * len(hits))
+        cols.extend(j for j, _ in hits)
+        counts.extend(c for _, c in hits)
+    X = np.zeros((n, max(len(vocab), 1)), dtype=np.float32)
+    X[rows, cols] = 1.0 + np.log(np.array(counts, dtype=np.float32))
+    if vocab:
+        idf = np.array([math.log((1 + n) / (1 + df[t])) + 1.0 for t in vocab], dtype=np.float32)
+        X *= idf
+    norms = np.linalg.norm(X, axis=1, keepdims=True)
+    np.divide(X, norms, out=X, where=norms > 0)
+    return X
+
+
+def _facet_matrix(facets: List[List[str]]) -> np.ndarray:
+    names = {}
+    for doc in facets:
+        for f in doc:
+            names.setdefault(f, len(names))
+    F = np.zeros((len(facets), max(len(names), 1)), dtype=np.float32)
+    for i, doc in enumerate(facets):
+        for f in doc:
+            F[i, names[f]] = 1.0
+    return F
+
+
+def _scores(X: np.ndarray, F: np.ndarray, sizes: np.ndarray, rows: np.ndarray) -> np.ndarray:
+    """Blended similarity of `rows` against every post: len(rows) x N."""
+    text = X[rows] @ X.T
+    inter = F[rows] @ F.T
+    union = sizes[rows][:, None] + sizes[None, :] - inter
+    overlap = np.divide(inter, union, out=np.zeros_like(inter), where=union > 0)
+    scores = TEXT_WEIGHT * text + FACET_WEIGHT * overlap
+    scores[np.arange(len(rows)), rows] = -np.inf
+    return scores
+
+
+# --- Index maintenance ---
+
+def _remove(conn: sqlite3.Connection, blog_id: str, record_ids: Iterable[str]):
+    # Stored lists stay until update_blog rewrites them, so pages never lose them mid-update
+    conn.executemany("DELETE FROM docs WHERE blog_id=? AND record_id=?", [(blog_id, rid) for rid in record_ids])
+
+
+def _add(conn: sqlite3.Connection, blog_id: str, records: Iterable[Dict[str, Any]]):
+    """Extracts each post's features once, so lists can be recomputed without re-reading the mirror."""
+    conn.executemany(
+        "INSERT INTO docs (blog_id, record_id, content_hash, terms, facets, card) VALUES (?, ?, ?, ?, ?, ?)",
+        [(blog_id, record["id"], record["_hash"], json.dumps(_doc_terms(record["fields"])),
+          json.dumps(_doc_facets(record["fields"])), json.dumps(_card(record))) for record in records],
+    )
+
+
+_INDEX = MirrorIndex("Related index", INDEX_PATH, _SCHEMA, _add, _remove)
+_connect = _INDEX.connect
+
+
+def update_blog(blog_id: str, full: bool = False) -> int:
+    """
+    Brings the blog's related-posts lists in line with the mirror. Only posts whose content hash
+    changed are re-tokenized. Lists are recomputed for the changed posts, for posts that listed a
+    changed or removed post, and for posts a changed post now outscores; everything else keeps its
+    stored list. Returns the number of lists written.
+    """
+    with _UPDATE_LOCK:
+        conn = _connect()
+        changed, removed = _INDEX.reconcile(blog_id)
+        if removed:
+            with conn:
+                conn.executemany("DELETE FROM related WHERE blog_id=? AND record_id=?",
+                                 [(blog_id, rid) for rid in removed])
+        if not changed and not removed and not full:
+            return 0
+
+        ids, terms, facets, cards = [], [], [], {}
+        for rid, t, f, c in conn.execute(
+            "SELECT record_id, terms, facets, card FROM docs WHERE blog_id=? ORDER BY record_id", (blog_id,)
+        ):
+            ids.append(rid)
+            terms.append(json.loads(t))
+            facets.append(json.loads(f))
+            cards[rid] = json.loads(c)
+        if not ids:
+            return 0
+
+        index = {rid: i for i, rid in enumerate(ids)}
+        X = _tfidf(terms)
+        F = _facet_matrix(facets)
+        sizes = F.sum(axis=1)
+        stored = {rid: json.loads(posts) for rid, posts in
+                  conn.execute("SELECT record_id, posts FROM related WHERE blog_id=?", (blog_id,))}
+
+        # IDF shifts a little with every change; a large batch is simplest to recompute outright
+        if full or not stored or len(changed) + len(removed) > FULL_REBUILD_FRACTION * len(ids):
+            targets = np.arange(len(ids))
+        else:
+            touched = set(changed) | set(removed)
+            target_ids = set(changed)
+            best = np.full(len(ids), -np.inf, dtype=np.float32)
+            changed_rows = np.array([index[rid] for rid in changed], dtype=np.int64)
+            for start in range(0, len(changed_rows), BLOCK_SIZE):
+                best = np.maximum(best, _scores(X, F, sizes, changed_rows[start:start + BLOCK_SIZE]).max(axis=0))
+            for rid in ids:
+                posts = stored.get(rid)
+                if (posts is None or any(p["id"] in touched for p in posts)
+                        or best[index[rid]] > (posts[-1]["score"] if len(posts) >= RELATED_LIMIT else MIN_SCORE)):
+                    target_ids.add(rid)
+            targets = np.array(sorted(index[rid] for rid in target_ids), dtype=np.int64)
+
+        k = min(RELATED_LIMIT, len(ids) - 1)
+        rows = []
+        for start in range(0, len(targets), BLOCK_SIZE):
+            block = targets[start:start + BLOCK_SIZE]
+            if k <= 0:
+                rows.extend((blog_id, ids[i], "[]") for i in block)
+                continue
+            scores = _scores(X, F, sizes, block)
+            top = np.argpartition(-scores, k - 1, axis=1)[:, :k]
+            for row, i in enumerate(block):
+                ranked = sorted(top[row], key=lambda j: (-scores[row, j], ids[j]))
+                posts = [dict(cards[ids[j]], score=round(float(scores[row, j]), 4))
+                         for j in ranked if scores[row, j] >= MIN_SCORE]
+                rows.append((blog_id, ids[i], json.dumps(posts)))
+        with conn:
+            conn.executemany("INSERT OR REPLACE INTO related (blog_id, record_id, posts) VALUES (?, ?, ?)", rows)
+        return len(rows)
+
+
+def related_for(blog_id: str, record_id: str) -> List[Dict[str, Any]]:
+    """
+    Stored related posts for one post (a primary-key read): [{id, title, slug, image, description, published_date, score}].
+    The first read of a blog in a process queues a background update, so an index that is new or was
+    deleted fills from the existing mirror without waiting for a post to change.
+    """
+    if blog_id not in _CHECKED:
+        _CHECKED.add(blog_id)
+        _WORKER.schedule(blog_id)
+    try:
+        row = _connect().execute(
+            "SELECT posts FROM related WHERE blog_id=? AND record_id=?", (blog_id, record_id)
+        ).fetchone()
+    except sqlite3.Error as e:
+        print(f"Related index: read failed: {e}")
+        return []
+    return json.loads(row[0]) if row else []
+
+
+def fingerprint(posts: List[Dict[str, Any]]) -> str:
+    """Stable token for a related list, so page validators change when it does."""
+    return ",".join(f"{p['id']}:{p['slug']}:{p['title']}" for p in posts)
+
+
+# --- Background updates ---
+
+class _Worker:
+    """Debounced updater fed by the mirror listener; one daemon thread per process."""
+
+    def __init__(self):
+        self._pending = set()
+        self._cond = threading.Condition()
+        self._thread: Optional[threading.Thread] = None
+
+    def schedule(self, blog_id: str):
+        with self._cond:
+            self._pending.add(blog_id)
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(target=self._run, name="related-index", daemon=True)
+                self._thread.start()
+            self._cond.notify()
+
+    def _run(self):
+        while True:
+            with self._cond:
+                while not self._pending:
+                    self._cond.wait()
+            time.sleep(DEBOUNCE)
+            with self._cond:
+                blog_ids, self._pending = self._pending, set()
+            for blog_id in sorted(blog_ids):
+                try:
+                    started = time.perf_counter()
+                    written = update_blog(blog_id)
+                    if written:
+                        print(f"Related index: {blog_id} updated {written} lists in {time.perf_counter() - started:.2f}s")
+                except Exception as e:
+                    print(f"Related index: update of {blog_id} failed: {e}")
+
+
+_WORKER = _Worker()
+
+
+def on_posts_changed(blog_id: str, changed: List[Dict[str, Any]], removed: List[str]):
+    """Mirror listener: queues the blog for a debounced incremental update."""
+    _WORKER.schedule(blog_id)
+
+
+post_store.add_listener(on_posts_changed)
+
+
+def main(argv: Optional[Iterable[str]] = None):
+    from execution.utils import load_blogs_config
+
+    parser = argparse.ArgumentParser(description="Build or update the related-posts index from the post mirror.")
+    parser.add_argument("--blog-id", help="Only this blog (default: all)")
+    parser.add_argument("--full", action="store_true", help="Recompute every list, not just the affected ones")
+    args = parser.parse_args(argv)
+
+    for blog in load_blogs_config():
+        if args.blog_id and blog["id"] != args.blog_id:
+            continue
+        started = time.perf_counter()
+        written = update_blog(blog["id"], full=args.full)
+        print(f"{blog['name']}: {written} lists written in {time.perf_counter() - started:.2f}s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,180 @@
+import os
+import hashlib
+import threading
+from collections import OrderedDict
+from typing import Dict, Any, List, Optional, Set, Tuple
+
+import markdown
+
+from execution import post_store
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+RENDER_CACHE_DIR = os.environ.get("RENDER_CACHE_DIR", os.path.join(BASE_DIR, ".cache", "html"))
+RENDER_CACHE_SIZE = int(os.environ.get("RENDER_CACHE_SIZE", "512"))
+# On-disk HTML; least recently served files are evicted above this
+RENDER_CACHE_MAX_BYTES = int(os.environ.get("RENDER_CACHE_MAX_MB", "256")) * 1024 * 1024
+
+# Bump when the Markdown pipeline changes so stale cached HTML is never served
+RENDERER_VERSION = "2"
+# Matches the old client-side marked.js setup (GFM-style fences and tables, breaks: true).
+# codehilite runs Pygments over fenced code once, at render time; the colours live in
+# static/css/highlight.css. Unlabelled blocks are left plain rather than guessed.
+MARKDOWN_EXTENSIONS = ["fenced_code", "codehilite", "tables", "nl2br", "sane_lists"]
+MARKDOWN_EXTENSION_CONFIGS = {"codehilite": {"css_class": "highlight", "guess_lang": False}}
+
+_MEMORY: "OrderedDict[str, str]" = OrderedDict()
+_LOCK = threading.Lock()
+# Bytes written by this process since the last full scan; a scan runs once it could exceed the cap
+_usage_lock = threading.Lock()
+_usage: Optional[int] = None
+
+
+def content_key(content: str) -> str:
+    return hashlib.sha256(f"{RENDERER_VERSION}\0{content}".encode("utf-8")).hexdigest()
+
+
+def _disk_path(key: str) -> str:
+    return os.path.join(RENDER_CACHE_DIR, key[:2], f"{key}.html")
+
+
+def _remember(key: str, html: str):
+    with _LOCK:
+        _MEMORY[key] = html
+        _MEMORY.move_to_end(key)
+        while len(_MEMORY) > RENDER_CACHE_SIZE:
+            _MEMORY.popitem(last=False)
+
+
+def _to_html(content: str) -> str:
+    return markdown.markdown(content, extensions=MARKDOWN_EXTENSIONS,
+                             extension_configs=MARKDOWN_EXTENSION_CONFIGS, output_format="html")
+
+
+def render_markdown(content: str) -> str:
+    """
+    Renders a post body to HTML, cached by a hash of the Markdown.
+    Lookup order: in-process LRU, then the on-disk cache (shared by all workers), then render.
+    """
+    if not content:
+        return ""
+    key = content_key(content)
+
+    with _LOCK:
+        html = _MEMORY.get(key)
+        if html is not None:
+            _MEMORY.move_to_end(key)
+            return html
+
+    path = _disk_path(key)
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            html = f.read()
+        _touch(path)
+        _remember(key, html)
+        return html
+    except FileNotFoundError:
+        pass
+    except OSError as e:
+        print(f"Render cache read failed for {key}: {e}")
+
+    html = _to_html(content)
+    _remember(key, html)
+    try:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            f.write(html)
+        os.replace(tmp, path)
+        _account(os.path.getsize(path))
+        _evict_if_needed(keep={path})
+    except OSError as e:
+        print(f"Render cache write failed for {key}: {e}")
+    return html
+
+
+# --- Size cap ---
+
+def _touch(path: str):
+    """Marks a cache file as recently used (eviction goes by mtime)."""
+    try:
+        os.utime(path)
+    except OSError:
+        pass
+
+
+def _scan() -> List[Tuple[float, int, str]]:
+    files = []
+    for root, _, names in os.walk(RENDER_CACHE_DIR):
+        for name in names:
+            if name.endswith(".tmp"):
+                continue
+            path = os.path.join(root, name)
+            try:
+                st = os.stat(path)
+            except OSError:
+                continue
+            files.append((st.st_mtime, st.st_size, path))
+    return files
+
+
+def _account(size: int):
+    global _usage
+    with _usage_lock:
+        if _usage is not None:
+            _usage += size
+
+
+def _evict_if_needed(keep: Set[str] = frozenset()):
+    """Drops least recently used files (never those in `keep`) until the cache is back under 90% of the cap."""
+    global _usage
+    with _usage_lock:
+        if _usage is not None and _usage <= RENDER_CACHE_MAX_BYTES:
+            return
+        files = _scan()
+        total = sum(size for _, size, _ in files)
+        if total > RENDER_CACHE_MAX_BYTES:
+            files.sort()
+            target = RENDER_CACHE_MAX_BYTES * 0.9
+            for _, size, path in files:
+                if total <= target:
+                    break
+                if path in keep:
+                    continue
+                try:
+                    os.remove(path)
+                    total -= size
+                except OSError:
+                    pass
+        _usage = total
+
+
+def render_post(record: Dict[str, Any]) -> str:
+    return render_markdown(record.get("fields", {}).get("Content", ""))
+
+
+def post_view(record: Dict[str, Any]) -> Dict[str, Any]:
+    """Flattens a mirror record into the `post` context used by post.html."""
+    fields = record["fields"]
+    return {
+        "title": fields.get("Title", "Untitled"),
+        "content": fields.get("Content", ""),
+        "slug": fields.get("Slug", ""),
+        "image": fields.get("Image_URL", ""),
+        "author_name": fields.get("Author_Name", "Unassigned"),
+        "published_date": fields.get("PublishedDate", ""),
+        "html": render_post(record),
+        "fields": fields # Keep raw fields accessible
+    }
+
+
+def on_posts_changed(blog_id: str, changed: List[Dict[str, Any]], removed: List[str]):
+    """Mirror listener: pre-renders posts as they become (or change while) Published."""
+    for record in changed:
+        if record.get("fields", {}).get("Status") == "Published":
+            try:
+                render_post(record)
+            except Exception as e:
+                print(f"Pre-render failed for {record.get('id')}: {e}")
+
+
+post_store.add_listener(on_posts_changed)
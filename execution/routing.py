@@ -0,0 +1,82 @@
+from types import MappingProxyType
+from typing import Optional, Dict, Any, List, Iterable
+
+
+def normalize_host(host: str) -> str:
+    """Lower-cases a host, drops any port, trailing dot and leading 'www.'."""
+    host = (host or "").strip().lower()
+    if host.startswith("["):
+        # IPv6 literal, e.g. [::1]:8000
+        host = host.split("]")[0] + "]"
+    else:
+        host = host.split(":")[0]
+    host = host.rstrip(".")
+    if host.startswith("www."):
+        host = host[4:]
+    return host
+
+
+def _split_aliases(value) -> List[str]:
+    if not value:
+        return []
+    if isinstance(value, str):
+        value = value.replace("\n", ",").split(",")
+    return [v.strip() for v in value if v and v.strip()]
+
+
+def blog_domains(blog: Dict[str, Any]) -> List[str]:
+    """Primary domain plus aliases (`aliases` list in YAML, comma-separated Domain_Aliases in Airtable)."""
+    return [blog.get("domain", "")] + _split_aliases(blog.get("aliases"))
+
+
+class RoutingTable:
+    """
+    Immutable host/id lookup for the blog config. A new table is built on every config load and
+    swapped in with a single assignment, so readers never see a half-built table.
+
+    Lookups are dict hits: exact host first (after normalisation, so www.example.com and
+    example.com are the same), then wildcard entries ('*.example.com') from the most specific
+    parent domain upwards.
+    """
+
+    def __init__(self, blogs: Iterable[Dict[str, Any]]):
+        blogs = list(blogs)
+        by_id: Dict[str, Dict[str, Any]] = {}
+        exact: Dict[str, Dict[str, Any]] = {}
+        wildcard: Dict[str, Dict[str, Any]] = {}
+
+        for blog in blogs:
+            by_id.setdefault(str(blog.get("id")), blog)
+            for domain in blog_domains(blog):
+                if domain.strip().startswith("*."):
+                    # Stored without the '*.' so lookups can walk parent domains
+                    wildcard.setdefault(normalize_host(domain.strip()[2:]), blog)
+                elif domain:
+                    # First blog listed wins a contested domain (matches the old linear scan)
+                    exact.setdefault(normalize_host(domain), blog)
+
+        self.blogs = tuple(blogs)
+        self.by_id = MappingProxyType(by_id)
+        self.exact = MappingProxyType(exact)
+        self.wildcard = MappingProxyType(wildcard)
+
+    def get(self, blog_id: str) -> Optional[Dict[str, Any]]:
+        return self.by_id.get(blog_id)
+
+    def resolve_host(self, host: str) -> Optional[Dict[str, Any]]:
+        host = normalize_host(host)
+        if not host:
+            return None
+        blog = self.exact.get(host)
+        if blog is not None:
+            return blog
+        # a.b.example.com -> *.b.example.com, *.example.com, *.com
+        parts = host.split(".")
+        for i in range(1, len(parts)):
+            blog = self.wildcard.get(".".join(parts[i:]))
+            if blog is not None:
+                return blog
+        return None
+
+    def default(self) -> Optional[Dict[str, Any]]:
+        return self.blogs[0] if self.blogs else None
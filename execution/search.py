@@ -0,0 +1,187 @@
+import os
+import re
+import json
+import html
+import time
+import sqlite3
+import argparse
+from typing import Optional, Dict, Any, List, Iterable
+
+from execution.mirror_index import MirrorIndex
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+INDEX_PATH = os.environ.get("SEARCH_INDEX_PATH", os.path.join(BASE_DIR, ".cache", "search.sqlite3"))
+
+# BM25 column weights: title, description, glossary terms, body
+WEIGHTS = (10.0, 4.0, 3.0, 1.0)
+# Deep pages of a relevance ranking are never worth serving
+MAX_RESULTS = 500
+MAX_QUERY_TERMS = 12
+# Shorter prefixes expand to most of the vocabulary and rank far too many posts
+PREFIX_MIN_LENGTH = 4
+
+# Inverted index (FTS5, porter-stemmed) plus the card each hit renders with. `docs.rowid` is the
+# FTS rowid, and content_hash is the mirror's fields_hash so reconciling reads no field data.
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS docs (
+    blog_id TEXT NOT NULL,
+    record_id TEXT NOT NULL,
+    content_hash TEXT,
+    card TEXT,
+    UNIQUE (blog_id, record_id)
+);
+CREATE VIRTUAL TABLE IF NOT EXISTS docs_fts USING fts5(
+    title, description, glossary, content,
+    tokenize = 'porter unicode61 remove_diacritics 2'
+);
+"""
+
+_TERM = re.compile(r"\w+", re.UNICODE)
+
+
+def glossary_terms(fields: Dict[str, Any]) -> List[str]:
+    """Terms from Glossary_JSON ([{term, definition}])."""
+    try:
+        glossary = json.loads(fields.get("Glossary_JSON") or "[]")
+    except (TypeError, ValueError):
+        return []
+    if not isinstance(glossary, list):
+        return []
+    return [str(g.get("term")) for g in glossary if isinstance(g, dict) and g.get("term")]
+
+
+def _card(record: Dict[str, Any]) -> Dict[str, Any]:
+    fields = record["fields"]
+    return {
+        "id": record["id"],
+        "title": fields.get("Title", "Untitled"),
+        "slug": fields.get("Slug", ""),
+        "description": fields.get("MetaDescription", ""),
+        "published_date": fields.get("PublishedDate", ""),
+    }
+
+
+# --- Index maintenance ---
+
+def _remove(conn: sqlite3.Connection, blog_id: str, record_ids: Iterable[str]):
+    for record_id in record_ids:
+        row = conn.execute("SELECT rowid FROM docs WHERE blog_id=? AND record_id=?", (blog_id, record_id)).fetchone()
+        if row:
+            conn.execute("DELETE FROM docs_fts WHERE rowid=?", (row[0],))
+            conn.execute("DELETE FROM docs WHERE rowid=?", (row[0],))
+
+
+def _add(conn: sqlite3.Connection, blog_id: str, records: Iterable[Dict[str, Any]]):
+    for record in records:
+        fields = record["fields"]
+        cursor = conn.execute(
+            "INSERT INTO docs (blog_id, record_id, content_hash, card) VALUES (?, ?, ?, ?)",
+            (blog_id, record["id"], record["_hash"], json.dumps(_card(record))),
+        )
+        conn.execute(
+            "INSERT INTO docs_fts (rowid, title, description, glossary, content) VALUES (?, ?, ?, ?, ?)",
+            (cursor.lastrowid, fields.get("Title", ""), fields.get("MetaDescription", ""),
+             " ; ".join(glossary_terms(fields)), fields.get("Content", "")),
+        )
+
+
+_INDEX = MirrorIndex("Search index", INDEX_PATH, _SCHEMA, _add, _remove)
+_INDEX.listen()
+_connect = _INDEX.connect
+# Reconciles each blog once per process before its first search
+ensure_indexed = _INDEX.ensure_indexed
+
+
+# --- Queries ---
+
+def match_expression(query: str, any_term: bool = False, prefix: bool = False) -> Optional[str]:
+    """
+    Turns free text into a safe FTS5 query: every word quoted, so no operator syntax leaks through.
+    All words must match unless `any_term`. With `prefix` (as-you-type) the last word also matches
+    longer words, once it is long enough that the expansion stays cheap.
+    """
+    terms = _TERM.findall(query.lower())[:MAX_QUERY_TERMS]
+    if not terms:
+        return None
+    quoted = [f'"{t}"' for t in terms]
+    if prefix and len(terms[-1]) >= PREFIX_MIN_LENGTH:
+        quoted[-1] += "*"
+    return (" OR " if any_term else " ").join(quoted)
+
+
+def _highlight(snippet: str) -> str:
+    """Escapes an FTS snippet and turns its STX/ETX match markers into <mark> tags."""
+    return html.escape(snippet).replace("\x02", "<mark>").replace("\x03", "</mark>")
+
+
+def search(query: str, blog_ids: Optional[List[str]] = None, limit: int = 20, offset: int = 0,
+           prefix: bool = False) -> Dict[str, Any]:
+    """
+    BM25-ranked published posts matching `query`, within `blog_ids` (None = every blog).
+    Falls back to matching any word when no post contains them all.
+    Returns {results: [{blog_id, id, title, slug, description, published_date, snippet, score}], total, any_term}.
+    """
+    empty = {"results": [], "total": 0, "any_term": False}
+    if blog_ids is not None and not blog_ids:
+        return empty
+    offset = max(0, min(offset, MAX_RESULTS))
+    limit = max(0, min(limit, MAX_RESULTS - offset))
+
+    conn = _connect()
+    scope, params = "", []
+    if blog_ids is not None:
+        scope = f" AND d.blog_id IN ({','.join('?' * len(blog_ids))})"
+        params = list(blog_ids)
+
+    for any_term in (False, True):
+        expression = match_expression(query, any_term, prefix)
+        if expression is None:
+            return empty
+        # Capped count: enough to page through MAX_RESULTS without counting every hit on a common word
+        total = conn.execute(
+            f"SELECT COUNT(*) FROM (SELECT 1 FROM docs_fts JOIN docs d ON d.rowid = docs_fts.rowid "
+            f"WHERE docs_fts MATCH ?{scope} LIMIT ?)",
+            [expression, *params, MAX_RESULTS],
+        ).fetchone()[0]
+        if total or any_term or len(_TERM.findall(query)) < 2:
+            break
+
+    rows = conn.execute(
+        f"SELECT d.blog_id, d.card, bm25(docs_fts, ?, ?, ?, ?) AS score, "
+        f"snippet(docs_fts, 3, char(2), char(3), '…', 24) AS snippet "
+        f"FROM docs_fts JOIN docs d ON d.rowid = docs_fts.rowid "
+        f"WHERE docs_fts MATCH ?{scope} ORDER BY score LIMIT ? OFFSET ?",
+        [*WEIGHTS, expression, *params, limit, offset],
+    ).fetchall()
+    results = []
+    for blog_id, card, score, snippet in rows:
+        item = json.loads(card)
+        item.update(blog_id=blog_id, snippet=_highlight(snippet), score=round(-score, 4))
+        results.append(item)
+    return {"results": results, "total": total, "any_term": any_term}
+
+
+def main(argv: Optional[Iterable[str]] = None):
+    from execution.utils import load_blogs_config
+
+    parser = argparse.ArgumentParser(description="Build the search index from the post mirror, or query it.")
+    parser.add_argument("query", nargs="?", help="Search instead of indexing")
+    parser.add_argument("--blog-id", help="Only this blog (default: all)")
+    args = parser.parse_args(argv)
+
+    blog_ids = [b["id"] for b in load_blogs_config() if not args.blog_id or b["id"] == args.blog_id]
+    if args.query:
+        started = time.perf_counter()
+        found = search(args.query, blog_ids)
+        for item in found["results"]:
+            print(f"{item['score']:8.3f}  {item['blog_id']}  {item['title']}  /post/{item['slug']}")
+        print(f"{found['total']} matches in {(time.perf_counter() - started) * 1000:.1f}ms")
+        return
+    for blog_id in blog_ids:
+        started = time.perf_counter()
+        changed, removed = _INDEX.reconcile(blog_id)
+        print(f"{blog_id}: {len(changed) + len(removed)} posts reindexed in {time.perf_counter() - started:.2f}s")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,114 +1,203 @@
 import os
 import sys
+import hmac
+import json
+import asyncio
 import subprocess
 from datetime import datetime
+from typing import Optional
+from urllib.parse import urlencode
 from fastapi import FastAPI, Request, HTTPException, BackgroundTasks
 from fastapi.templating import Jinja2Templates
-from fastapi.staticfiles import StaticFiles
-from fastapi.responses import HTMLResponse
-from execution.utils import get_blog_by_domain, get_blog_config, get_airtable_client, get_base_id
+from fastapi.responses import HTMLResponse, Response, StreamingResponse
+from execution.utils import get_routing_table_async, get_blog_config, get_blog_config_async
 
 from execution.models import BlogConfig
 from execution.admin_routes import router as admin_router
+from execution import post_store, slug_index, render, related, search, facets, images, sitemaps, feeds, airtable_client, webhooks, assets, metrics
+from execution.compression import CompressionMiddleware
+from execution.fanout import fan_out
+from execution.swr_cache import listing_cache
+from execution.pagination import clamp_page_size, decode_cursor, build_page, sort_key, cursor_url
+from execution.conditional import make_etag, parse_timestamp, is_not_modified, not_modified, add_validators
 
 app = FastAPI()
+app.add_middleware(CompressionMiddleware)
+# Outermost, so request timings include compression
+app.add_middleware(metrics.MetricsMiddleware)
 # Reload for Admin Design
 app.include_router(admin_router)
 
+@app.on_event("startup")
+def start_post_mirror():
+    """Public pages read from the local post mirror; keep it synced from Airtable in the background."""
+    # Fingerprint and precompress static assets before the first page links to them
+    assets.build()
+    metrics.start()
+    # Other workers' syncs and edits reach this worker's in-memory caches through the change log
+    post_store.follow_changes()
+    if os.environ.get("POST_SYNC_DISABLED") != "1":
+        post_store.start_syncers()
+
+def mark_listings_stale(blog_id, changed, removed):
+    """Mirror listener: cached listings for a changed blog are served once more, then refreshed."""
+    listing_cache.mark_stale(blog_id)
+
+post_store.add_listener(mark_listings_stale, local=True)
+
+@app.on_event("shutdown")
+async def stop_post_mirror():
+    post_store.stop_syncers()
+    post_store.stop_following()
+    await airtable_client.aclose()
+    metrics.stop()
+
 # Setup Templates
 BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
 templates = Jinja2Templates(directory=os.path.join(BASE_DIR, "templates"))
-app.mount("/static", StaticFiles(directory=os.path.join(BASE_DIR, "static")), name="static")
+templates.env.globals["asset_url"] = assets.asset_url
+templates.env.globals.update(image_url=images.image_url, image_srcset=images.image_srcset,
+                             image_placeholder=images.image_placeholder)
+app.mount("/static", assets.StaticAssets(directory=os.path.join(BASE_DIR, "static")), name="static")
 
-def get_current_blog(request: Request):
-    """Resolves the current blog configuration from the Host header."""
-    host = request.headers.get("host", "").split(":")[0] # Remove port if present
-    
-    # Check for exact domain match
-    blog = get_blog_by_domain(host)
+async def get_current_blog_async(request: Request):
+    """Resolves the current blog configuration from the Host header (domain, alias or wildcard)."""
+    routing = await get_routing_table_async()
+    blog = routing.resolve_host(request.headers.get("host", ""))
     if blog:
         return blog
-    
+
     # Fallback/Default for development (take the first one if no match)
     # WARNING: In production, you might want to return 404 or a landing page
-    from execution.utils import load_blogs_config
-    blogs = load_blogs_config()
-    if blogs:
-        return blogs[0]
-        
+    if routing.blogs:
+        return routing.default()
+
     raise HTTPException(status_code=404, detail="Blog not found")
 
+def listing_validators(blog_ids, *parts):
+    """ETag/Last-Modified for pages built from whole blogs, from the mirror's per-blog change counters."""
+    versions = post_store.get_versions(blog_ids)
+    etag = make_etag(*sorted(f"{b}:{v}:{at}" for b, (v, at) in versions.items()), *parts)
+    last_modified = max((parse_timestamp(at) for _, at in versions.values() if at), default=None)
+    return etag, last_modified
+
 @app.get("/healthz")
 async def health_check():
     return {"status": "ok", "timestamp": datetime.now().isoformat()}
 
+@app.get("/metrics")
+async def read_metrics(request: Request):
+    """
+    Prometheus metrics for every worker on the host. With METRICS_TOKEN set, scrapers must send
+    `Authorization: Bearer <token>`.
+    """
+    token = os.environ.get("METRICS_TOKEN")
+    if token and not hmac.compare_digest(request.headers.get("authorization", ""), f"Bearer {token}"):
+        raise HTTPException(status_code=403, detail="Invalid Request")
+    body = await asyncio.to_thread(metrics.render)
+    return Response(body, media_type="text/plain; version=0.0.4; charset=utf-8",
+                    headers={"Cache-Control": "no-store"})
+
 @app.get("/", response_class=HTMLResponse)
-async def read_root(request: Request):
+async def read_root(request: Request, cursor: Optional[str] = None, page_size: Optional[int] = None):
     """
     Landing Page: Aggregates published posts from ALL configured blogs.
     """
     try:
-        from execution.utils import load_blogs_config, get_airtable_client, get_base_id
-        
-        all_blogs = load_blogs_config()
-        all_posts = []
-        
-        api = get_airtable_client()
+        from execution.utils import load_blogs_config_async
         
-        for blog in all_blogs:
-            try:
-                base_id = get_base_id(blog)
-                table = api.table(base_id, blog["airtable"]["table_name"])
-                # Fetch only published posts
-                records = table.all(sort=["-PublishedDate"], formula="{Status}='Published'")
-                # Tag records with source blog (optional, for template if needed)
-                # for r in records: r["_blog_name"] = blog["name"] 
-                all_posts.extend(records)
-            except Exception as e:
-                print(f"Error fetching posts for blog {blog['name']}: {e}")
-
-        # Sort combined list by date (assuming ISO format strings or relying on checking fields)
-        # For MVP simple concatenation is often fine, or simple lambda sort
-        # all_posts.sort(key=lambda x: x["fields"].get("PublishedDate", ""), reverse=True)
-
-        return templates.TemplateResponse("index.html", {
+        all_blogs = await load_blogs_config_async()
+        size = clamp_page_size(page_size)
+        key, direction = decode_cursor(cursor)
+
+        blog_ids = [b["id"] for b in all_blogs]
+
+        def load_blog_posts(blog):
+            # Mirror read; only a blog the syncer hasn't reached yet costs an Airtable fetch
+            post_store.ensure_synced(blog)
+            return post_store.list_published_page([blog["id"]], size + 1, key, direction)
+
+        async def load_listing():
+            # Validators are taken before the data so they can never claim newer content than we hold
+            etag, last_modified = await asyncio.to_thread(listing_validators, blog_ids, "root", cursor, size)
+            # Concurrent per-blog fan-out: latency tracks the slowest blog (capped by the deadline)
+            results, omitted = await fan_out(all_blogs, load_blog_posts)
+            merged = [p for posts in results.values() for p in posts]
+            merged.sort(key=sort_key, reverse=True)
+            # Keep the size + 1 posts nearest the cursor (the newest when paging forward)
+            merged = merged[:size + 1] if direction == "next" else merged[-(size + 1):]
+            return {"page": build_page(merged, size, key, direction), "omitted": omitted,
+                    "partial": bool(omitted), "etag": etag, "last_modified": last_modified}
+
+        # Served from cache; refreshed in the background once stale
+        listing = await listing_cache.get(("root", tuple(blog_ids), cursor, size), load_listing, tags=blog_ids)
+        page, omitted = listing["page"], listing["omitted"]
+        etag, last_modified = listing["etag"], listing["last_modified"]
+        if not omitted and is_not_modified(request, etag, last_modified):
+            return not_modified(etag, last_modified)
+
+        response = templates.TemplateResponse("index.html", {
             "request": request,
             "blog": {"name": "Auto_Blog Network"}, # Generic Name
-            "posts": all_posts,
+            "posts": page["posts"],
+            "next_url": cursor_url(page["next_cursor"], page_size),
+            "prev_url": cursor_url(page["prev_cursor"], page_size),
+            "omitted_blogs": omitted,
             "now": datetime.now()
         })
+        if omitted:
+            # Partial page: no validators, so clients never revalidate against it
+            response.headers["X-Omitted-Blogs"] = ",".join(b["id"] for b in omitted)
+        else:
+            add_validators(response, etag, last_modified)
+        return response
     except Exception as e:
         import traceback
         print(f"CRITICAL ERROR in read_root: {e}\n{traceback.format_exc()}")
         return HTMLResponse(content=f"<h1>Internal Server Error</h1><pre>{e}</pre>", status_code=500)
 
 @app.get("/blogs/{blog_id}", response_class=HTMLResponse)
-async def read_blog_index(blog_id: str, request: Request):
+async def read_blog_index(blog_id: str, request: Request, cursor: Optional[str] = None, page_size: Optional[int] = None):
     """
     Blog Page: Displays published posts for a specific blog.
     """
     try:
-        from execution.utils import get_blog_config, get_base_id, get_airtable_client
-        
-        blog = get_blog_config(blog_id)
+        blog = await get_blog_config_async(blog_id)
         if not blog:
             raise HTTPException(status_code=404, detail="Blog not found")
 
+        size = clamp_page_size(page_size)
+        key, direction = decode_cursor(cursor)
+
+        async def load_listing():
+            def load():
+                # Validators are taken before the data so they can never claim newer content than we hold
+                validators = listing_validators([blog["id"]], "blog", blog["name"], cursor, size)
+                return validators, post_store.list_published_page([blog["id"]], size + 1, key, direction)
+
+            (etag, last_modified), rows = await asyncio.to_thread(load)
+            return {"page": build_page(rows, size, key, direction), "etag": etag, "last_modified": last_modified}
+
         try:
-            airtable = get_airtable_client()
-            base_id = get_base_id(blog)
-            table = airtable.table(base_id, blog["airtable"]["table_name"])
-            records = table.all(sort=["-PublishedDate"], formula="{Status}='Published'")
+            # Served from cache; refreshed in the background once stale
+            listing = await listing_cache.get(("blog", blog["id"], blog["name"], cursor, size), load_listing,
+                                              tags=[blog["id"]])
         except Exception as e:
-            print(f"Airtable Error: {e}")
-            records = []
+            print(f"Post mirror Error: {e}")
+            listing = {"page": build_page([], size, key, direction), "etag": None, "last_modified": None}
+        page, etag, last_modified = listing["page"], listing["etag"], listing["last_modified"]
+        if etag and is_not_modified(request, etag, last_modified):
+            return not_modified(etag, last_modified)
 
-        return templates.TemplateResponse("index.html", {
+        response = templates.TemplateResponse("index.html", {
             "request": request,
             "blog": blog,
-            "posts": records,
+            "posts": page["posts"],
+            "next_url": cursor_url(page["next_cursor"], page_size),
+            "prev_url": cursor_url(page["prev_cursor"], page_size),
             "now": datetime.now()
         })
+        return add_validators(response, etag, last_modified) if etag else response
     except HTTPException:
         raise
     except Exception as e:
@@ -117,51 +206,45 @@ async def read_blog_index(blog_id: str, request: Request):
 @app.get("/post/{slug}", response_class=HTMLResponse)
 async def read_post(slug: str, request: Request):
     try:
-        from execution.utils import load_blogs_config, get_base_id, get_airtable_client
+        from execution.utils import load_blogs_config_async
         
         # Search ALL blogs for this slug
         # This handles the "Unified Landing Page" scenario where we don't know the source blog
-        blogs = load_blogs_config()
-        airtable = get_airtable_client()
-        
-        found_record = None
-        found_blog = None
+        blogs = await load_blogs_config_async()
         
-        for blog in blogs:
-            try:
-                base_id = get_base_id(blog)
-                table = airtable.table(base_id, blog["airtable"]["table_name"])
-                # Find record by slug
-                records = table.all(formula=f"{{Slug}}='{slug}'")
-                if records:
-                    found_record = records[0]
-                    found_blog = blog
-                    break
-            except Exception as inner_e:
-                continue # Try next blog
+        found_record, found_blog = await slug_index.resolve(slug, blogs)
         
         if not found_record:
              # Try decoding slug if it had special chars? 
              # Or just not found
              return HTMLResponse(content="<h1>404 - Post Not Found</h1>", status_code=404)
+
+        def load_related():
+            # SQLite and filesystem reads, kept off the event loop
+            related_posts = related.related_for(found_blog["id"], found_record["id"])
+            etag = make_etag("post", found_blog["id"], found_blog["name"], found_record["id"],
+                             found_record["_hash"], render.RENDERER_VERSION, related.fingerprint(related_posts),
+                             images.has_placeholder(found_record["fields"].get("Image_URL")))
+            return related_posts, etag
+
+        related_posts, etag = await asyncio.to_thread(load_related)
+        last_modified = parse_timestamp(found_record.get("_synced_at"))
+        if is_not_modified(request, etag, last_modified):
+            return not_modified(etag, last_modified)
              
-        # Flatten for template
-        post = {
-            "title": found_record["fields"].get("Title", "Untitled"),
-            "content": found_record["fields"].get("Content", ""),
-            "slug": found_record["fields"].get("Slug", ""),
-            "image": found_record["fields"].get("Image_URL", ""),
-            "author_name": found_record["fields"].get("Author_Name", "Unassigned"),
-            "published_date": found_record["fields"].get("PublishedDate", ""),
-            "fields": found_record["fields"] # Keep raw fields accessible
-        }
+        # Flatten for template; a render cache miss runs Markdown + Pygments
+        post = await asyncio.to_thread(render.post_view, found_record)
         
-        return templates.TemplateResponse("post.html", {
+        response = templates.TemplateResponse("post.html", {
             "request": request,
             "blog": found_blog,
             "post": post,
+            "related": related_posts,
+            "facets": [{"kind": kind, "label": label, "url": facets.facet_url(kind, label)}
+                       for kind, _, label in facets.post_facets(found_record["fields"])],
             "now": datetime.now()
         })
+        return add_validators(response, etag, last_modified)
         
     except Exception as e:
         import traceback
@@ -180,7 +263,7 @@ async def trigger_generation(request: Request, background_tasks: BackgroundTasks
     if token != secret:
         raise HTTPException(status_code=403, detail="Invalid Request")
         
-    blog = get_blog_config(blog_id)
+    blog = await get_blog_config_async(blog_id)
     if not blog:
         raise HTTPException(status_code=404, detail="Blog ID not found")
         
@@ -189,6 +272,174 @@ async def trigger_generation(request: Request, background_tasks: BackgroundTasks
     
     return {"status": "queued", "blog": blog["name"]}
 
+@app.post("/api/webhooks/airtable")
+async def airtable_webhook(request: Request, background_tasks: BackgroundTasks):
+    """
+    Change notifications from Airtable (or `python -m execution.webhooks`), signed with WEBHOOK_SECRET.
+    Refreshes only the records named in the payload; a bare ping triggers an incremental sync.
+    """
+    body = await request.body()
+    if not webhooks.verify(body, request.headers.get(webhooks.SIGNATURE_HEADER)):
+        raise HTTPException(status_code=403, detail="Invalid Request")
+    try:
+        payload = json.loads(body)
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Invalid payload")
+
+    summary = await webhooks.apply_changes(payload)
+    resync = summary.pop("resync")
+    if resync:
+        background_tasks.add_task(webhooks.resync, resync)
+    return {"status": "ok", **summary, "resync": [b["name"] for b in resync]}
+
+
+async def run_search(q: str, blog_id: Optional[str], page: int, page_size: Optional[int], prefix: bool = False):
+    """Shared by /search and /api/search: resolves the scope and runs one page of the query."""
+    from execution.utils import load_blogs_config_async
+
+    if blog_id:
+        blog = await get_blog_config_async(blog_id)
+        if not blog:
+            raise HTTPException(status_code=404, detail="Blog not found")
+        blogs = [blog]
+    else:
+        blogs = await load_blogs_config_async()
+    blog_ids = [b["id"] for b in blogs]
+    size = clamp_page_size(page_size)
+    page = max(1, page)
+
+    def run():
+        # Validators are taken before the results so they can never claim newer content than they hold
+        validators = listing_validators(blog_ids, "search", q, blog_id, page, size)
+        if not q.strip():
+            return validators, {"results": [], "total": 0, "any_term": False}
+        search.ensure_indexed(blog_ids)
+        return validators, search.search(q, blog_ids, limit=size, offset=(page - 1) * size, prefix=prefix)
+
+    (etag, last_modified), found = await asyncio.to_thread(run)
+    names = {b["id"]: b["name"] for b in blogs}
+    for item in found["results"]:
+        item["blog_name"] = names.get(item["blog_id"], "")
+    found.update(blog=blogs[0] if blog_id else None, blog_ids=blog_ids, page=page, page_size=size,
+                 has_next=page * size < found["total"], etag=etag, last_modified=last_modified)
+    return found
+
+def search_page_url(q: str, blog_id: Optional[str], page: int, page_size: Optional[int]) -> str:
+    params = {"q": q}
+    if blog_id:
+        params["blog_id"] = blog_id
+    if page > 1:
+        params["page"] = page
+    if page_size:
+        params["page_size"] = page_size
+    return "/search?" + urlencode(params)
+
+@app.get("/search", response_class=HTMLResponse)
+async def search_page(request: Request, q: str = "", blog_id: Optional[str] = None, page: int = 1,
+                      page_size: Optional[int] = None):
+    """Full-text search (BM25 over the local index): one blog with ?blog_id=, otherwise the whole network."""
+    found = await run_search(q, blog_id, page, page_size)
+    etag, last_modified = found["etag"], found["last_modified"]
+    if is_not_modified(request, etag, last_modified):
+        return not_modified(etag, last_modified)
+
+    response = templates.TemplateResponse("search.html", {
+        "request": request,
+        "blog": found["blog"] or {"name": "Auto_Blog Network"},
+        "scoped_blog": found["blog"],
+        "q": q,
+        "results": found["results"],
+        "total": found["total"],
+        "any_term": found["any_term"],
+        "prev_url": search_page_url(q, blog_id, found["page"] - 1, page_size) if found["page"] > 1 else None,
+        "next_url": search_page_url(q, blog_id, found["page"] + 1, page_size) if found["has_next"] else None,
+        "now": datetime.now()
+    })
+    return add_validators(response, etag, last_modified)
+
+@app.get("/api/search")
+async def search_api(q: str = "", blog_id: Optional[str] = None, page: int = 1, page_size: Optional[int] = None):
+    """JSON variant of /search for as-you-type boxes: the last word also matches as a prefix."""
+    found = await run_search(q, blog_id, page, page_size, prefix=True)
+    return {key: found[key] for key in ("results", "total", "any_term", "page", "page_size", "has_next")}
+
+async def facet_archive(request: Request, kind: str, key: str, blog_id: Optional[str], cursor: Optional[str],
+                        page_size: Optional[int]):
+    """
+    Archive of the posts carrying one tag or entity, newest first, read from the facet index.
+    Network-wide unless ?blog_id= narrows it to one blog.
+    """
+    from execution.utils import load_blogs_config_async
+
+    if blog_id:
+        blog = await get_blog_config_async(blog_id)
+        if not blog:
+            raise HTTPException(status_code=404, detail="Blog not found")
+        blogs = [blog]
+    else:
+        blogs = await load_blogs_config_async()
+    blog_ids = [b["id"] for b in blogs]
+    key = facets.facet_key(key)
+    size = clamp_page_size(page_size)
+    cursor_key, direction = decode_cursor(cursor)
+
+    etag, last_modified = await asyncio.to_thread(listing_validators, blog_ids, kind, key, cursor, size)
+    if is_not_modified(request, etag, last_modified):
+        return not_modified(etag, last_modified)
+
+    def load():
+        facets.ensure_indexed(blog_ids)
+        return facets.label(kind, key, blog_ids), facets.list_page(kind, key, blog_ids, size + 1, cursor_key, direction)
+
+    name, rows = await asyncio.to_thread(load)
+    if not name:
+        raise HTTPException(status_code=404, detail=f"No posts for this {kind}")
+    page = build_page(rows, size, cursor_key, direction)
+    extra = {"blog_id": blog_id}
+    response = templates.TemplateResponse("index.html", {
+        "request": request,
+        "blog": blogs[0] if blog_id else {"name": "Auto_Blog Network"},
+        "heading": f"{'Tag' if kind == 'tag' else 'Entity'} // {name}",
+        "posts": page["posts"],
+        "next_url": cursor_url(page["next_cursor"], page_size, extra),
+        "prev_url": cursor_url(page["prev_cursor"], page_size, extra),
+        "now": datetime.now()
+    })
+    return add_validators(response, etag, last_modified)
+
+@app.get("/tag/{tag}", response_class=HTMLResponse)
+async def tag_archive(tag: str, request: Request, blog_id: Optional[str] = None, cursor: Optional[str] = None,
+                      page_size: Optional[int] = None):
+    """Posts tagged `tag` (metadata.tags)."""
+    return await facet_archive(request, "tag", tag, blog_id, cursor, page_size)
+
+@app.get("/entity/{name}", response_class=HTMLResponse)
+async def entity_archive(name: str, request: Request, blog_id: Optional[str] = None, cursor: Optional[str] = None,
+                         page_size: Optional[int] = None):
+    """Posts mentioning the entity `name` (Entities_JSON)."""
+    return await facet_archive(request, "entity", name, blog_id, cursor, page_size)
+
+@app.get("/img/{width:int}.{fmt}")
+async def image_proxy(width: int, fmt: str, request: Request, url: str, sig: str):
+    """
+    Resized / re-encoded copy of a post image (links come from image_url / image_srcset in templates).
+    The origin is fetched once; derivatives are cached on disk under an LRU size cap.
+    """
+    if not images.verify(url, sig):
+        raise HTTPException(status_code=403, detail="Invalid Request")
+    if images.Image is None or width not in images.WIDTHS or fmt not in images.FORMATS:
+        raise HTTPException(status_code=404, detail="Unsupported image size or format")
+
+    headers = {"ETag": make_etag("img", url, width, fmt), "Cache-Control": images.CACHE_CONTROL}
+    if is_not_modified(request, headers["ETag"]):
+        return Response(status_code=304, headers=headers)
+    try:
+        data = await asyncio.to_thread(images.get_derivative, url, width, fmt)
+    except images.ImageError as e:
+        print(f"Image proxy error: {e}")
+        raise HTTPException(status_code=502, detail="Image unavailable")
+    return Response(content=data, media_type=images.FORMATS[fmt], headers=headers)
+
 def run_generation_script(blog_id: str):
     """Executes the generate_post.py script as a subprocess."""
     print(f"Triggering generation for {blog_id}")
@@ -205,64 +456,102 @@ def run_generation_script(blog_id: str):
     except Exception as e:
         print(f"Generation failed: {e}")
 
-@app.get("/sitemap.xml", response_class=HTMLResponse)
+def sitemap_response(request: Request, blog, name: str, parts_factory, as_gz_file: bool = False):
+    """
+    Serves one sitemap document (index or shard): 304 when unchanged, cached gzip bytes while the
+    published set is unchanged, otherwise streamed straight from the mirror and cached on the way out.
+    Validators follow the published (slug, date) set only, so draft edits do not invalidate sitemaps.
+    """
+    want_gzip = as_gz_file or "gzip" in request.headers.get("accept-encoding", "")
+    fingerprint, changed_at = post_store.published_set_version(blog["id"])
+    token = make_etag(fingerprint, "sitemap", blog["domain"], name)
+    last_modified = parse_timestamp(changed_at)
+    # Each representation (identity / gzip) needs its own strong ETag
+    etag = make_etag(token, "gzip" if want_gzip else "identity", as_gz_file)
+    if is_not_modified(request, etag, last_modified):
+        return not_modified(etag, last_modified)
+
+    headers = {"Vary": "Accept-Encoding"}
+    media_type = "application/xml"
+    if as_gz_file:
+        media_type = "application/gzip"
+    elif want_gzip:
+        headers["Content-Encoding"] = "gzip"
+
+    key = (blog["id"], name)
+    body = sitemaps.cached_body(key, token, want_gzip)
+    if body is not None:
+        response = Response(content=body, media_type=media_type, headers=headers)
+    else:
+        response = StreamingResponse(sitemaps.stream_and_cache(key, token, parts_factory(), want_gzip),
+                                     media_type=media_type, headers=headers)
+    return add_validators(response, etag, last_modified)
+
+@app.get("/sitemap.xml")
 async def sitemap(request: Request):
-    """Generates a dynamic sitemap for the current blog."""
-    blog = get_current_blog(request)
+    """Sitemap index for the current blog; points at the sharded urlsets below."""
+    blog = await get_current_blog_async(request)
+    return await asyncio.to_thread(sitemap_response, request, blog, "sitemap.xml",
+                                   lambda: sitemaps.iter_index_xml(blog, sitemaps.shard_count(blog)))
+
+@app.get("/sitemap.xml.gz")
+async def sitemap_gz(request: Request):
+    blog = await get_current_blog_async(request)
+    return await asyncio.to_thread(sitemap_response, request, blog, "sitemap.xml",
+                                   lambda: sitemaps.iter_index_xml(blog, sitemaps.shard_count(blog)), as_gz_file=True)
+
+@app.get("/sitemap-{shard:int}.xml")
+async def sitemap_shard(shard: int, request: Request):
+    """One sitemap shard (at most SITEMAP_SHARD_SIZE URLs)."""
+    blog = await get_current_blog_async(request)
+    if shard < 1 or shard > sitemaps.shard_count(blog):
+        raise HTTPException(status_code=404, detail="Sitemap shard not found")
+    return await asyncio.to_thread(sitemap_response, request, blog, sitemaps.shard_name(shard),
+                                   lambda: sitemaps.iter_shard_xml(blog, shard))
+
+@app.get("/sitemap-{shard:int}.xml.gz")
+async def sitemap_shard_gz(shard: int, request: Request):
+    blog = await get_current_blog_async(request)
+    if shard < 1 or shard > sitemaps.shard_count(blog):
+        raise HTTPException(status_code=404, detail="Sitemap shard not found")
+    return await asyncio.to_thread(sitemap_response, request, blog, sitemaps.shard_name(shard),
+                                   lambda: sitemaps.iter_shard_xml(blog, shard), as_gz_file=True)
+
+def feed_response(request: Request, blog, fmt: str):
+    """
+    Serves a cached feed for `blog`; 304 while the posts in the feed are unchanged.
+    Builds (renders) the feed on a miss, so async routes call it through asyncio.to_thread.
+    """
+    token = feeds.feed_token(blog)
+    etag = make_etag("feed", fmt, token)
+    last_modified = max((parse_timestamp(at) for _, at in post_store.get_versions([blog["id"]]).values() if at),
+                        default=None)
+    if is_not_modified(request, etag, last_modified):
+        return not_modified(etag, last_modified)
+
     try:
-        airtable = get_airtable_client()
-        base_id = get_base_id(blog)
-        table = airtable.table(base_id, blog["airtable"]["table_name"])
-        posts = table.all(sort=["-PublishedDate"], formula="{Status}='Published'")
-    except:
-        posts = []
-
-    domain = f"https://{blog['domain']}"
-    xml_content = '<?xml version="1.0" encoding="UTF-8"?>\n'
-    xml_content += '<urlset xmlns="http://www.sitemaps.org/schemas/sitemap/0.9">\n'
-    
-    # Home
-    xml_content += f"  <url><loc>{domain}/</loc><changefreq>daily</changefreq></url>\n"
-    
-    # Posts
-    for post in posts:
-        slug = post.get('fields', {}).get('Slug')
-        if slug:
-            date = post.get('fields', {}).get('PublishedDate', datetime.now().strftime("%Y-%m-%d"))
-            xml_content += f"  <url><loc>{domain}/post/{slug}</loc><lastmod>{date}</lastmod></url>\n"
-            
-    xml_content += "</urlset>"
-    return HTMLResponse(content=xml_content, media_type="application/xml")
-
-@app.get("/rss.xml", response_class=HTMLResponse)
+        body = feeds.get_feed(blog, fmt, token)
+    except Exception as e:
+        print(f"Feed Error: {e}")
+        # No validators and no caching, so readers and CDNs never keep an empty feed as current
+        return Response(content="Feed temporarily unavailable", status_code=503, media_type="text/plain",
+                        headers={"Retry-After": "60", "Cache-Control": "no-store"})
+    return add_validators(Response(content=body, media_type=feeds.FORMATS[fmt]), etag, last_modified)
+
+@app.get("/rss.xml")
 async def rss(request: Request):
-    """Generates an RSS feed for the current blog."""
-    blog = get_current_blog(request)
-    try:
-        airtable = get_airtable_client()
-        base_id = get_base_id(blog)
-        table = airtable.table(base_id, blog["airtable"]["table_name"])
-        posts = table.all(sort=["-PublishedDate"], formula="{Status}='Published'")
-    except:
-        posts = []
-
-    domain = f"https://{blog['domain']}"
-    rss_content = '<?xml version="1.0" encoding="UTF-8" ?>\n'
-    rss_content += '<rss version="2.0">\n'
-    rss_content += '  <channel>\n'
-    rss_content += f"    <title>{blog['name']}</title>\n"
-    rss_content += f"    <link>{domain}</link>\n"
-    rss_content += f"    <description>Latest posts from {blog['name']}</description>\n"
-    
-    for post in posts:
-        fields = post.get('fields', {})
-        rss_content += "    <item>\n"
-        rss_content += f"      <title>{fields.get('Title', 'Untitled')}</title>\n"
-        rss_content += f"      <link>{domain}/post/{fields.get('Slug', '')}</link>\n"
-        rss_content += f"      <description>{fields.get('MetaDescription', '')}</description>\n"
-        rss_content += f"      <pubDate>{fields.get('PublishedDate', '')}</pubDate>\n"
-        rss_content += "    </item>\n"
-        
-    rss_content += "  </channel>\n"
-    rss_content += "</rss>"
-    return HTMLResponse(content=rss_content, media_type="application/xml")
+    """RSS 2.0 feed for the current blog (newest FEED_ITEM_LIMIT posts)."""
+    blog = await get_current_blog_async(request)
+    return await asyncio.to_thread(feed_response, request, blog, "rss")
+
+@app.get("/atom.xml")
+async def atom(request: Request):
+    """Atom feed for the current blog."""
+    blog = await get_current_blog_async(request)
+    return await asyncio.to_thread(feed_response, request, blog, "atom")
+
+@app.get("/feed.json")
+async def json_feed(request: Request):
+    """JSON Feed 1.1 for the current blog."""
+    blog = await get_current_blog_async(request)
+    return await asyncio.to_thread(feed_response, request, blog, "json")
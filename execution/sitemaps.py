@@ -0,0 +1,121 @@
+import os
+import gzip
+import zlib
+import threading
+from collections import OrderedDict
+from datetime import datetime
+from typing import Dict, Any, Iterator, Optional
+from urllib.parse import quote
+from xml.sax.saxutils import escape
+
+from execution import post_store
+
+# sitemaps.org caps a sitemap file at 50,000 URLs
+SHARD_SIZE = min(int(os.environ.get("SITEMAP_SHARD_SIZE", "50000")), 50000)
+# Compressed sitemaps kept in memory (index + shards across all blogs)
+CACHE_ENTRIES = int(os.environ.get("SITEMAP_CACHE_ENTRIES", "64"))
+
+_CACHE: "OrderedDict[tuple, tuple]" = OrderedDict()
+_LOCK = threading.Lock()
+
+
+def shard_count(blog: Dict[str, Any]) -> int:
+    # Shard 1 also carries the home page URL (+1), so there is always at least one shard
+    return -(-(post_store.count_published_slugs(blog["id"]) + 1) // SHARD_SIZE)
+
+
+def shard_name(n: int) -> str:
+    return f"sitemap-{n}.xml"
+
+
+def iter_index_xml(blog: Dict[str, Any], shards: int) -> Iterator[str]:
+    """Sitemap index pointing at every shard of the blog."""
+    domain = f"https://{blog['domain']}"
+    yield '<?xml version="1.0" encoding="UTF-8"?>\n'
+    yield '<sitemapindex xmlns="http://www.sitemaps.org/schemas/sitemap/0.9">\n'
+    for n in range(1, shards + 1):
+        yield f"  <sitemap><loc>{escape(domain)}/{shard_name(n)}</loc></sitemap>\n"
+    yield "</sitemapindex>"
+
+
+def iter_shard_xml(blog: Dict[str, Any], shard: int) -> Iterator[str]:
+    """One <urlset> shard, streamed from the post mirror in batches."""
+    domain = escape(f"https://{blog['domain']}")
+    yield '<?xml version="1.0" encoding="UTF-8"?>\n'
+    yield '<urlset xmlns="http://www.sitemaps.org/schemas/sitemap/0.9">\n'
+    if shard == 1:
+        # Home
+        yield f"  <url><loc>{domain}/</loc><changefreq>daily</changefreq></url>\n"
+
+    chunk = []
+    today = datetime.now().strftime("%Y-%m-%d")
+    # The home URL takes one of shard 1's slots
+    offset = 0 if shard == 1 else (shard - 1) * SHARD_SIZE - 1
+    limit = SHARD_SIZE - 1 if shard == 1 else SHARD_SIZE
+    for slug, date in post_store.iter_published_slugs(blog["id"], offset=offset, limit=limit):
+        lastmod = escape((date or today)[:10])
+        chunk.append(f"  <url><loc>{domain}/post/{escape(quote(slug))}</loc><lastmod>{lastmod}</lastmod></url>\n")
+        if len(chunk) >= 1000:
+            yield "".join(chunk)
+            chunk = []
+    if chunk:
+        yield "".join(chunk)
+    yield "</urlset>"
+
+
+def _cache_get(key: tuple, token: str) -> Optional[bytes]:
+    with _LOCK:
+        entry = _CACHE.get(key)
+        if entry and entry[0] == token:
+            _CACHE.move_to_end(key)
+            return entry[1]
+    return None
+
+
+def _cache_put(key: tuple, token: str, gz: bytes):
+    with _LOCK:
+        _CACHE[key] = (token, gz)
+        _CACHE.move_to_end(key)
+        while len(_CACHE) > CACHE_ENTRIES:
+            _CACHE.popitem(last=False)
+
+
+def cached_body(key: tuple, token: str, want_gzip: bool) -> Optional[bytes]:
+    """Cached sitemap bytes (gzip or identity) if built for this exact published-set `token`."""
+    gz = _cache_get(key, token)
+    if gz is None:
+        return None
+    return gz if want_gzip else gzip.decompress(gz)
+
+
+def stream_and_cache(key: tuple, token: str, parts: Iterator[str], want_gzip: bool) -> Iterator[bytes]:
+    """
+    Streams a sitemap to the client while gzipping it into the cache.
+    The cache is only filled once the whole document has been produced.
+    """
+    compressor = zlib.compressobj(9, zlib.DEFLATED, 16 + zlib.MAX_WBITS)  # gzip container
+    gz_chunks = []
+    for part in parts:
+        data = part.encode("utf-8")
+        compressed = compressor.compress(data)
+        if compressed:
+            gz_chunks.append(compressed)
+        if want_gzip:
+            if compressed:
+                yield compressed
+        else:
+            yield data
+    tail = compressor.flush()
+    gz_chunks.append(tail)
+    if want_gzip:
+        yield tail
+    _cache_put(key, token, b"".join(gz_chunks))
+
+
+def render_sitemap_files(blog: Dict[str, Any]) -> Dict[str, str]:
+    """{filename: xml} for the index and every shard (used by the static export)."""
+    shards = shard_count(blog)
+    files = {"sitemap.xml": "".join(iter_index_xml(blog, shards))}
+    for n in range(1, shards + 1):
+        files[shard_name(n)] = "".join(iter_shard_xml(blog, n))
+    return files
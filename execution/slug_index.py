@@ -0,0 +1,110 @@
+import threading
+from typing import Optional, Dict, Any, List, Tuple
+
+from execution import post_store
+
+# slug -> (blog_id, record_id) for every Published post in the mirror
+_SLUGS: Dict[str, Tuple[str, str]] = {}
+# (blog_id, record_id) -> slug, so a renamed or unpublished record drops its old entry
+_BY_RECORD: Dict[Tuple[str, str], str] = {}
+_LOCK = threading.Lock()
+_BUILT = False
+
+
+def _add(slug: str, key: Tuple[str, str]):
+    current = _SLUGS.get(slug)
+    if current and current != key:
+        # Same slug on two blogs: the first one indexed keeps it (matches the old per-blog scan order)
+        print(f"Slug index: '{slug}' already maps to {current}, ignoring {key}")
+        return
+    _SLUGS[slug] = key
+    _BY_RECORD[key] = slug
+
+
+def _drop(key: Tuple[str, str]):
+    slug = _BY_RECORD.pop(key, None)
+    if slug and _SLUGS.get(slug) == key:
+        del _SLUGS[slug]
+
+
+def rebuild():
+    """Rebuilds the index from the post mirror."""
+    global _BUILT
+    entries = post_store.list_published_slugs()
+    with _LOCK:
+        _SLUGS.clear()
+        _BY_RECORD.clear()
+        for blog_id, record_id, slug in entries:
+            _add(slug, (blog_id, record_id))
+        _BUILT = True
+
+
+def _ensure_built():
+    if not _BUILT:
+        rebuild()
+
+
+def on_posts_changed(blog_id: str, changed: List[Dict[str, Any]], removed: List[str]):
+    """Mirror listener: keeps the index in step with publishes, unpublishes, renames and deletes."""
+    if not _BUILT:
+        return
+    with _LOCK:
+        for record_id in removed:
+            _drop((blog_id, record_id))
+        for record in changed:
+            key = (blog_id, record["id"])
+            _drop(key)
+            fields = record.get("fields", {})
+            if fields.get("Status") == "Published" and fields.get("Slug"):
+                _add(fields["Slug"], key)
+
+
+def lookup(slug: str) -> Optional[Tuple[str, str]]:
+    """Returns (blog_id, record_id) for a published slug, or None."""
+    _ensure_built()
+    return _SLUGS.get(slug)
+
+
+async def resolve(slug: str, blogs: List[Dict[str, Any]]) -> Tuple[Optional[Dict[str, Any]], Optional[Dict[str, Any]]]:
+    """
+    Resolves a slug to (record, blog) for the public post page.
+    Costs one dict lookup plus one mirror read; Airtable is only contacted (once, by record id)
+    when the index knows the post but the mirror row has gone missing.
+    """
+    blogs_by_id = {b["id"]: b for b in blogs}
+    hit = lookup(slug)
+
+    if hit is None:
+        # Another worker may have synced this post into the shared mirror before our listener saw it
+        record = post_store.find_by_slug(slug, list(blogs_by_id), status="Published")
+        if not record:
+            return None, None
+        with _LOCK:
+            _add(slug, (record["_blog_id"], record["id"]))
+        return record, blogs_by_id.get(record["_blog_id"])
+
+    blog_id, record_id = hit
+    blog = blogs_by_id.get(blog_id)
+    if not blog:
+        return None, None
+
+    record = post_store.get_record(blog_id, record_id)
+    if record is None:
+        from execution.utils import get_base_id
+        from execution.airtable_client import get_async_airtable
+        try:
+            table = get_async_airtable().table(get_base_id(blog), blog["airtable"]["table_name"])
+            post_store.upsert_records(blog_id, [await table.get(record_id)])
+            record = post_store.get_record(blog_id, record_id)
+        except Exception as e:
+            print(f"Slug index: upstream fetch for {slug} failed: {e}")
+            return None, None
+
+    if record is None or record["fields"].get("Status") != "Published" or record["fields"].get("Slug") != slug:
+        with _LOCK:
+            _drop((blog_id, record_id))
+        return None, None
+    return record, blog
+
+
+post_store.add_listener(on_posts_changed, local=True)
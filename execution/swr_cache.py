@@ -0,0 +1,149 @@
+import os
+import time
+import asyncio
+import threading
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Dict, Hashable, Iterable, Optional
+
+from execution import config_cache
+
+
+class _Entry:
+    __slots__ = ("value", "stored_at", "soft_expires", "hard_expires", "tags", "versions")
+
+    def __init__(self, value, soft_ttl: float, hard_ttl: float, tags: Iterable[str],
+                 versions: Optional[Dict[str, int]] = None):
+        now = time.monotonic()
+        self.value = value
+        self.stored_at = now
+        self.soft_expires = now + soft_ttl
+        self.hard_expires = now + hard_ttl
+        self.tags = frozenset(tags)
+        # Shared invalidation version of each tag when the value was loaded
+        self.versions = versions or {}
+
+
+class SWRCache:
+    """
+    Stale-while-revalidate cache for async loaders.
+
+    - Before the soft TTL: served from memory.
+    - Between soft and hard TTL: served stale while one background task refreshes it.
+    - After the hard TTL (or on a miss): loaded inline.
+    - If a load fails, any previous value is served regardless of age (stale-if-error).
+
+    With a `namespace`, invalidate() reaches every worker: it bumps a shared per-tag version in
+    execution.config_cache, and entries loaded under an older version count as misses.
+    """
+
+    def __init__(self, soft_ttl: float, hard_ttl: float, max_entries: int = 1024, namespace: Optional[str] = None):
+        self.soft_ttl = soft_ttl
+        self.hard_ttl = max(hard_ttl, soft_ttl)
+        self.max_entries = max_entries
+        self.namespace = namespace
+        self._entries: "OrderedDict[Hashable, _Entry]" = OrderedDict()
+        self._refreshing: Dict[Hashable, asyncio.Task] = {}
+        self._lock = threading.Lock()
+
+    def _versions(self, tags: Iterable[str]) -> Dict[str, int]:
+        if not self.namespace:
+            return {}
+        # Re-read from disk at most once per CONFIG_VERSION_CHECK_INTERVAL per tag
+        return {tag: config_cache.current_version(f"{self.namespace}:{tag}") for tag in tags}
+
+    def _store(self, key: Hashable, value, tags: Iterable[str], soft_ttl: Optional[float] = None,
+               versions: Optional[Dict[str, int]] = None):
+        entry = _Entry(value, self.soft_ttl if soft_ttl is None else soft_ttl, self.hard_ttl, tags, versions)
+        with self._lock:
+            self._entries[key] = entry
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    async def _load(self, key: Hashable, loader: Callable[[], Awaitable[Any]], tags: Iterable[str]):
+        # Read before loading, so an invalidation that lands mid-load still expires the result
+        versions = self._versions(tags)
+        value = await loader()
+        # Loaders can flag a partial result (e.g. a blog timed out) so it is refreshed on the next hit
+        partial = isinstance(value, dict) and value.get("partial")
+        self._store(key, value, tags, soft_ttl=0 if partial else None, versions=versions)
+        return value
+
+    def _refresh_in_background(self, key: Hashable, loader: Callable[[], Awaitable[Any]], tags: Iterable[str]):
+        if key in self._refreshing:
+            return
+
+        async def refresh():
+            try:
+                await self._load(key, loader, tags)
+            except Exception as e:
+                # Keep serving what we have; the next request past the soft TTL tries again
+                print(f"SWR cache: background refresh of {key} failed: {e}")
+            finally:
+                self._refreshing.pop(key, None)
+
+        self._refreshing[key] = asyncio.ensure_future(refresh())
+
+    async def get(self, key: Hashable, loader: Callable[[], Awaitable[Any]], tags: Iterable[str] = ()):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+        if entry is not None and entry.versions and self._versions(entry.tags) != entry.versions:
+            # Invalidated by some worker since it was loaded: a miss, never served stale
+            entry = None
+        now = time.monotonic()
+
+        if entry is not None and now < entry.soft_expires:
+            return entry.value
+        if entry is not None and now < entry.hard_expires:
+            self._refresh_in_background(key, loader, tags)
+            return entry.value
+
+        # Miss or past the hard TTL: share an in-flight refresh if there is one
+        task = self._refreshing.get(key)
+        try:
+            if task is not None:
+                await asyncio.shield(task)
+                with self._lock:
+                    fresh = self._entries.get(key)
+                if fresh is not None and fresh is not entry:
+                    return fresh.value
+            return await self._load(key, loader, tags)
+        except Exception as e:
+            if entry is not None:
+                print(f"SWR cache: serving stale {key} after load error: {e}")
+                return entry.value
+            raise
+
+    def mark_stale(self, tag: str):
+        """Expires the soft TTL of every entry tagged `tag`: next hit serves it once and refreshes."""
+        now = time.monotonic()
+        with self._lock:
+            for entry in self._entries.values():
+                if tag in entry.tags:
+                    entry.soft_expires = min(entry.soft_expires, now)
+
+    def invalidate(self, tag: str):
+        """
+        Drops every entry tagged `tag`: the next hit loads fresh data instead of serving it stale.
+        With a namespace this holds in every worker (blocking: it writes the shared version).
+        """
+        if self.namespace:
+            config_cache.invalidate(f"{self.namespace}:{tag}")
+        with self._lock:
+            for key in [k for k, entry in self._entries.items() if tag in entry.tags]:
+                del self._entries[key]
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+
+# Rendered-listing data for read_root / read_blog_index
+listing_cache = SWRCache(
+    soft_ttl=float(os.environ.get("LISTING_CACHE_SOFT_TTL", "15")),
+    hard_ttl=float(os.environ.get("LISTING_CACHE_HARD_TTL", "300")),
+    max_entries=int(os.environ.get("LISTING_CACHE_ENTRIES", "1024")),
+    namespace="listings",
+)
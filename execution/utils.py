@@ -1,29 +1,139 @@
 import os
+import time
+import asyncio
+import threading
 import yaml
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, Callable
 from pyairtable import Api
 from dotenv import load_dotenv
 
+from execution.routing import RoutingTable
+from execution.rate_limit import RateLimitedSession
+from execution import config_cache, metrics
+
 load_dotenv()
 
 CONFIG_PATH = os.path.join(os.path.dirname(os.path.dirname(__file__)), "config", "blogs.yaml")
 
+class SingleFlight:
+    """
+    Coalesces concurrent calls for the same key: the first caller runs the fetch, every caller
+    that arrives while it is in flight blocks and receives the same result (or exception).
+    Thread-safe; async callers should go through asyncio.to_thread (see load_blogs_config_async).
+    """
+
+    class _Call:
+        def __init__(self):
+            self.event = threading.Event()
+            self.result = None
+            self.error = None
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._calls: Dict[str, "SingleFlight._Call"] = {}
+
+    def do(self, key: str, fn: Callable[[], Any]) -> Any:
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = self._calls[key] = SingleFlight._Call()
+
+        if not leader:
+            call.event.wait()
+            if call.error is not None:
+                raise call.error
+            return call.result
+
+        try:
+            call.result = fn()
+            return call.result
+        except BaseException as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                self._calls.pop(key, None)
+            call.event.set()
+
+_CONFIG_FLIGHT = SingleFlight()
+
+# Blog and agency config is cached per worker and shared between workers through
+# execution.config_cache: one worker refetches, the rest pick up its copy, and an
+# invalidation bumps a shared version that every worker checks.
+CONFIG_TTL = 60
+
+def _config_fresh(key: str, cached: list, cached_time: float, cached_version: int) -> bool:
+    return bool(cached) and time.time() - cached_time < CONFIG_TTL and config_cache.current_version(key) == cached_version
+
+def _load_shared_config(key: str, fetch: Callable[[], list], force: bool) -> tuple:
+    """
+    Returns (value, fetched_at, version) for a config list, going to the source only when the
+    shared copy is stale or invalidated (or `force`) and no other worker is already refetching it.
+    """
+    if not force:
+        entry = config_cache.lookup(key, CONFIG_TTL)
+        if entry and entry["fresh"]:
+            metrics.inc("config_cache_loads_total", cache=key, source="shared")
+            return entry["value"], entry["fetched_at"], entry["version"]
+        if not config_cache.claim_refresh(key):
+            # Another worker is refetching: serve the previous copy, marked stale so we look again
+            # next call, or (cold start) wait for its result
+            if entry is None:
+                entry = config_cache.wait_for(key, CONFIG_TTL)
+            if entry is not None:
+                metrics.inc("config_cache_loads_total", cache=key, source="shared")
+                return entry["value"], entry["fetched_at"] if entry["fresh"] else 0, entry["version"]
+    metrics.inc("config_cache_loads_total", cache=key, source="airtable")
+    version = config_cache.current_version(key, refresh=True)
+    try:
+        value = fetch()
+    except BaseException:
+        config_cache.release_refresh(key)
+        raise
+    stored = config_cache.store(key, value, version)
+    # Invalidated while we were fetching: use it for now but treat it as already stale
+    return value, time.time() if stored == version else 0, stored
+
 # Caching for Blog Configs
 _BLOGS_CACHE = []
 _BLOGS_CACHE_TIME = 0
+_BLOGS_CACHE_VERSION = -1
+# Host/id lookup built alongside _BLOGS_CACHE; replaced wholesale on every load
+_ROUTING = RoutingTable([])
 
 def load_blogs_config(force: bool = False) -> list[Dict[str, Any]]:
     """
     Loads blog configurations from Airtable (Blogs table) with fallback to local yaml.
-    Results are cached for 60 seconds to prevent API throttling.
+    Results are cached for 60 seconds (shared by all workers) to prevent API throttling;
+    concurrent misses share one fetch.
     """
-    global _BLOGS_CACHE, _BLOGS_CACHE_TIME
-    import time
-    
-    # Check cache (TTL 60s), skip if force=True
-    if not force and _BLOGS_CACHE and (time.time() - _BLOGS_CACHE_TIME < 60):
+    # Check cache (TTL 60s, same shared version), skip if force=True
+    if not force and _config_fresh("blogs", _BLOGS_CACHE, _BLOGS_CACHE_TIME, _BLOGS_CACHE_VERSION):
+        metrics.inc("config_cache_requests_total", cache="blogs", result="hit")
         return _BLOGS_CACHE
-        
+    metrics.inc("config_cache_requests_total", cache="blogs", result="miss")
+    return _CONFIG_FLIGHT.do("blogs:force" if force else "blogs", lambda: _refresh_blogs(force))
+
+async def load_blogs_config_async(force: bool = False) -> list[Dict[str, Any]]:
+    """load_blogs_config for async handlers: cache hits stay on the loop, misses join the shared fetch off it."""
+    if not force and _config_fresh("blogs", _BLOGS_CACHE, _BLOGS_CACHE_TIME, _BLOGS_CACHE_VERSION):
+        metrics.inc("config_cache_requests_total", cache="blogs", result="hit")
+        return _BLOGS_CACHE
+    return await asyncio.to_thread(load_blogs_config, force)
+
+def _refresh_blogs(force: bool) -> list[Dict[str, Any]]:
+    global _BLOGS_CACHE, _BLOGS_CACHE_TIME, _BLOGS_CACHE_VERSION, _ROUTING
+    loaded_blogs, fetched_at, version = _load_shared_config("blogs", _fetch_blogs_config, force)
+    # Build the table before publishing the cache so readers always see a matching pair
+    routing = RoutingTable(loaded_blogs)
+    _ROUTING = routing
+    _BLOGS_CACHE = loaded_blogs
+    _BLOGS_CACHE_TIME = fetched_at
+    _BLOGS_CACHE_VERSION = version
+    return loaded_blogs
+
+def _fetch_blogs_config() -> list[Dict[str, Any]]:
     loaded_blogs = []
     
     # 1. Try Airtable
@@ -31,7 +141,7 @@ def load_blogs_config(force: bool = False) -> list[Dict[str, Any]]:
         api_key = os.environ.get("AIRTABLE_API_KEY")
         master_base = os.environ.get("AIRTABLE_BASE_ID") # Assuming master base holds the 'Blogs' directory
         if api_key and master_base:
-            api = Api(api_key)
+            api = get_airtable_client()
             table = api.table(master_base, "Blogs")
             records = table.all()
             for r in records:
@@ -46,6 +156,7 @@ def load_blogs_config(force: bool = False) -> list[Dict[str, Any]]:
                     "id": str(r["id"]), # Use Airtable Record ID as app ID
                     "name": name,
                     "domain": f.get("Domain", "localhost"),
+                    "aliases": f.get("Domain_Aliases", ""),
                     "airtable": {
                         "base_id_env": "AIRTABLE_BASE_ID", # Hack: Reuse valid Env Var or store ID directly?
                         # Better approach: Store raw ID in Airtable and assume it's valid, 
@@ -69,33 +180,51 @@ def load_blogs_config(force: bool = False) -> list[Dict[str, Any]]:
                 data = yaml.safe_load(f)
                 loaded_blogs = data.get("blogs", [])
 
-    _BLOGS_CACHE = loaded_blogs
-    _BLOGS_CACHE_TIME = time.time()
     return loaded_blogs
 
+def get_routing_table() -> RoutingTable:
+    """Current routing table (refreshed with the blog config TTL)."""
+    load_blogs_config()
+    return _ROUTING
+
 def get_blog_config(blog_id: str) -> Optional[Dict[str, Any]]:
     """Returns the config for a specific blog ID."""
-    blogs = load_blogs_config()
-    for blog in blogs:
-        if blog["id"] == blog_id:
-            return blog
-    return None
+    return get_routing_table().get(blog_id)
 
 def get_blog_by_domain(domain: str) -> Optional[Dict[str, Any]]:
-    """Returns the config for a specific domain."""
-    blogs = load_blogs_config()
-    for blog in blogs:
-        if blog["domain"] == domain:
-            return blog
-    # Fallback for localhost testing if needed, or handle in server
-    return None
+    """Returns the config for a domain, alias or wildcard host (port, case and 'www.' are ignored)."""
+    return get_routing_table().resolve_host(domain)
+
+async def get_routing_table_async() -> RoutingTable:
+    """get_routing_table for async handlers: a cache hit stays on the loop, a miss is fetched off it."""
+    await load_blogs_config_async()
+    return _ROUTING
+
+async def get_blog_config_async(blog_id: str) -> Optional[Dict[str, Any]]:
+    return (await get_routing_table_async()).get(blog_id)
+
+_AIRTABLE_API: Optional[Api] = None
 
 def get_airtable_client() -> Api:
-    """Returns an authenticated Airtable API client."""
+    """
+    Returns an authenticated (sync) Airtable API client for scripts and background threads.
+    The client is reused so its HTTP session keeps connections alive; request handlers use
+    execution.airtable_client instead.
+    """
+    global _AIRTABLE_API
     api_key = os.environ.get("AIRTABLE_API_KEY")
     if not api_key:
         raise ValueError("AIRTABLE_API_KEY not found in environment variables")
-    return Api(api_key)
+    if _AIRTABLE_API is None or _AIRTABLE_API.api_key != api_key:
+        # 429 retries are handled by the shared rate limiter, so pyairtable's own retry is off
+        # AIRTABLE_API_URL (shared with the async client) lets both target a proxy or a local fake
+        endpoint = os.environ.get("AIRTABLE_API_URL", "https://api.airtable.com/v0").rstrip("/")
+        endpoint = endpoint[:-3] if endpoint.endswith("/v0") else endpoint
+        api = Api(api_key, retry_strategy=False, endpoint_url=endpoint)
+        api.session = RateLimitedSession()
+        api.api_key = api_key  # re-applies the auth header to the new session
+        _AIRTABLE_API = api
+    return _AIRTABLE_API
 
 def get_base_id(blog_config: Dict[str, Any]) -> str:
     """Resolves the Base ID. Supports Direct ID (from Airtable) or Env Var Lookup (from YAML)."""
@@ -113,24 +242,40 @@ def get_base_id(blog_config: Dict[str, Any]) -> str:
 # Agency Caching
 _AGENCIES_CACHE = []
 _AGENCIES_CACHE_TIME = 0
+_AGENCIES_CACHE_VERSION = -1
 
 def get_all_agencies(force: bool = False) -> list[Dict[str, Any]]:
     """
-    Loads agencies from Airtable with caching.
+    Loads agencies from Airtable with caching shared by all workers; concurrent misses share one fetch.
     """
-    global _AGENCIES_CACHE, _AGENCIES_CACHE_TIME
-    import time
-    
-    if not force and _AGENCIES_CACHE and (time.time() - _AGENCIES_CACHE_TIME < 60):
+    if not force and _config_fresh("agencies", _AGENCIES_CACHE, _AGENCIES_CACHE_TIME, _AGENCIES_CACHE_VERSION):
+        metrics.inc("config_cache_requests_total", cache="agencies", result="hit")
         return _AGENCIES_CACHE
-        
+    metrics.inc("config_cache_requests_total", cache="agencies", result="miss")
+    return _CONFIG_FLIGHT.do("agencies:force" if force else "agencies", lambda: _refresh_agencies(force))
+
+async def get_all_agencies_async(force: bool = False) -> list[Dict[str, Any]]:
+    if not force and _config_fresh("agencies", _AGENCIES_CACHE, _AGENCIES_CACHE_TIME, _AGENCIES_CACHE_VERSION):
+        metrics.inc("config_cache_requests_total", cache="agencies", result="hit")
+        return _AGENCIES_CACHE
+    return await asyncio.to_thread(get_all_agencies, force)
+
+def _refresh_agencies(force: bool) -> list[Dict[str, Any]]:
+    global _AGENCIES_CACHE, _AGENCIES_CACHE_TIME, _AGENCIES_CACHE_VERSION
+    loaded_agencies, fetched_at, version = _load_shared_config("agencies", _fetch_agencies, force)
+    _AGENCIES_CACHE = loaded_agencies
+    _AGENCIES_CACHE_TIME = fetched_at
+    _AGENCIES_CACHE_VERSION = version
+    return loaded_agencies
+
+def _fetch_agencies() -> list[Dict[str, Any]]:
     loaded_agencies = []
     try:
         api_key = os.environ.get("AIRTABLE_API_KEY")
         base_id = os.environ.get("AIRTABLE_BASE_ID")
         
         if api_key and base_id:
-            api = Api(api_key)
+            api = get_airtable_client()
             table = api.table(base_id, "Agencies")
             records = table.all()
             
@@ -151,17 +296,19 @@ def get_all_agencies(force: bool = False) -> list[Dict[str, Any]]:
     except Exception as e:
         print(f"Warning: Failed to load agencies: {e}")
         
-    _AGENCIES_CACHE = loaded_agencies
-    _AGENCIES_CACHE_TIME = time.time()
     return loaded_agencies
 
 def invalidate_agencies_cache():
+    """Drops the agency list in every worker (the next read refetches it once)."""
     global _AGENCIES_CACHE, _AGENCIES_CACHE_TIME
+    config_cache.invalidate("agencies")
     _AGENCIES_CACHE = []
     _AGENCIES_CACHE_TIME = 0
 
 def invalidate_blogs_cache():
+    """Drops the blog config in every worker (the next read refetches it once)."""
     global _BLOGS_CACHE, _BLOGS_CACHE_TIME
+    config_cache.invalidate("blogs")
     _BLOGS_CACHE = []
     _BLOGS_CACHE_TIME = 0
 
@@ -170,17 +317,16 @@ def get_current_blog(request):
     Determines the current blog based on the request hostname.
     Falls back to the first configured blog if no match found (or for localhost).
     """
-    host = request.headers.get("host", "").split(":")[0]
-    blogs = load_blogs_config()
-    
-    # 1. Try exact match
-    for blog in blogs:
-        if blog.get("domain") == host:
-            return blog
-            
+    routing = get_routing_table()
+
+    # 1. Domain, alias or wildcard match
+    blog = routing.resolve_host(request.headers.get("host", ""))
+    if blog:
+        return blog
+
     # 2. Return first blog as default (Critical for single-blog setups or localhost dev)
-    if blogs:
-        return blogs[0]
-        
+    if routing.blogs:
+        return routing.default()
+
     # 3. Fallback (Should typically not happen if config exists)
     return {"id": "default", "name": "Auto_Blog", "airtable": {}}
@@ -0,0 +1,211 @@
+import os
+import hmac
+import json
+import asyncio
+import hashlib
+import argparse
+from typing import Optional, Dict, Any, List, Iterable
+
+from execution import post_store
+from execution.swr_cache import listing_cache
+from execution.utils import load_blogs_config_async, get_base_id, invalidate_blogs_cache, invalidate_agencies_cache
+
+# Shared secret used to sign change notifications (HMAC-SHA256 of the raw body).
+# Unset disables the endpoint.
+WEBHOOK_SECRET = os.environ.get("WEBHOOK_SECRET")
+SIGNATURE_HEADER = "X-Airtable-Content-MAC"
+
+# Tables in the master base that hold app configuration rather than posts
+CONFIG_TABLES = {"Blogs": invalidate_blogs_cache, "Agencies": invalidate_agencies_cache}
+
+# base id -> {table id: table name}, from the meta API; Airtable webhook payloads name tables by id
+_TABLE_NAMES: Dict[str, Dict[str, str]] = {}
+
+
+def sign(body: bytes, secret: Optional[str] = None) -> str:
+    digest = hmac.new((secret or WEBHOOK_SECRET or "").encode("utf-8"), body, hashlib.sha256).hexdigest()
+    return f"hmac-sha256={digest}"
+
+
+def verify(body: bytes, signature: Optional[str]) -> bool:
+    if not WEBHOOK_SECRET or not signature:
+        return False
+    return hmac.compare_digest(sign(body), signature)
+
+
+def parse_changes(payload: Dict[str, Any]) -> List[Dict[str, Any]]:
+    """
+    Normalises a change notification into [{table, updated: [ids], deleted: [ids]}].
+
+    Accepts the simple form sent by `emit` / our own tooling:
+        {"base": {"id": "app..."}, "changes": [{"table": "Posts", "action": "update", "recordIds": [...]}]}
+    and Airtable webhook payloads (tables keyed by name or id):
+        {"base": {"id": "app..."}, "payloads": [{"changedTablesById": {"tbl...": {
+            "createdRecordsById": {...}, "changedRecordsById": {...}, "destroyedRecordIds": [...]}}}]}
+    A bare notification (base + webhook only) yields no changes.
+    """
+    tables: Dict[str, Dict[str, set]] = {}
+
+    def entry(table: str) -> Dict[str, set]:
+        return tables.setdefault(table, {"updated": set(), "deleted": set()})
+
+    for change in payload.get("changes", []):
+        kind = "deleted" if change.get("action") == "delete" else "updated"
+        entry(change["table"])[kind].update(change.get("recordIds", []))
+
+    for item in payload.get("payloads", []):
+        for table, diff in item.get("changedTablesById", {}).items():
+            e = entry(table)
+            e["updated"].update(diff.get("createdRecordsById", {}))
+            e["updated"].update(diff.get("changedRecordsById", {}))
+            e["deleted"].update(diff.get("destroyedRecordIds", []))
+
+    changes = []
+    for table, e in tables.items():
+        # A record created and destroyed within one notification is just gone
+        changes.append({"table": table, "updated": sorted(e["updated"] - e["deleted"]), "deleted": sorted(e["deleted"])})
+    return changes
+
+
+def _post_tables(blog: Dict[str, Any]) -> set:
+    return {blog["airtable"].get("table_name"), blog["airtable"].get("table_id")} - {None}
+
+
+async def _table_name(base_id: str, table: str) -> Optional[str]:
+    """
+    Name of a table given by name or id ('tbl...'). Ids are looked up in the base's schema, which
+    is re-read when an id is not in it yet (a new table). None if the id cannot be resolved.
+    """
+    if not table.startswith("tbl"):
+        return table
+    names = _TABLE_NAMES.get(base_id, {})
+    if table not in names:
+        from execution.airtable_client import list_tables
+        try:
+            names = {t["id"]: t["name"] for t in await list_tables(base_id)}
+            _TABLE_NAMES[base_id] = names
+        except Exception as e:
+            print(f"Webhook: cannot read the table schema of {base_id}: {e}")
+    return names.get(table)
+
+
+async def _blogs_in_base(base_id: str) -> List[Dict[str, Any]]:
+    blogs = []
+    for blog in await load_blogs_config_async():
+        try:
+            if get_base_id(blog) == base_id:
+                blogs.append(blog)
+        except Exception:
+            continue
+    return blogs
+
+
+async def _fetch_records(blog: Dict[str, Any], record_ids: List[str]):
+    """Fetches changed records from Airtable. Returns (records, missing ids): a 404 means it is gone."""
+    import httpx
+    from execution.airtable_client import get_async_airtable
+
+    table = get_async_airtable().table(get_base_id(blog), blog["airtable"]["table_name"])
+
+    async def get(record_id):
+        try:
+            return await table.get(record_id)
+        except httpx.HTTPStatusError as e:
+            if e.response.status_code == 404:
+                return record_id
+            raise
+
+    results = await asyncio.gather(*(get(rid) for rid in record_ids))
+    return [r for r in results if isinstance(r, dict)], [r for r in results if isinstance(r, str)]
+
+
+async def apply_changes(payload: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Applies a change notification to exactly the affected state:
+    - Posts tables: the named records are refetched (or dropped) in the post mirror. Its listeners
+      update the slug index and pre-render; sitemaps, feeds and post ETags follow the mirror's hashes.
+      Cached listings of the touched blogs are dropped outright rather than served stale once.
+    - Blogs / Agencies: the shared config cache is invalidated in every worker.
+    Tables may be named or given by id. Returns a summary, including `resync`: blogs to catch up
+    with a normal incremental sync (a bare notification that names no records, or a table id
+    that could not be resolved).
+    """
+    base_id = (payload.get("base") or {}).get("id")
+    changes = parse_changes(payload)
+    summary = {"updated": 0, "deleted": 0, "config": [], "resync": []}
+
+    blogs = await _blogs_in_base(base_id) if base_id else []
+    if not changes:
+        summary["resync"] = blogs
+        return summary
+
+    for change in changes:
+        table = await _table_name(base_id, change["table"]) if base_id else change["table"]
+        if table is None:
+            # Unknown table id (e.g. no schema scope): cannot tell if it holds posts, so catch up by syncing
+            summary["resync"] += [b for b in blogs if b not in summary["resync"]]
+            continue
+        invalidate = CONFIG_TABLES.get(table)
+        if invalidate and base_id == os.environ.get("AIRTABLE_BASE_ID"):
+            await asyncio.to_thread(invalidate)
+            summary["config"].append(table)
+            continue
+
+        for blog in blogs:
+            if table not in _post_tables(blog) and change["table"] not in _post_tables(blog):
+                continue
+            records, missing = await _fetch_records(blog, change["updated"]) if change["updated"] else ([], [])
+            removed = change["deleted"] + missing
+            changed = await asyncio.to_thread(post_store.upsert_records, blog["id"], records)
+            await asyncio.to_thread(post_store.delete_records, blog["id"], removed)
+            if changed or removed:
+                await asyncio.to_thread(listing_cache.invalidate, blog["id"])
+            summary["updated"] += len(changed)
+            summary["deleted"] += len(removed)
+    return summary
+
+
+def resync(blogs: Iterable[Dict[str, Any]]):
+    """Incremental mirror sync for blogs named by a bare notification (run as a background task)."""
+    for blog in blogs:
+        try:
+            post_store.sync_blog(blog)
+        except Exception as e:
+            print(f"Webhook resync of {blog.get('name')} failed: {e}")
+
+
+def emit(url: str, base_id: str, table: str, updated: Iterable[str] = (), deleted: Iterable[str] = (),
+         secret: Optional[str] = None) -> Dict[str, Any]:
+    """
+    Local stand-in for Airtable: sends a signed change notification to a running server.
+    Handy for tests and for scripts that write to Airtable and want the site updated at once.
+    """
+    import httpx
+
+    changes = []
+    if updated:
+        changes.append({"table": table, "action": "update", "recordIds": list(updated)})
+    if deleted:
+        changes.append({"table": table, "action": "delete", "recordIds": list(deleted)})
+    body = json.dumps({"base": {"id": base_id}, "changes": changes}).encode("utf-8")
+    response = httpx.post(url, content=body, headers={
+        "Content-Type": "application/json",
+        SIGNATURE_HEADER: sign(body, secret),
+    })
+    response.raise_for_status()
+    return response.json()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Send a signed change notification to the blog server.")
+    parser.add_argument("--url", default="http://localhost:8000/api/webhooks/airtable")
+    parser.add_argument("--base", required=True, help="Airtable base id the records live in")
+    parser.add_argument("--table", default="Posts")
+    parser.add_argument("--update", nargs="*", default=[], help="Record ids created or changed")
+    parser.add_argument("--delete", nargs="*", default=[], help="Record ids deleted")
+    args = parser.parse_args()
+    print(emit(args.url, args.base, args.table, args.update, args.delete))
+
+
+if __name__ == "__main__":
+    main()